@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+"""
+Benchmarks the modules of this collection against dev/mock_npm.py.
+
+The modules are executed in-process (no ansible-playbook, no AnsiballZ), so the numbers only
+contain the work done by the modules themselves: API calls, (de)serialization and comparison.
+For every size the mock is reset to hold that many existing objects per resource, afterwards
+each module is run for --tasks tasks, each targeting an existing object (so nothing changes).
+The bulk modules (proxy_hosts, redirection_hosts) are run once with an entry for every object.
+
+Reported per module and size are:
+
+  * tasks/s      module executions per second
+  * items/s      (bulk modules only) entries reconciled per second
+  * calls/task   HTTP requests received by the mock per module execution
+  * peak MiB     peak python memory allocated during a single module execution
+
+With --search only the lookup of a single proxy host in the full list is measured, comparing
+parsing the whole response with json() to parsing it while it is received (stopping at the match).
+
+With --playbook a loop of --tasks proxy tasks (delegated to localhost) is run by ansible-playbook, once
+as regular module (npm_run_on_controller=false) and once inside the controller by the action plugin.
+
+With --startup the start of every module as regular module is measured, median of --tasks runs each:
+
+  * import ms    time to import the module in a new interpreter
+  * first req ms time from starting a new interpreter with the module until the mock receives its first request
+  * run ms       time until the module has finished
+  * payload KiB  size of the AnsiballZ payload sent to the target (compressed), and the part of it
+                 that are files of this collection
+  * requests     if requests has been imported by importing the module
+
+usage: python3 dev/benchmark.py --sizes 10,100,1000,10000 --tasks 20
+       python3 dev/benchmark.py --playbook --sizes 1000 --tasks 100
+       python3 dev/benchmark.py --search --sizes 1000,10000
+       python3 dev/benchmark.py --startup --sizes 100 --tasks 10
+"""
+import argparse
+import base64
+import contextlib
+import io
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+
+import requests
+
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["proxy", "redirection", "certificate", "proxy_hosts", "redirection_hosts"]
+SEEDED = ["proxy-hosts", "redirection-hosts", "certificates"]
+
+
+def collection_path():
+    """makes the collection importable as ansible_collections.nils_ost.proxymanager"""
+    try:
+        import ansible_collections.nils_ost.proxymanager  # noqa: F401
+    except ImportError:
+        root = tempfile.mkdtemp(prefix="npm-bench-")
+        os.makedirs(os.path.join(root, "ansible_collections", "nils_ost"))
+        os.symlink(
+            REPO,
+            os.path.join(root, "ansible_collections", "nils_ost", "proxymanager"),
+        )
+        sys.path.insert(0, root)
+
+
+def collection_root():
+    """returns a new directory containing the collection as ansible_collections/nils_ost/proxymanager"""
+    root = tempfile.mkdtemp(prefix="npm-bench-")
+    os.makedirs(os.path.join(root, "ansible_collections", "nils_ost"))
+    os.symlink(
+        REPO,
+        os.path.join(root, "ansible_collections", "nils_ost", "proxymanager"),
+    )
+    return root
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_mock(latency):
+    port = free_port()
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(REPO, "dev", "mock_npm.py"),
+            "--port",
+            str(port),
+            "--latency",
+            str(latency),
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            requests.get(f"{url}/__mock__/stats", timeout=1)
+            return proc, url
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("mock npm did not come up")
+
+
+def run_module(name, args):
+    """runs a module in-process with args, returns its result and the peak of allocated memory"""
+    from ansible.module_utils import basic
+
+    module = __import__(
+        f"ansible_collections.nils_ost.proxymanager.plugins.modules.{name}",
+        fromlist=["run_module"],
+    )
+    basic._ANSIBLE_ARGS = json.dumps(dict(ANSIBLE_MODULE_ARGS=args)).encode()
+    if hasattr(basic, "_ANSIBLE_PROFILE"):
+        basic._ANSIBLE_PROFILE = "legacy"
+
+    out = io.StringIO()
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(out):
+            module.run_module()
+    except SystemExit:
+        pass
+    finally:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return json.loads(out.getvalue()), peak
+
+
+def task_args(name, url, size, i):
+    """module arguments for the i-th task, targeting an object that already exists on the mock"""
+    n = i % size
+    args = dict(url=url, token="benchmark")
+    if name == "proxy":
+        args.update(
+            domain_name=f"host{n}.bench.example",
+            forward_host=f"10.0.{n // 250 % 250}.{n % 250}",
+        )
+        args.update(forward_port=8080)
+    elif name == "redirection":
+        args.update(
+            domain_name=f"redirect{n}.bench.example",
+            forward_host=f"host{n}.bench.example",
+        )
+    elif name == "certificate":
+        args.update(domain_name=f"cert{n}.bench.example")
+    elif name == "proxy_hosts":
+        args.update(
+            proxies=[
+                dict(
+                    domain_name=f"host{n}.bench.example",
+                    forward_host=f"10.0.{n // 250 % 250}.{n % 250}",
+                    forward_port=8080,
+                )
+                for n in range(size)
+            ],
+        )
+    elif name == "redirection_hosts":
+        args.update(
+            redirections=[
+                dict(
+                    domain_name=f"redirect{n}.bench.example",
+                    forward_host=f"host{n}.bench.example",
+                )
+                for n in range(size)
+            ],
+        )
+    return args
+
+
+def benchmark(name, url, size, tasks):
+    requests.post(f"{url}/__mock__/reset", json={r: size for r in SEEDED}, timeout=60)
+    runs = 1 if name.endswith("_hosts") else tasks
+
+    peak = 0
+    failed = 0
+    changed = 0
+    started = time.perf_counter()
+    for i in range(runs):
+        result, mem = run_module(name, task_args(name, url, size, i))
+        peak = max(peak, mem)
+        failed += bool(result.get("failed"))
+        changed += bool(result.get("changed"))
+    duration = time.perf_counter() - started
+
+    calls = requests.get(f"{url}/__mock__/stats", timeout=10).json()["requests"]
+    return dict(
+        module=name,
+        size=size,
+        tasks=runs,
+        tasks_per_second=runs / duration,
+        items_per_second=(size * runs / duration) if name.endswith("_hosts") else None,
+        calls_per_task=calls / runs,
+        peak_mib=peak / 1024 / 1024,
+        failed=failed,
+        changed=changed,
+    )
+
+
+def search_json(client, resource, name):
+    """the lookup as done before streaming: download and build the whole list, then scan it"""
+    response = client.get(resource)
+    for item in response.json():
+        if name in item.get("domain_names", list()):
+            return item
+    return None
+
+
+def search_stream(client, resource, name):
+    return client.find_item(
+        resource,
+        lambda item: name in item.get("domain_names", list()),
+    )[1]
+
+
+def benchmark_search(url, size, tasks):
+    """compares lookups in the full list with json() and streamed, for items at different positions"""
+    from ansible_collections.nils_ost.proxymanager.plugins.module_utils import api
+
+    requests.post(f"{url}/__mock__/reset", json={"proxy-hosts": size}, timeout=60)
+    client = api.NpmClient(url, token="benchmark")
+    results = list()
+    for position, n in (
+        ("first", 0),
+        ("middle", size // 2),
+        ("last", size - 1),
+        ("missing", size),
+    ):
+        for lookup, search in (("json", search_json), ("stream", search_stream)):
+            peak = 0
+            started = time.perf_counter()
+            for _ in range(tasks):
+                tracemalloc.start()
+                search(client, "/api/nginx/proxy-hosts", f"host{n}.bench.example")
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+            duration = time.perf_counter() - started
+            results.append(
+                dict(
+                    lookup=lookup,
+                    size=size,
+                    position=position,
+                    ms_per_lookup=duration / tasks * 1000,
+                    peak_mib=peak / 1024 / 1024,
+                ),
+            )
+    client.close()
+    return results
+
+
+PLAYBOOK = """
+- hosts: localhost
+  gather_facts: false
+  tasks:
+    - nils_ost.proxymanager.proxy:
+        url: "{{ url }}"
+        token: benchmark
+        domain_name: "host{{ n }}.bench.example"
+        forward_host: "10.0.{{ n // 250 % 250 }}.{{ n % 250 }}"
+        forward_port: 8080
+      vars:
+        n: "{{ item % (size | int) }}"
+      loop: "{{ range(0, tasks | int) | list }}"
+"""
+
+
+def benchmark_playbook(url, size, tasks):
+    """runs a loop of proxy tasks with ansible-playbook, once as regular module and once inside the controller"""
+    root = collection_root()
+    with open(os.path.join(root, "play.yml"), "w") as f:
+        f.write(PLAYBOOK)
+
+    results = list()
+    for execution, on_controller in (("module", "false"), ("controller", "true")):
+        requests.post(f"{url}/__mock__/reset", json={"proxy-hosts": size}, timeout=60)
+        started = time.perf_counter()
+        subprocess.run(
+            [
+                "ansible-playbook",
+                os.path.join(root, "play.yml"),
+                "-e",
+                f"url={url} size={size} tasks={tasks} npm_run_on_controller={on_controller}",
+                "-e",
+                f"ansible_python_interpreter={sys.executable}",
+            ],
+            env=dict(os.environ, ANSIBLE_COLLECTIONS_PATH=root),
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        duration = time.perf_counter() - started
+        calls = requests.get(f"{url}/__mock__/stats", timeout=10).json()["requests"]
+        results.append(
+            dict(
+                execution=execution,
+                size=size,
+                tasks=tasks,
+                seconds=duration,
+                tasks_per_second=tasks / duration,
+                calls_per_task=calls / tasks,
+            ),
+        )
+    return results
+
+
+IMPORT_SNIPPET = """
+import sys, time
+started = time.perf_counter()
+import ansible_collections.nils_ost.proxymanager.plugins.modules.{name}
+print(time.perf_counter() - started, "requests" in sys.modules)
+"""
+
+
+def module_payload(root, name):
+    """builds the AnsiballZ payload of module name, returns its size and the size of the collection's files in it"""
+    from ansible.executor import module_common
+    from ansible.parsing.dataloader import DataLoader
+    from ansible.template import Templar
+
+    built = module_common.modify_module(
+        module_name=f"nils_ost.proxymanager.{name}",
+        module_path=os.path.join(REPO, "plugins", "modules", f"{name}.py"),
+        module_args=dict(),
+        templar=Templar(loader=DataLoader()),
+        task_vars=dict(ansible_python_interpreter=sys.executable),
+        module_compression="ZIP_DEFLATED",
+    )
+    data = built.b_module_data
+    own = 0
+    found = re.search(rb"zip_data='([A-Za-z0-9+/=]+)'", data)
+    if found is not None:
+        with zipfile.ZipFile(io.BytesIO(base64.b64decode(found.group(1)))) as z:
+            own = sum(
+                i.compress_size for i in z.infolist() if "/nils_ost/" in i.filename
+            )
+    return len(data), own
+
+
+def benchmark_startup(url, root, name, size, tasks):
+    """starts module name as regular module (new interpreter, arguments from a file) tasks times"""
+    env = dict(os.environ, PYTHONPATH=root)
+    # run by name, as the directory of the modules (holding token.py) on sys.path would shadow the stdlib module token
+    module = f"ansible_collections.nils_ost.proxymanager.plugins.modules.{name}"
+    args_file = os.path.join(root, f"{name}.json")
+    with open(args_file, "w") as f:
+        json.dump(dict(ANSIBLE_MODULE_ARGS=task_args(name, url, size, 0)), f)
+
+    imports = list()
+    first_requests = list()
+    runs = list()
+    loads_requests = False
+    for _ in range(tasks):
+        out = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET.format(name=name)],
+            cwd=root,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        imports.append(float(out[0]))
+        loads_requests = out[1] == "True"
+
+        requests.post(
+            f"{url}/__mock__/reset",
+            json={r: size for r in SEEDED},
+            timeout=60,
+        )
+        started = time.time()
+        subprocess.run(
+            [sys.executable, "-m", module, args_file],
+            cwd=root,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            check=False,
+        )
+        runs.append(time.time() - started)
+        first = requests.get(f"{url}/__mock__/stats", timeout=10).json()[
+            "first_request"
+        ]
+        if first is not None:
+            first_requests.append(first - started)
+
+    payload, own = module_payload(root, name)
+    return dict(
+        module=name,
+        import_ms=statistics.median(imports) * 1000,
+        first_request_ms=statistics.median(first_requests) * 1000
+        if first_requests
+        else None,
+        run_ms=statistics.median(runs) * 1000,
+        payload_kib=payload / 1024,
+        own_kib=own / 1024,
+        loads_requests=loads_requests,
+    )
+
+
+def print_module_result(r):
+    items = (
+        f"{r['items_per_second']:10.1f}"
+        if r["items_per_second"] is not None
+        else f"{'-':>10}"
+    )
+    notes = (
+        f"  ({r['failed']} failed, {r['changed']} changed)"
+        if r["failed"] or r["changed"]
+        else ""
+    )
+    print(
+        f"{r['module']:<18} {r['size']:>6} {r['tasks_per_second']:10.2f} tasks/s {items} items/s"
+        f" {r['calls_per_task']:8.2f} calls/task {r['peak_mib']:8.2f} peak MiB{notes}",
+        flush=True,
+    )
+
+
+def print_search_result(r):
+    print(
+        f"{r['lookup']:<7} {r['size']:>6} {r['position']:<8} {r['ms_per_lookup']:10.2f} ms/lookup"
+        f" {r['peak_mib']:8.2f} peak MiB",
+        flush=True,
+    )
+
+
+def print_playbook_result(r):
+    print(
+        f"{r['execution']:<10} {r['size']:>6} {r['tasks']:>5} tasks {r['seconds']:8.2f} s"
+        f" {r['tasks_per_second']:8.2f} tasks/s {r['calls_per_task']:6.2f} calls/task",
+        flush=True,
+    )
+
+
+def print_startup_result(r):
+    first = (
+        f"{r['first_request_ms']:8.1f}"
+        if r["first_request_ms"] is not None
+        else f"{'-':>8}"
+    )
+    print(
+        f"{r['module']:<18} {r['import_ms']:8.1f} import ms {first} first req ms {r['run_ms']:8.1f} run ms"
+        f" {r['payload_kib']:7.1f} payload KiB ({r['own_kib']:5.1f} own)"
+        f" requests {'imported' if r['loads_requests'] else 'not imported'}",
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="benchmark the modules against dev/mock_npm.py",
+    )
+    parser.add_argument(
+        "--sizes",
+        default="10,100,1000,10000",
+        help="comma separated numbers of existing objects",
+    )
+    parser.add_argument(
+        "--tasks",
+        type=int,
+        default=20,
+        help="module executions per module and size",
+    )
+    parser.add_argument(
+        "--modules",
+        default=",".join(MODULES),
+        help="comma separated modules to benchmark",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="seconds of latency added by the mock per request",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="print results as json instead of a table",
+    )
+    parser.add_argument(
+        "--search",
+        action="store_true",
+        help="compare full-list lookups parsed with json() and streamed, instead of running the modules",
+    )
+    parser.add_argument(
+        "--playbook",
+        action="store_true",
+        help="compare a loop of proxy tasks run by ansible-playbook as module and inside the controller",
+    )
+    parser.add_argument(
+        "--startup",
+        action="store_true",
+        help="measure import time, time to first request and payload size of the modules run as regular modules",
+    )
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    collection_path()
+    proc, url = start_mock(args.latency)
+    results = list()
+    try:
+        if args.playbook:
+            for size in sizes:
+                for r in benchmark_playbook(url, size, args.tasks):
+                    results.append(r)
+                    if not args.json:
+                        print_playbook_result(r)
+        elif args.startup:
+            from ansible.plugins.loader import init_plugin_loader
+
+            root = collection_root()
+            init_plugin_loader([root])
+            for name in args.modules.split(","):
+                results.append(
+                    benchmark_startup(url, root, name, sizes[0], args.tasks),
+                )
+                if not args.json:
+                    print_startup_result(results[-1])
+        elif args.search:
+            for size in sizes:
+                for r in benchmark_search(url, size, args.tasks):
+                    results.append(r)
+                    if not args.json:
+                        print_search_result(r)
+        else:
+            for name in args.modules.split(","):
+                for size in sizes:
+                    results.append(benchmark(name, url, size, args.tasks))
+                    if not args.json:
+                        print_module_result(results[-1])
+    finally:
+        proc.terminate()
+        proc.wait()
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
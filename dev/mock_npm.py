@@ -0,0 +1,606 @@
+#!/usr/bin/env python3
+"""
+Minimal stand-in for the Nginx Proxy Manager API, used for benchmarking the modules offline.
+
+Only depends on the python standard library. It implements the endpoints used by this collection:
+
+  * POST/GET  /api/tokens
+  * GET       /api/reports/hosts
+  * GET/POST  /api/nginx/<resource>           (list supports ?query= and ?expand=)
+  * GET/PUT/DELETE /api/nginx/<resource>/<id>
+  * POST      /api/nginx/certificates/<id>/renew
+
+where <resource> is one of proxy-hosts, redirection-hosts, certificates, access-lists, streams or dead-hosts.
+
+Additionally there are some control endpoints for benchmarks:
+
+  * GET  /__mock__/stats    number of requests (total and per route) and time (epoch) of the first request since last reset
+  * POST /__mock__/reset    drops all objects and creates the given amount of objects per resource
+  * POST /__mock__/config   changes latency, write_latency, reload_latency, error_rate and issue_delay at runtime
+  * POST /__mock__/sqlite   writes all objects to {"path": ...} in the layout of npm's database.sqlite
+                            (with {"wal": true} in WAL journal mode)
+
+With an issue_delay, creating a Let's Encrypt certificate behaves like the ACME exchange of npm: the
+certificate is stored right away with expires_on set to now, but the response (and the final
+expires_on) only follows after issue_delay seconds.
+
+With a reload_latency, every write holds a global lock for that many seconds, like the nginx reload of
+npm, so the latency of concurrent writes grows with their number.
+
+usage: python3 dev/mock_npm.py --port 8181 --proxy-hosts 1000 --latency 0.01
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+RESOURCES = [
+    "proxy-hosts",
+    "redirection-hosts",
+    "certificates",
+    "access-lists",
+    "streams",
+    "dead-hosts",
+]
+REPORT_KEYS = {
+    "proxy-hosts": "proxy",
+    "redirection-hosts": "redirection",
+    "streams": "stream",
+    "dead-hosts": "dead",
+}
+# the fields npm applies ?query= to (as LIKE %query%)
+SEARCH_FIELDS = {
+    "proxy-hosts": "domain_names",
+    "redirection-hosts": "domain_names",
+    "certificates": "nice_name",
+    "access-lists": "name",
+    "streams": "forwarding_host",
+    "dead-hosts": "domain_names",
+}
+OWNER = dict(
+    id=1,
+    email="admin@example.com",
+    name="Administrator",
+    nickname="Admin",
+    avatar="",
+    roles=["admin"],
+)
+
+
+def now(offset_days=0):
+    ts = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
+        days=offset_days,
+    )
+    return ts.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def generate(resource, i):
+    """returns a plausible object of resource number i, with the fields npm returns"""
+    base = dict(created_on=now(), modified_on=now(), owner_user_id=1, meta=dict())
+    domain = f"host{i}.bench.example"
+    if resource == "proxy-hosts":
+        base.update(
+            domain_names=[domain],
+            forward_scheme="http",
+            forward_host=f"10.0.{i // 250 % 250}.{i % 250}",
+            forward_port=8080,
+            access_list_id=0,
+            certificate_id=0,
+            ssl_forced=False,
+            caching_enabled=False,
+            block_exploits=False,
+            advanced_config="",
+            allow_websocket_upgrade=False,
+            http2_support=False,
+            hsts_enabled=False,
+            hsts_subdomains=False,
+            trust_forwarded_proto=False,
+            enabled=True,
+            locations=[],
+        )
+    elif resource == "redirection-hosts":
+        base.update(
+            domain_names=[f"redirect{i}.bench.example"],
+            forward_http_code=301,
+            forward_scheme="auto",
+            forward_domain_name=domain,
+            preserve_path=False,
+            certificate_id=0,
+            ssl_forced=False,
+            block_exploits=False,
+            advanced_config="",
+            http2_support=False,
+            hsts_enabled=False,
+            hsts_subdomains=False,
+            enabled=True,
+        )
+    elif resource == "certificates":
+        base.update(
+            provider="letsencrypt",
+            nice_name=f"cert{i}.bench.example",
+            domain_names=[f"cert{i}.bench.example", f"*.cert{i}.bench.example"],
+            expires_on=now(offset_days=i % 90),
+        )
+    elif resource == "access-lists":
+        base.update(
+            name=f"list{i}",
+            satisfy_any=False,
+            pass_auth=False,
+            items=[],
+            clients=[],
+        )
+    elif resource == "streams":
+        base.update(
+            incoming_port=10000 + i,
+            forwarding_host=f"10.1.{i // 250 % 250}.{i % 250}",
+            forwarding_port=22,
+            tcp_forwarding=True,
+            udp_forwarding=False,
+            certificate_id=0,
+            enabled=True,
+        )
+    elif resource == "dead-hosts":
+        base.update(
+            domain_names=[f"dead{i}.bench.example"],
+            certificate_id=0,
+            ssl_forced=False,
+            enabled=True,
+        )
+    return base
+
+
+# tables of npm's database.sqlite
+TABLES = {
+    "proxy-hosts": "proxy_host",
+    "redirection-hosts": "redirection_host",
+    "certificates": "certificate",
+    "access-lists": "access_list",
+    "streams": "stream",
+    "dead-hosts": "dead_host",
+}
+
+
+def column_type(name, value):
+    """declared column type, as created by npm's (knex) migrations"""
+    if name.endswith("_on"):
+        return "datetime"
+    if isinstance(value, (list, dict)):
+        return "json"
+    if isinstance(value, int):
+        return "integer"
+    return "varchar(255)"
+
+
+def column_value(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+# relations of items, only returned by list endpoints if requested with ?expand=
+RELATIONS = ("items", "clients")
+
+
+def mask_passwords(resource, item):
+    """like npm, never return the passwords of access list users, only a hint"""
+    if resource != "access-lists" or not item.get("items"):
+        return item
+    items = [
+        dict(i, password="", hint=str(i.get("password", ""))[:1] + "*" * 4)
+        for i in item["items"]
+    ]
+    return dict(item, items=items)
+
+
+def keep_passwords(item, data):
+    """like npm, keep the password of an existing access list user if it is sent empty"""
+    existing = {i.get("username"): i.get("password") for i in item.get("items", list())}
+    for i in data.get("items") or list():
+        if not i.get("password"):
+            i["password"] = existing.get(i.get("username"), "")
+
+
+def export_sqlite(items, path, wal=False):
+    """writes items (per resource, by id) to a new sqlite file in the layout of npm's database"""
+    if os.path.exists(path):
+        os.remove(path)
+    db = sqlite3.connect(path)
+    if wal:
+        db.execute("PRAGMA journal_mode = WAL")
+    rows = dict(access_list_auth=list(), access_list_client=list())
+    for resource, table in TABLES.items():
+        # like npm's migrations, flags are integer columns (0/1)
+        columns = dict(id="integer", is_deleted="integer")
+        columns.update(
+            {
+                k: column_type(k, v)
+                for k, v in generate(resource, 0).items()
+                if k not in ("items", "clients")
+            },
+        )
+        db.execute(
+            f"CREATE TABLE {table} ("
+            + ", ".join(f"{k} {v}" for k, v in columns.items())
+            + ")",
+        )
+        for item in items[resource].values():
+            values = [column_value(item.get(k, 0)) for k in columns]
+            db.execute(
+                f"INSERT INTO {table} VALUES ({', '.join('?' * len(columns))})",
+                values,
+            )
+            if resource == "access-lists":
+                for auth in item.get("items", list()):
+                    rows["access_list_auth"].append(
+                        (auth.get("id"), item["id"], auth.get("username"), ""),
+                    )
+                for client in item.get("clients", list()):
+                    rows["access_list_client"].append(
+                        (
+                            client.get("id"),
+                            item["id"],
+                            client.get("address"),
+                            client.get("directive"),
+                        ),
+                    )
+    db.execute(
+        "CREATE TABLE access_list_auth (id integer, access_list_id integer, username varchar(255), password varchar(255))",
+    )
+    db.execute(
+        "CREATE TABLE access_list_client (id integer, access_list_id integer, address varchar(255), directive varchar(255))",
+    )
+    db.executemany(
+        "INSERT INTO access_list_auth VALUES (?, ?, ?, ?)",
+        rows["access_list_auth"],
+    )
+    db.executemany(
+        "INSERT INTO access_list_client VALUES (?, ?, ?, ?)",
+        rows["access_list_client"],
+    )
+    db.commit()
+    db.close()
+
+
+class MockState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = 0.0
+        self.write_latency = 0.0
+        self.reload_latency = 0.0
+        self.reload_lock = threading.Lock()
+        self.error_rate = 0.0
+        self.issue_delay = 0.0
+        self.reset(dict())
+
+    def reset(self, sizes):
+        with self.lock:
+            self.items = {r: dict() for r in RESOURCES}
+            self.next_id = 1
+            self.requests = 0
+            self.routes = dict()
+            self.first_request = None
+            for resource in RESOURCES:
+                for i in range(int(sizes.get(resource, 0))):
+                    item = generate(resource, i)
+                    item["id"] = self.next_id
+                    self.items[resource][self.next_id] = item
+                    self.next_id += 1
+
+    def count(self, route):
+        with self.lock:
+            if self.first_request is None:
+                self.first_request = time.time()
+            self.requests += 1
+            self.routes[route] = self.routes.get(route, 0) + 1
+
+    def new_id(self):
+        with self.lock:
+            self.next_id += 1
+            return self.next_id - 1
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None
+
+    def log_message(self, *args):
+        pass
+
+    def send(self, code, obj):
+        body = json.dumps(obj).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def error(self, code, message):
+        self.send(code, dict(error=dict(code=code, message=message)))
+
+    def body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return None
+        return json.loads(self.rfile.read(length))
+
+    def do_GET(self):
+        self.route("GET")
+
+    def do_POST(self):
+        self.route("POST")
+
+    def do_PUT(self):
+        self.route("PUT")
+
+    def do_DELETE(self):
+        self.route("DELETE")
+
+    def route(self, method):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = url.path.strip("/").split("/")
+        data = self.body() if method in ("POST", "PUT") else None
+        state = self.state
+
+        if parts[0] == "__mock__":
+            return self.control(method, parts[1], data)
+
+        route = "/".join(p if not p.isdigit() else "{id}" for p in parts)
+        state.count(f"{method} /{route}")
+
+        time.sleep(state.latency + (state.write_latency if method != "GET" else 0))
+        if method != "GET" and parts[:2] == ["api", "nginx"] and state.reload_latency:
+            with state.reload_lock:
+                time.sleep(state.reload_latency)
+        if random.random() < state.error_rate:
+            return self.error(502, "injected error")
+
+        if parts[:2] == ["api", "tokens"]:
+            return self.tokens(method, data, query)
+        if parts[:3] == ["api", "reports", "hosts"]:
+            with state.lock:
+                counts = {
+                    key: len(state.items[resource])
+                    for resource, key in REPORT_KEYS.items()
+                }
+            return self.send(200, counts)
+        if parts[:2] == ["api", "nginx"] and len(parts) > 2 and parts[2] in RESOURCES:
+            return self.nginx(method, parts[2], parts[3:], data, query)
+        return self.error(404, "Not Found")
+
+    def control(self, method, action, data):
+        state = self.state
+        if action == "stats":
+            with state.lock:
+                return self.send(
+                    200,
+                    dict(
+                        requests=state.requests,
+                        routes=dict(state.routes),
+                        first_request=state.first_request,
+                    ),
+                )
+        if action == "reset" and method == "POST":
+            state.reset(data or dict())
+            return self.send(200, True)
+        if action == "sqlite" and method == "POST":
+            with state.lock:
+                export_sqlite(state.items, data["path"], wal=data.get("wal", False))
+            return self.send(200, True)
+        if action == "config" and method == "POST":
+            for key in (
+                "latency",
+                "write_latency",
+                "reload_latency",
+                "error_rate",
+                "issue_delay",
+            ):
+                if key in (data or dict()):
+                    setattr(state, key, float(data[key]))
+            return self.send(200, True)
+        return self.error(404, "Not Found")
+
+    def tokens(self, method, data, query):
+        expiry = (data or dict()).get("expiry") or query.get("expiry", ["1d"])[0]
+        seconds = int(expiry[:-1]) * {"d": 86400, "h": 3600, "m": 60, "s": 1}.get(
+            expiry[-1],
+            1,
+        )
+        expires = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
+            seconds=seconds,
+        )
+        if method == "POST" and not (data or dict()).get("identity"):
+            return self.error(400, "identity missing")
+        if method == "GET" and not self.headers.get("Authorization"):
+            return self.error(401, "Unauthorized")
+        return self.send(
+            200,
+            dict(
+                token=f"mock.{random.getrandbits(64):x}",
+                expires=expires.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            ),
+        )
+
+    def nginx(self, method, resource, rest, data, query):
+        state = self.state
+        items = state.items[resource]
+
+        if not rest:
+            if method == "GET":
+                with state.lock:
+                    result = list(items.values())
+                if "query" in query:
+                    term = query["query"][0].lower()
+                    result = [
+                        i
+                        for i in result
+                        if term in str(i.get(SEARCH_FIELDS[resource], "")).lower()
+                    ]
+                expand = query.get("expand", [""])[0].split(",")
+                if "owner" in expand:
+                    result = [dict(i, owner=OWNER) for i in result]
+                # like npm, relations of access lists are only returned if expanded
+                result = [
+                    {k: v for k, v in i.items() if k not in RELATIONS or k in expand}
+                    for i in result
+                ]
+                return self.send(200, [mask_passwords(resource, i) for i in result])
+            if method == "POST":
+                item = dict(data or dict())
+                item.update(
+                    id=state.new_id(),
+                    created_on=now(),
+                    modified_on=now(),
+                    owner_user_id=1,
+                )
+                issuing = (
+                    resource == "certificates"
+                    and item.get("provider") == "letsencrypt"
+                    and state.issue_delay > 0
+                )
+                if resource == "certificates":
+                    # like npm a certificate expires now until it has been issued
+                    item.setdefault(
+                        "expires_on",
+                        now() if issuing else now(offset_days=90),
+                    )
+                with state.lock:
+                    items[item["id"]] = item
+                if issuing:
+                    time.sleep(state.issue_delay)
+                    with state.lock:
+                        item.update(modified_on=now(), expires_on=now(offset_days=90))
+                return self.send(201, mask_passwords(resource, item))
+            return self.error(405, "Method Not Allowed")
+
+        if not rest[0].isdigit() or int(rest[0]) not in items:
+            return self.error(404, "Not Found")
+        item_id = int(rest[0])
+
+        if len(rest) == 2 and rest[1] == "renew" and method == "POST":
+            time.sleep(state.issue_delay)
+            with state.lock:
+                items[item_id].update(modified_on=now(), expires_on=now(offset_days=90))
+            return self.send(200, items[item_id])
+        if method == "GET":
+            return self.send(200, mask_passwords(resource, items[item_id]))
+        if method == "PUT":
+            with state.lock:
+                keep_passwords(items[item_id], data or dict())
+                items[item_id].update(data or dict())
+                items[item_id]["modified_on"] = now()
+            return self.send(200, mask_passwords(resource, items[item_id]))
+        if method == "DELETE":
+            with state.lock:
+                del items[item_id]
+            return self.send(200, True)
+        return self.error(405, "Method Not Allowed")
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # clients closing a connection early (e.g. after finding their item in a streamed list) are expected
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+
+def serve(
+    port=0,
+    sizes=None,
+    latency=0.0,
+    write_latency=0.0,
+    error_rate=0.0,
+    issue_delay=0.0,
+    reload_latency=0.0,
+):
+    """starts a mock server in a background thread and returns it, port 0 picks a free port"""
+    state = MockState()
+    state.reset(sizes or dict())
+    state.latency = latency
+    state.write_latency = write_latency
+    state.error_rate = error_rate
+    state.issue_delay = issue_delay
+    state.reload_latency = reload_latency
+    handler = type("BoundHandler", (Handler,), dict(state=state))
+    server = MockServer(("127.0.0.1", port), handler)
+    server.state = state
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="mock Nginx Proxy Manager API")
+    parser.add_argument("--port", type=int, default=8181)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="seconds added to every request",
+    )
+    parser.add_argument(
+        "--write-latency",
+        type=float,
+        default=0.0,
+        help="seconds added to every write",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="fraction of requests answered with 502",
+    )
+    parser.add_argument(
+        "--issue-delay",
+        type=float,
+        default=0.0,
+        help="seconds until a created Let's Encrypt certificate is issued",
+    )
+    parser.add_argument(
+        "--reload-latency",
+        type=float,
+        default=0.0,
+        help="seconds every write holds a global lock (like the nginx reload of npm)",
+    )
+    for resource in RESOURCES:
+        parser.add_argument(
+            f"--{resource}",
+            type=int,
+            default=0,
+            help=f"number of generated {resource}",
+        )
+    args = parser.parse_args()
+
+    sizes = {r: getattr(args, r.replace("-", "_")) for r in RESOURCES}
+    server = serve(
+        args.port,
+        sizes,
+        args.latency,
+        args.write_latency,
+        args.error_rate,
+        args.issue_delay,
+        args.reload_latency,
+    )
+    print(f"mock npm listening on {server.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from ansible_collections.nils_ost.proxymanager.plugins.plugin_utils.controller import (
+    ControllerActionBase,
+)
+
+
+class ActionModule(ControllerActionBase):
+    """runs module certificate_wait inside the controller, if the task is executed on the controller"""
+
+    MODULE = "certificate_wait"
@@ -0,0 +1,124 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    HTTP = r"""
+options:
+    connect_timeout:
+        description:
+            - seconds to wait for a connection to the API-Endpoint to be established
+        required: false
+        type: float
+        default: 10
+    read_timeout:
+        description:
+            - seconds to wait for the API-Endpoint to answer a request
+        required: false
+        type: float
+        default: 60
+    retries:
+        description:
+            - how often a failed request is retried, with jittered exponential backoff
+            - GET, PUT and DELETE are retried on connection errors, timeouts and 5xx responses
+            - POST is only retried if the connection couldn't be established at all
+        required: false
+        type: int
+        default: 3
+    retry_backoff:
+        description:
+            - base of the exponential backoff in seconds, the n-th retry waits a random time between 0 and I(retry_backoff) * 2^n
+        required: false
+        type: float
+        default: 0.5
+    circuit_breaker_threshold:
+        description:
+            - number of consecutive failed requests after which no further requests are sent to the API-Endpoint in this run
+            - C(0) disables the circuit breaker
+        required: false
+        type: int
+        default: 5
+    timings:
+        description:
+            - if a C(timings) block should be added to the result, containing the number of HTTP calls, their wall time per kind of call
+              (search, create, update, delete, token, probe), the bytes received, the number of list items scanned and the total module time
+            - if a module with option I(adaptive_concurrency) has written hosts or streams, C(write_concurrency) contains
+              the number of writes, the final and lowest limit of concurrent writes and how often it has been decreased
+        required: false
+        type: bool
+        default: false
+"""
+
+    DOCUMENTATION = r"""
+options:
+    url:
+        description:
+            - the full URL of API-Endpoint
+            - if neither I(url) nor I(token) are given, the calls are sent through the persistent
+            - C(ansible.netcommon.httpapi) connection of the host (see httpapi plugin C(nils_ost.proxymanager.npm))
+        required: false
+        type: str
+    token:
+        description:
+            - the token used for authentication on API-Endpoint
+            - required if I(url) is given
+        required: false
+        type: str
+    pool_connections:
+        description:
+            - number of connection pools (one per host) kept by the HTTP session
+        required: false
+        type: int
+        default: 1
+    pool_maxsize:
+        description:
+            - maximum number of keep-alive connections kept open per pool
+        required: false
+        type: int
+        default: 10
+    cache:
+        description:
+            - if complete lists (e.g. proxy hosts, redirection hosts, streams, certificates) should be cached on the controller,
+            - per npm instance and token (npm filters lists by the permissions of the user)
+            - only reads of whole lists are cached (e.g. by M(nils_ost.proxymanager.proxy_hosts), M(nils_ost.proxymanager.npm_facts)
+              or the certificate lookup of I(auto_certificate)), single items (e.g. the host of I(domain_name) of
+              M(nils_ost.proxymanager.proxy)) are always looked up on npm directly
+            - a cached list is only used if it's not older than I(cache_ttl) and its item count still matches the counters of C(/api/reports/hosts)
+            - the cached list of a resource is dropped on every successful create, update or delete of the collection
+            - "NOTE: changes done outside this collection, that don't change the number of items, are only noticed after I(cache_ttl)"
+        required: false
+        type: bool
+        default: false
+    cache_ttl:
+        description:
+            - seconds a cached list is considered valid
+        required: false
+        type: int
+        default: 60
+    cache_dir:
+        description:
+            - directory on the controller the cached lists are stored in
+        required: false
+        type: path
+        default: '~/.ansible/cache/nils_ost.proxymanager'
+    database:
+        description:
+            - path of the sqlite database of npm (C(data/database.sqlite) in the directory of role C(install_with_docker)),
+            - on the host the module runs on (the controller, if the task is delegated to localhost or a httpapi connection is used)
+            - if given, proxy hosts, redirection hosts, certificates, access lists, streams and dead hosts are read from this file instead of the API,
+            - creates, updates and deletes are still sent to the API
+            - if neither I(url) nor a httpapi connection is given, only reading modules (or check mode) can be used
+            - the file is opened read-only, a database in WAL mode also requires its C(-shm) and C(-wal) files to be readable
+        required: false
+        type: path
+    database_timeout:
+        description:
+            - seconds to wait for a write of npm to the I(database) to finish, before reading fails
+        required: false
+        type: float
+        default: 5
+"""
@@ -0,0 +1,40 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = r"""
+options:
+    workers:
+        description:
+            - number of create, update and delete requests sent to npm in parallel
+            - writes touching the same domain names (streams the same incoming port and protocol) are still executed one after another
+        required: false
+        type: int
+        default: 4
+    rate_limit:
+        description:
+            - maximum number of create, update and delete requests started per second, C(0) means unlimited
+        required: false
+        type: float
+        default: 0
+    exclusive:
+        description:
+            - if true, the list is the complete set of items managed on npm,
+            - every existing item none of the entries refers to (by its domain names, streams by incoming port and protocol) is deleted
+            - the deleted items are added to I(results) with C(pruned) set to true
+        required: false
+        type: bool
+        default: false
+    max_deletions:
+        description:
+            - safety limit for I(exclusive), if more items would be deleted the module fails before sending any request
+            - entries with C(state=absent) don't count against this limit
+        required: false
+        type: int
+        default: 10
+"""
@@ -0,0 +1,36 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = r"""
+options:
+    adaptive_concurrency:
+        description:
+            - every write of a host or stream makes npm regenerate its config and reload nginx,
+            - if true, the number of these writes sent in parallel (at most I(workers), if the module has this option) adapts to npm,
+            - it's halved on every slow (see I(latency_target)) or failed (5xx, 429, no answer) write and increased by one per round of writes in time
+            - The throttle only paces the writes within one module run, so it's only offered by modules writing several items per run,
+            - modules writing a single item (e.g. M(nils_ost.proxymanager.proxy) in a loop) send their write right away
+        required: false
+        type: bool
+        default: true
+    latency_target:
+        description:
+            - seconds a write may take, before it counts as slow for I(adaptive_concurrency)
+            - C(0) means twice the time (but at least 0.1 seconds more) of the fastest write of the module run
+        required: false
+        type: float
+        default: 0
+    max_writes_per_minute:
+        description:
+            - maximum number of writes of hosts and streams started per minute by one module run, e.g. for maintenance windows,
+            - C(0) means unlimited
+        required: false
+        type: int
+        default: 0
+"""
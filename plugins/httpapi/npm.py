@@ -0,0 +1,165 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from ansible.errors import AnsibleAuthenticationFailure, AnsibleConnectionFailure
+from ansible.plugins.httpapi import HttpApiBase
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import api, cache
+
+
+DOCUMENTATION = r"""
+---
+author: Nils Ost (@nils-ost)
+
+name: npm
+
+short_description: HttpApi plugin for Nginx Proxy Manager
+
+version_added: "2.1.0"
+
+description:
+    - This HttpApi plugin keeps one logged in, keep-alive session to the API of a Nginx Proxy Manager instance,
+    - that is shared by all tasks of a play using the C(ansible.netcommon.httpapi) connection
+    - The login is done with C(ansible_user) and C(ansible_password), the token is renewed shortly before it expires
+    - and after a 401 response a new login is done
+    - Alternatively an existing token can be given as C(ansible_httpapi_session_key) (a dict with key C(Authorization) and value C(Bearer <token>)),
+    - it is used as is, without login, renewal or a new login after a 401 response
+    - Modules of this collection use the connection if neither I(url) nor I(token) are given
+    - Requires the C(ansible.netcommon) collection
+
+options:
+    token_expiry:
+        description:
+            - lifetime requested for the token on login and renewal (e.g. C(1d) or C(12h))
+        type: str
+        default: '1d'
+        vars:
+            - name: ansible_httpapi_npm_token_expiry
+    renew_before:
+        description:
+            - the token is renewed if it expires within this many seconds
+        type: int
+        default: 300
+        vars:
+            - name: ansible_httpapi_npm_renew_before
+"""
+
+EXAMPLES = r"""
+# inventory
+# [npm]
+# npm.example.com
+#
+# [npm:vars]
+# ansible_connection=ansible.netcommon.httpapi
+# ansible_network_os=nils_ost.proxymanager.npm
+# ansible_httpapi_port=81
+# ansible_user=admin@example.com
+# ansible_password=secret
+
+- name: create proxy through the persistent connection
+  nils_ost.proxymanager.proxy:
+    domain_name: "some.domain"
+    forward_host: "192.168.1.234"
+"""
+
+
+class HttpApi(HttpApiBase):
+    def __init__(self, connection):
+        super().__init__(connection)
+        self.client = None
+        self.expires = None
+
+    def npm(self):
+        """returns the NpmClient of this connection, which lives as long as the persistent connection"""
+        if self.client is None:
+            self.client = api.NpmClient(self.connection._url)
+            self.client.session.verify = self.connection.get_option("validate_certs")
+        return self.client
+
+    def use_token(self, data):
+        self.npm().session.headers["Authorization"] = f"Bearer {data['token']}"
+        self.connection._auth = dict(Authorization=f"Bearer {data['token']}")
+        self.expires = data.get("expires")
+
+    def login(self, username, password):
+        if not username or not password:
+            raise AnsibleConnectionFailure(
+                "npm requires ansible_user and ansible_password (or ansible_httpapi_session_key)",
+            )
+
+        response = self.npm().post(
+            "/api/tokens",
+            dict(
+                identity=username,
+                secret=password,
+                expiry=self.get_option("token_expiry"),
+            ),
+        )
+        if not response.status_code == 200 or "token" not in response.json():
+            raise AnsibleAuthenticationFailure(
+                f"error on fetching API token: {response.text}",
+            )
+        self.use_token(response.json())
+
+    def relogin(self):
+        self.login(
+            self.connection.get_option("remote_user"),
+            self.connection.get_option("password"),
+        )
+
+    def renew(self):
+        """renews the token with itself if it expires soon, falls back to a new login"""
+        if self.expires is None:
+            return
+        if api.seconds_left(self.expires) > self.get_option("renew_before"):
+            return
+        response = self.npm().get(
+            "/api/tokens",
+            params=dict(expiry=self.get_option("token_expiry")),
+        )
+        if response.status_code == 200 and "token" in response.json():
+            self.use_token(response.json())
+        else:
+            self.relogin()
+
+    def logout(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+    def get_url(self):
+        return self.connection._url
+
+    def get_identity(self):
+        """returns the identity of the token of this connection, the list cache of the modules is keyed by it"""
+        self._ensure_session()
+        token = str(self.npm().session.headers.get("Authorization")).split(" ", 1)[-1]
+        return cache.token_identity(token)
+
+    def _ensure_session(self):
+        if not self.connection._connected:
+            self.connection._connect()
+        if self.connection._auth and "Authorization" not in self.npm().session.headers:
+            # with a session_key netcommon doesn't call login(), the key is only stored in _auth
+            self.npm().session.headers.update(self.connection._auth)
+
+    def send_request(self, method, path, data=None, params=None, timeout=None):
+        """
+        Sends one API call on behalf of a module and returns status code and body.
+        Called by api.ConnectionClient through the persistent connection.
+        """
+        self._ensure_session()
+        self.renew()
+
+        kwargs = dict(json=data, params=params)
+        if timeout is not None:
+            kwargs["timeout"] = tuple(timeout)
+        response = self.npm().request(method, path, **kwargs)
+        if response.status_code == 401 and self.connection.get_option("password"):
+            # token has been revoked (e.g. npm restarted with a new secret)
+            self.relogin()
+            response = self.npm().request(method, path, **kwargs)
+        return response.status_code, response.text
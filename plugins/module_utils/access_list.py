@@ -0,0 +1,187 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import ipaddress
+import itertools
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import diff
+
+
+RESOURCE = "/api/nginx/access-lists"
+
+# relations npm adds to access lists on request, the lists are useless without them
+EXPAND = "items,clients"
+
+# fields compared with the item on npm and how they are normalized (see diff.normalize)
+# Note: passwords of items can't be compared, npm never returns them
+FIELDS = dict(
+    name="text",
+    satisfy_any="bool",
+    pass_auth="bool",
+    items="users",
+    clients="clients",
+)
+
+# replaces passwords in results and diffs
+MASK = "********"
+
+
+def access_list_spec():
+    """returns the options describing a single access list"""
+    return dict(
+        name=dict(type="str", required=True),
+        satisfy_any=dict(type="bool", required=False, default=False),
+        pass_auth=dict(type="bool", required=False, default=False),
+        items=dict(
+            type="list",
+            elements="dict",
+            required=False,
+            default=list(),
+            options=dict(
+                username=dict(type="str", required=True),
+                password=dict(type="str", required=False, default=None, no_log=True),
+            ),
+        ),
+        update_password=dict(
+            type="str",
+            required=False,
+            default="on_create",
+            choices=["always", "on_create"],
+        ),
+        clients=dict(
+            type="list",
+            elements="dict",
+            required=False,
+            default=list(),
+            options=dict(
+                address=dict(type="str", required=True),
+                directive=dict(
+                    type="str",
+                    required=False,
+                    default="allow",
+                    choices=["allow", "deny"],
+                ),
+            ),
+        ),
+        collapse=dict(type="bool", required=False, default=True),
+        state=dict(type="str", default="present", choices=["absent", "present"]),
+    )
+
+
+def network_of(address):
+    """returns address as network, or "all"; raises ValueError if address is neither"""
+    address = str(address).strip().lower()
+    if address == "all":
+        return address
+    try:
+        return ipaddress.ip_network(address, strict=False)
+    except ValueError:
+        raise ValueError(f"invalid address of client: {address}")
+
+
+def collapse_clients(clients):
+    """
+    Returns clients (dicts of address and directive) with duplicates removed and neighbouring networks merged.
+
+    nginx applies the first rule matching an address, so only rules of the same directive, that follow each other,
+    can be merged and sorted without changing which addresses are allowed. Rules after one matching all addresses
+    are never reached and are left out.
+    """
+    collapsed = list()
+    for directive, run in itertools.groupby(clients, key=lambda c: c["directive"]):
+        networks = [network_of(c["address"]) for c in run]
+        if "all" in networks:
+            collapsed.append(dict(address="all", directive=directive))
+            break
+        # networks of different IP versions can't be collapsed together
+        for version in (4, 6):
+            for network in ipaddress.collapse_addresses(
+                n for n in networks if n.version == version
+            ):
+                collapsed.append(
+                    dict(address=diff.address(network), directive=directive),
+                )
+    return collapsed
+
+
+def build_data(params, item=None):
+    """
+    Translates module parameters of one access list into the npm API representation.
+    item is the existing access list, npm keeps the password of an existing user if it is sent empty,
+    which is done for all of them unless params update_password is always.
+    """
+    existing = diff.normalize("users", item.get("items", list())) if item else list()
+    items = list()
+    for user in params["items"]:
+        password = user.get("password") or ""
+        if (
+            user["username"].strip() in existing
+            and not params["update_password"] == "always"
+        ):
+            password = ""
+        items.append(dict(username=user["username"], password=password))
+
+    clients = [
+        dict(address=c["address"], directive=c["directive"]) for c in params["clients"]
+    ]
+    if params["collapse"]:
+        clients = collapse_clients(clients)
+
+    return dict(
+        name=params["name"],
+        satisfy_any=params["satisfy_any"],
+        pass_auth=params["pass_auth"],
+        items=items,
+        clients=clients,
+    )
+
+
+def missing_passwords(data, item=None):
+    """returns the usernames of data sent without password, that aren't users of item (the existing access list)"""
+    existing = diff.normalize("users", item.get("items", list())) if item else list()
+    return [
+        i["username"]
+        for i in data["items"]
+        if not i["password"] and i["username"].strip() not in existing
+    ]
+
+
+def masked(data):
+    """returns data with the passwords of its items replaced, for results and diffs"""
+    if data is None or "items" not in data:
+        return data
+    items = [dict(i, password=MASK) if i.get("password") else i for i in data["items"]]
+    return dict(data, items=items)
+
+
+def search(client, name):
+    name = diff.normalize("text", name)
+
+    def match(item):
+        return name == diff.normalize("text", item.get("name", ""))
+
+    return client.find_item(RESOURCE, match, term=name, expand=EXPAND)
+
+
+def create(client, data):
+    response = client.post(RESOURCE, data)
+    if not response.status_code == 201:
+        return (False, response.text)
+    return (True, response.json())
+
+
+def update(client, item, data):
+    response = client.put(f"{RESOURCE}/{item}", data)
+    if not response.status_code == 200:
+        return (False, response.text)
+    return (True, response.json())
+
+
+def delete(client, item):
+    response = client.delete(f"{RESOURCE}/{item}")
+    if not response.status_code == 200:
+        return (False, response.text)
+    return (True, response.json())
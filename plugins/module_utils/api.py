@@ -0,0 +1,582 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import datetime
+import json
+import time
+
+from ansible.module_utils.basic import missing_required_lib
+from ansible.module_utils.connection import Connection, ConnectionError
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import (
+    database,
+    jsonstream,
+)
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils.cache import (
+    ListCache,
+    token_identity,
+)
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils.parallel import (
+    WriteThrottle,
+)
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils.retry import (
+    IDEMPOTENT_METHODS,
+    CircuitBreaker,
+    backoff_delay,
+)
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils.timing import (
+    Timings,
+    operation_of,
+)
+
+
+# list endpoints and their counter in /api/reports/hosts, used to cheaply
+# check if a cached list is still complete
+PROBE_KEYS = {
+    "/api/nginx/proxy-hosts": "proxy",
+    "/api/nginx/redirection-hosts": "redirection",
+    "/api/nginx/streams": "stream",
+    "/api/nginx/dead-hosts": "dead",
+}
+
+# endpoints whose writes make npm regenerate its config and reload nginx, these are paced by the WriteThrottle
+# (certificates are not, the duration of their ACME exchange says nothing about the load of npm)
+THROTTLED = tuple(PROBE_KEYS) + ("/api/nginx/access-lists",)
+
+
+def http_argument_spec():
+    """returns the arguments controlling timeouts and retries of API calls"""
+    return dict(
+        connect_timeout=dict(type="float", required=False, default=10),
+        read_timeout=dict(type="float", required=False, default=60),
+        retries=dict(type="int", required=False, default=3),
+        retry_backoff=dict(type="float", required=False, default=0.5),
+        circuit_breaker_threshold=dict(type="int", required=False, default=5),
+        timings=dict(type="bool", required=False, default=False),
+    )
+
+
+def http_kwargs(params):
+    """translates the arguments of http_argument_spec into NpmClient keyword arguments"""
+    return dict(
+        timeout=(params["connect_timeout"], params["read_timeout"]),
+        retries=params["retries"],
+        retry_backoff=params["retry_backoff"],
+        breaker=CircuitBreaker(params["circuit_breaker_threshold"]),
+    )
+
+
+def load_requests():
+    """
+    Imports requests on first use. Importing requests (and urllib3, idna, charset_normalizer, ...)
+    takes about as long as everything else a module imports together, and is not needed for calls
+    through the httpapi connection or reads from the database.
+    """
+    try:
+        import requests
+        import requests.adapters
+    except ImportError:
+        raise ImportError(missing_required_lib("requests"))
+    return requests
+
+
+def connection_not_established(error):
+    """true if error was raised before the request could have reached npm"""
+    import urllib3
+
+    requests = load_requests()
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    reason = getattr(reason, "reason", reason)
+    return isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+
+def seconds_left(expires):
+    """
+    returns the seconds until expires (npm's ISO 8601 UTC notation of a token expiry
+    or the database notation of a certificate's expires_on) is reached
+    """
+    expires_at = datetime.datetime.strptime(
+        expires[:19].replace(" ", "T"),
+        "%Y-%m-%dT%H:%M:%S",
+    )
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    return (expires_at - now).total_seconds()
+
+
+def npm_argument_spec():
+    """returns the arguments shared by all modules talking to a npm API-Endpoint"""
+    spec = http_argument_spec()
+    spec.update(
+        url=dict(type="str", required=False, default=None),
+        token=dict(type="str", required=False, default=None, no_log=True),
+        pool_connections=dict(type="int", required=False, default=1),
+        pool_maxsize=dict(type="int", required=False, default=10),
+        cache=dict(type="bool", required=False, default=False),
+        cache_ttl=dict(type="int", required=False, default=60),
+        cache_dir=dict(
+            type="path",
+            required=False,
+            default="~/.ansible/cache/nils_ost.proxymanager",
+        ),
+        database=dict(type="path", required=False, default=None),
+        database_timeout=dict(type="float", required=False, default=5),
+    )
+    return spec
+
+
+def throttle_argument_spec():
+    """returns the arguments pacing writes to the THROTTLED endpoints, for modules doing such writes"""
+    return dict(
+        adaptive_concurrency=dict(type="bool", required=False, default=True),
+        latency_target=dict(type="float", required=False, default=0),
+        max_writes_per_minute=dict(type="int", required=False, default=0),
+    )
+
+
+def throttle_of(params):
+    """
+    returns the WriteThrottle for the writes of a module run, up to workers (if the module has them) in parallel,
+    or None if the module has no arguments of throttle_argument_spec
+    """
+    if "adaptive_concurrency" not in params:
+        return None
+    return WriteThrottle(
+        maximum=params.get("workers") or 1,
+        adaptive=params["adaptive_concurrency"],
+        latency_target=params["latency_target"],
+        per_minute=params["max_writes_per_minute"],
+    )
+
+
+def database_of(params):
+    """returns the Database given by the module arguments, or None"""
+    if params.get("database") is None:
+        return None
+    return database.Database(params["database"], timeout=params["database_timeout"])
+
+
+class NpmClient:
+    """
+    Thin wrapper around a pooled requests.Session for one npm instance.
+
+    Authorization and Content-Type headers are built once and keep-alive
+    connections are reused across calls, so a search followed by a PUT
+    only pays for one TCP (and TLS) handshake.
+
+    Every call is sent with timeout. Idempotent calls are retried on 5xx
+    responses and connection errors, all others only if the connection
+    couldn't be established at all. Failures are counted by breaker.
+
+    If a database is given, the lists it holds are read from it instead of the API.
+    Writes to the THROTTLED endpoints are paced by throttle, if given.
+    """
+
+    def __init__(
+        self,
+        url,
+        token=None,
+        pool_connections=1,
+        pool_maxsize=10,
+        cache=None,
+        timeout=(10, 60),
+        retries=3,
+        retry_backoff=0.5,
+        breaker=None,
+        timings=None,
+        database=None,
+        throttle=None,
+    ):
+        self.url = url.rstrip("/")
+        self.cache = cache
+        self.database = database
+        self.throttle = throttle
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.breaker = breaker if breaker is not None else CircuitBreaker(0)
+        self.timings = timings if timings is not None else Timings()
+        self.timings.throttle = throttle
+        self._report = None
+        requests = load_requests()
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(
+            {
+                "Content-Type": "application/json",
+                "Connection": "keep-alive",
+            },
+        )
+        if token is not None:
+            self.session.headers["Authorization"] = "Bearer %s" % token
+
+    @classmethod
+    def from_module(cls, module):
+        if module.params["url"] is None:
+            if module.params.get("database") is not None and not getattr(
+                module,
+                "_socket_path",
+                None,
+            ):
+                return DatabaseClient.from_module(module)
+            return ConnectionClient.from_module(module)
+        if module.params["token"] is None:
+            raise ValueError('"token" is required if "url" is given')
+
+        cache = None
+        if module.params["cache"]:
+            cache = ListCache(
+                module.params["cache_dir"],
+                module.params["url"].rstrip("/"),
+                token_identity(module.params["token"]),
+                ttl=module.params["cache_ttl"],
+            )
+        return cls(
+            module.params["url"],
+            module.params["token"],
+            pool_connections=module.params["pool_connections"],
+            # parallel workers need a connection each to keep them alive
+            pool_maxsize=max(
+                module.params["pool_maxsize"],
+                module.params.get("workers") or 1,
+            ),
+            cache=cache,
+            timings=Timings.for_module(module),
+            database=database_of(module.params),
+            throttle=throttle_of(module.params),
+            **http_kwargs(module.params),
+        )
+
+    def retry_wait(self, attempt, response=None):
+        delay = backoff_delay(attempt, self.retry_backoff)
+        if response is not None and response.headers.get("Retry-After", "").isdigit():
+            delay = max(delay, min(float(response.headers["Retry-After"]), 30.0))
+        time.sleep(delay)
+
+    def request(self, method, path, **kwargs):
+        if (
+            self.throttle is None
+            or method == "GET"
+            or not path.split("?")[0].startswith(THROTTLED)
+        ):
+            return self.send(method, path, **kwargs)
+        return self.throttle.run(lambda: self.send(method, path, **kwargs))
+
+    def send(self, method, path, **kwargs):
+        """sends one call (retrying it if possible), without throttling"""
+        requests = load_requests()
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            self.breaker.check()
+            started = time.monotonic()
+            try:
+                response = self.session.request(method, f"{self.url}{path}", **kwargs)
+                # the body of a streamed response is counted while it is read
+                self.timings.record(
+                    operation_of(method, path),
+                    time.monotonic() - started,
+                    0 if kwargs.get("stream") else len(response.content),
+                )
+            except requests.exceptions.RequestException as e:
+                self.timings.record(
+                    operation_of(method, path),
+                    time.monotonic() - started,
+                    0,
+                )
+                retryable = isinstance(
+                    e,
+                    (requests.exceptions.ConnectionError, requests.exceptions.Timeout),
+                ) and (method in IDEMPOTENT_METHODS or connection_not_established(e))
+                if retryable and attempt < self.retries:
+                    attempt += 1
+                    self.retry_wait(attempt)
+                    continue
+                self.breaker.failure()
+                raise
+
+            if response.status_code >= 500:
+                if method in IDEMPOTENT_METHODS and attempt < self.retries:
+                    attempt += 1
+                    self.retry_wait(attempt, response)
+                    continue
+                self.breaker.failure()
+            else:
+                self.breaker.success()
+
+            if method != "GET" and response.status_code < 400:
+                self.invalidate(path)
+            return response
+
+    def invalidate(self, path):
+        """drops the cached list the object behind path belongs to"""
+        self._report = None
+        if self.cache is None:
+            return
+        resource = path.split("?")[0]
+        parts = resource.split("/")
+        # /api/nginx/proxy-hosts/12(/...) belongs to /api/nginx/proxy-hosts
+        if len(parts) > 4:
+            resource = "/".join(parts[:4])
+        self.cache.invalidate(resource)
+
+    def probe_matches(self, resource, items):
+        """compares the number of items against the (cheap) /api/reports/hosts counters"""
+        key = PROBE_KEYS.get(resource)
+        if key is None:
+            return True
+        if self._report is None:
+            response = self.get("/api/reports/hosts")
+            if not response.status_code == 200:
+                return False
+            self._report = response.json()
+        return self._report.get(key) == len(items)
+
+    def list_items(self, resource, cached=True, expand=None):
+        """
+        GETs all items of a list endpoint.
+        expand names the relations npm should add to the items (e.g. "items,clients").
+        If a database is given, that holds the list, it is read from there (access lists are always expanded).
+        If caching is enabled, a cached list that isn't expired and still matches
+        the item counters of npm is returned instead, unless cached is false
+        (for callers that need to see modifications, which the counters don't reveal).
+        Expanded lists are never cached, the cache holds the plain lists only.
+        """
+        if self.database is not None and resource in database.TABLES:
+            success, items = self.database.list_items(resource)
+            if success:
+                self.timings.scanned(len(items))
+            return (success, items)
+
+        cache = self.cache if expand is None else None
+        if cache is not None and cached:
+            items = cache.load(resource)
+            if items is not None and self.probe_matches(resource, items):
+                self.timings.scanned(len(items))
+                return (True, items)
+
+        params = None if expand is None else dict(expand=expand)
+        response = self.get(resource, params=params)
+        if not response.status_code == 200:
+            return (False, response.text)
+        items = response.json()
+        self.timings.scanned(len(items))
+        if cache is not None:
+            cache.store(resource, items)
+        return (True, items)
+
+    def find_item(self, resource, match, term=None, expand=None):
+        """
+        GETs a list endpoint and returns the first item match(item) is true for, or None.
+        The response is parsed while it is received and reading stops as soon as the item is found,
+        so neither the rest of the body is transferred nor are the remaining items built.
+        With term npm narrows down the list first (server-side substring search, without expansions).
+        expand names the relations npm should add to the items (e.g. "items,clients").
+        If a database is given, that holds the list, it is searched instead (term isn't needed there,
+        access lists are always expanded).
+        """
+        if self.database is not None and resource in database.TABLES:
+            success, items = self.list_items(resource)
+            if not success:
+                return (False, items)
+            return (True, next((item for item in items if match(item)), None))
+
+        params = dict()
+        if term is not None:
+            params["query"] = term
+        if expand is not None:
+            params["expand"] = expand
+        response = self.get(resource, params=params or None, stream=True)
+        try:
+            if not response.status_code == 200:
+                return (False, response.text)
+            for item in jsonstream.iter_response(response, self.timings.received):
+                self.timings.scanned(1)
+                if match(item):
+                    return (True, item)
+            return (True, None)
+        finally:
+            # an unfinished body can't be reused, the connection is dropped from the pool
+            response.close()
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, data=None, **kwargs):
+        return self.request("POST", path, json=data, **kwargs)
+
+    def put(self, path, data=None, **kwargs):
+        return self.request("PUT", path, json=data, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def close(self):
+        self.session.close()
+        if self.database is not None:
+            self.database.close()
+
+
+class ConnectionResponse:
+    """the parts of a requests.Response the modules use, for a response received through the httpapi connection"""
+
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.headers = dict()
+
+    def json(self):
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            end = start + chunk_size
+            yield self.content[start:end]
+
+    def close(self):
+        pass
+
+
+class ConnectionClient(NpmClient):
+    """
+    NpmClient sending its calls through the persistent nils_ost.proxymanager.npm httpapi connection,
+    used by the modules if no url is given. The connection keeps the logged in, keep-alive session
+    to npm for all tasks and renews the token itself, retries are done there as well.
+    """
+
+    def __init__(
+        self,
+        connection,
+        cache=None,
+        timeout=(10, 60),
+        breaker=None,
+        timings=None,
+        database=None,
+        throttle=None,
+    ):
+        self.connection = connection
+        self.url = None
+        self.cache = cache
+        self.database = database
+        self.throttle = throttle
+        self.timeout = timeout
+        self.retries = 0
+        self.retry_backoff = 0
+        self.breaker = breaker if breaker is not None else CircuitBreaker(0)
+        self.timings = timings if timings is not None else Timings()
+        self.timings.throttle = throttle
+        self._report = None
+
+    @classmethod
+    def from_module(cls, module):
+        socket_path = getattr(module, "_socket_path", None)
+        if not socket_path:
+            raise ValueError(
+                '"url" and "token" are required if no httpapi connection is used',
+            )
+        connection = Connection(socket_path)
+
+        cache = None
+        if module.params["cache"]:
+            cache = ListCache(
+                module.params["cache_dir"],
+                connection.get_url(),
+                connection.get_identity(),
+                ttl=module.params["cache_ttl"],
+            )
+        kwargs = http_kwargs(module.params)
+        return cls(
+            connection,
+            cache=cache,
+            timeout=kwargs["timeout"],
+            breaker=kwargs["breaker"],
+            timings=Timings.for_module(module),
+            database=database_of(module.params),
+            throttle=throttle_of(module.params),
+        )
+
+    def send(self, method, path, **kwargs):
+        self.breaker.check()
+        started = time.monotonic()
+        try:
+            status_code, text = self.connection.send_request(
+                method,
+                path,
+                data=kwargs.get("json"),
+                params=kwargs.get("params"),
+                timeout=list(kwargs.get("timeout", self.timeout)),
+            )
+        except ConnectionError as e:
+            # only the message of the exception raised by requests is passed through the connection
+            if "Read timed out" in str(e):
+                raise load_requests().exceptions.ReadTimeout(str(e))
+            raise
+        response = ConnectionResponse(status_code, text)
+        self.timings.record(
+            operation_of(method, path),
+            time.monotonic() - started,
+            len(response.content),
+        )
+
+        if response.status_code >= 500:
+            self.breaker.failure()
+        else:
+            self.breaker.success()
+
+        if method != "GET" and response.status_code < 400:
+            self.invalidate(path)
+        return response
+
+    def close(self):
+        if self.database is not None:
+            self.database.close()
+
+
+class DatabaseClient(NpmClient):
+    """
+    NpmClient without any API, reading the lists from the sqlite database of npm only. Used by the modules
+    if a database but neither url nor a httpapi connection is given, e.g. for reports on the npm host itself.
+    Lists are also served to plain GETs of their endpoint, everything else fails, the API is the only write path.
+    """
+
+    def __init__(self, database, timings=None):
+        self.database = database
+        self.throttle = None
+        self.url = None
+        self.cache = None
+        self.timeout = (0, 0)
+        self.retries = 0
+        self.retry_backoff = 0
+        self.breaker = CircuitBreaker(0)
+        self.timings = timings if timings is not None else Timings()
+        self._report = None
+
+    @classmethod
+    def from_module(cls, module):
+        return cls(database_of(module.params), timings=Timings.for_module(module))
+
+    def request(self, method, path, **kwargs):
+        if method == "GET" and path in database.TABLES and not kwargs.get("params"):
+            success, items = self.database.list_items(path)
+            if not success:
+                return ConnectionResponse(500, items)
+            return ConnectionResponse(200, json.dumps(items))
+        raise ValueError(
+            f'"url" and "token" or a httpapi connection are required for {method} {path}, "database" is only read',
+        )
+
+    def invalidate(self, path):
+        pass
+
+    def close(self):
+        self.database.close()
@@ -0,0 +1,328 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import diff
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils.parallel import (
+    run_parallel,
+)
+
+
+def bulk_argument_spec():
+    """returns the arguments shared by all modules reconciling a list of items"""
+    return dict(
+        workers=dict(type="int", required=False, default=4),
+        rate_limit=dict(type="float", required=False, default=0),
+        exclusive=dict(type="bool", required=False, default=False),
+        max_deletions=dict(type="int", required=False, default=10),
+    )
+
+
+def domain_keys(obj):
+    """
+    Returns the index keys of a host: the normalized domain names of an item (or of the data sent),
+    or the domain_name of an entry.
+    """
+    if "domain_names" in obj:
+        return set(diff.normalize("domains", obj.get("domain_names") or list()))
+    return set([diff.normalize("host", obj["domain_name"])])
+
+
+def domain_label(obj):
+    """returns the domain_name of an entry, or the first domain name of an item"""
+    if "domain_name" in obj:
+        return obj["domain_name"]
+    names = obj.get("domain_names") or list()
+    return names[0] if names else None
+
+
+def index_items(items, keys=domain_keys):
+    """maps every key (see keys, by default the normalized domain names) of every existing item to the item itself"""
+    index = dict()
+    for item in items:
+        for key in keys(item):
+            index[key] = item
+    return index
+
+
+def reindex(index, old, new, keys=domain_keys):
+    """keeps index in sync after old got replaced by new (either might be None)"""
+    if old is not None:
+        for key in keys(old):
+            index.pop(key, None)
+    if new is not None:
+        for key in keys(new):
+            index[key] = new
+
+
+def check_unique(module, entries, result):
+    seen = set()
+    for params in entries:
+        name = diff.normalize("host", params["domain_name"])
+        if name in seen:
+            module.fail_json(
+                msg=f"domain_name is listed more than once: {params['domain_name']}",
+                **result,
+            )
+        seen.add(name)
+
+
+def check_entries(module, entries, result):
+    """fails on duplicate domain names and on present entries without forward_host"""
+    check_unique(module, entries, result)
+    for params in entries:
+        if params["state"] == "present" and params.get("forward_host") is None:
+            module.fail_json(
+                msg=f'"forward_host" is required if "state" is "present": {params["domain_name"]}',
+                **result,
+            )
+
+
+def summarize(results):
+    counts = dict()
+    for entry in results:
+        action = "failed" if entry.get("failed") else entry["action"]
+        counts[action] = counts.get(action, 0) + 1
+    return ", ".join(f"{v} {k}" for k, v in sorted(counts.items()))
+
+
+def exit_reconciled(module, result, key="domain_name"):
+    """exits with a summary of result["results"], failed entries are named by their key"""
+    summary = summarize(result["results"])
+    failed = [entry for entry in result["results"] if entry.get("failed")]
+    if failed:
+        names = ", ".join(f"{entry[key]}" for entry in failed)
+        module.fail_json(msg=f"error on reconciling items {names}: {summary}", **result)
+    if module.check_mode:
+        module.exit_json(msg=f"would have reconciled items: {summary}", **result)
+    module.exit_json(msg=f"reconciled items: {summary}", **result)
+
+
+def plan_waves(operations):
+    """
+    Assigns every operation to a wave, so that operations touching the same
+    domain names end up in different waves, in the order they were planned.
+    Operations of one wave are independent and can be executed in parallel.
+    """
+    last_wave = dict()
+    waves = list()
+    for op in operations:
+        wave = 1 + max((last_wave.get(name, -1) for name in op["touches"]), default=-1)
+        for name in op["touches"]:
+            last_wave[name] = wave
+        if wave == len(waves):
+            waves.append(list())
+        waves[wave].append(op)
+    return waves
+
+
+def prune(
+    module,
+    client,
+    resource,
+    items,
+    claimed,
+    result,
+    keys=domain_keys,
+    label=domain_label,
+    field="domain_name",
+):
+    """
+    Returns the delete operations for all items, whose id isn't in claimed (the items referred to by entries),
+    fails without any write if these are more than module.params max_deletions.
+    keys, label and field are described at plan.
+    """
+    orphans = [item for item in items if item.get("id") not in claimed]
+    if len(orphans) > module.params["max_deletions"]:
+        listed = ", ".join(f"{label(item)}" for item in orphans)
+        module.fail_json(
+            msg=f"exclusive would delete {len(orphans)} items, more than max_deletions ({module.params['max_deletions']}): {listed}",
+            **result,
+        )
+
+    operations = list()
+    for item in orphans:
+        entry = {field: label(item), "action": "deleted", "item": None, "pruned": True}
+        result["results"].append(entry)
+        operations.append(
+            dict(
+                entry=entry,
+                task=lambda i=item.get("id"): resource.delete(client, i),
+                before=item,
+                data=None,
+                diff=diff.as_diff(
+                    item,
+                    None,
+                    resource.FIELDS,
+                    header=f"{entry[field]}",
+                ),
+                touches=keys(item),
+            ),
+        )
+    return operations
+
+
+def reconcile(module, client, resource, entries, result, **identity):
+    """
+    Fetches all items of resource once and brings them in line with entries.
+
+    resource is one of the module_utils resource modules (e.g. proxy_host),
+    providing FIELDS, build_data, list_all, create, update and delete.
+    Per entry results are appended to result["results"] in the order of entries.
+    With module.params exclusive, every existing item none of the entries refers to is deleted as well
+    (appended to result["results"] marked as pruned), unless these are more than max_deletions.
+    The required writes are executed with module.params workers and rate_limit;
+    failing writes don't stop the others and are marked as failed in their entry.
+    identity (keys, label and field) is passed on to plan, by default items are identified by their domain names.
+    """
+    success, items = resource.list_all(client)
+    if not success:
+        module.fail_json(msg=f"error on fetching items: {items}", **result)
+
+    operations = plan(module, client, resource, items, entries, result, **identity)
+    execute(module, operations, result)
+    return result["results"]
+
+
+def plan(
+    module,
+    client,
+    resource,
+    items,
+    entries,
+    result,
+    keys=domain_keys,
+    label=domain_label,
+    field="domain_name",
+):
+    """
+    Decides what has to be done to bring items in line with entries, without sending any request.
+    Returns the operations: dicts of the result entry, the task doing the write, the touched keys,
+    the diff and the item before (None on creation) and the data sent (None on deletion).
+
+    Items and entries are matched by the index keys keys() returns for both (by default the normalized domain names,
+    for streams their incoming ports and protocols). A present entry matching several items fails the module
+    before anything is written, an absent one deletes all of them. label() names an entry or item
+    in results (as field), messages and diffs.
+    """
+    index = index_items(items, keys)
+    operations = list()
+    claimed = set()
+    for params in entries:
+        name = label(params)
+        wanted = keys(params)
+        found = {index[k].get("id"): index[k] for k in sorted(wanted) if k in index}
+        claimed.update(found)
+        entry = {field: name, "action": "unchanged", "item": None}
+        result["results"].append(entry)
+        ops = list()
+
+        if params["state"] == "present":
+            if len(found) > 1:
+                listed = ", ".join(f"{i}" for i in found)
+                module.fail_json(
+                    msg=f"{field} {name} collides with several existing items: {listed}",
+                    **result,
+                )
+            item = next(iter(found.values()), None)
+            entry["item"] = item
+            data = resource.build_data(params)
+            changes = (
+                resource.FIELDS
+                if item is None
+                else diff.changes(data, item, resource.FIELDS)
+            )
+
+            if item is None:
+                entry["action"] = "created"
+                entry["item"] = data
+                ops.append(dict(task=lambda d=data: resource.create(client, d)))
+
+            elif changes:
+                entry["action"] = "updated"
+                entry["item"] = data
+                ops.append(
+                    dict(
+                        task=lambda i=item.get("id"), d=data: resource.update(
+                            client,
+                            i,
+                            d,
+                        ),
+                    ),
+                )
+
+            if ops:
+                ops[0].update(
+                    before=item,
+                    data=data,
+                    diff=diff.as_diff(item, data, changes, header=f"{name}"),
+                )
+                reindex(index, item, data, keys)
+
+        elif found:
+            entry["action"] = "deleted"
+            for item in found.values():
+                ops.append(
+                    dict(
+                        task=lambda i=item.get("id"): resource.delete(client, i),
+                        before=item,
+                        data=None,
+                        diff=diff.as_diff(
+                            item,
+                            None,
+                            resource.FIELDS,
+                            header=f"{name}",
+                        ),
+                    ),
+                )
+                reindex(index, item, None, keys)
+
+        for op in ops:
+            op["entry"] = entry
+            # writes touching the same keys have to be executed in the planned order
+            op["touches"] = set(wanted)
+            if op["before"] is not None:
+                op["touches"].update(keys(op["before"]))
+            operations.append(op)
+
+    if module.params["exclusive"]:
+        operations += prune(
+            module,
+            client,
+            resource,
+            items,
+            claimed,
+            result,
+            keys=keys,
+            label=label,
+            field=field,
+        )
+    return operations
+
+
+def execute(module, operations, result):
+    """
+    Executes the writes of operations (see plan) wave by wave, with module.params workers and rate_limit.
+    Nothing is written in check mode.
+    """
+    waves = list() if module.check_mode else plan_waves(operations)
+    for wave in waves:
+        responses = run_parallel(
+            [op["task"] for op in wave],
+            workers=module.params["workers"],
+            rate=module.params["rate_limit"],
+        )
+        for op, (success, response) in zip(wave, responses):
+            if not success:
+                op["entry"]["failed"] = True
+                op["entry"]["msg"] = f"{response}"
+            elif op["entry"]["action"] != "deleted":
+                op["entry"]["item"] = response
+
+    result["changed"] = any(not op["entry"].get("failed") for op in operations)
+    if module._diff:
+        result["diff"] = [
+            op["diff"] for op in operations if not op["entry"].get("failed")
+        ]
@@ -0,0 +1,164 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+import time
+
+
+def read_entry(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_entry(directory, path, entry):
+    """atomically writes entry as json to path, only readable by the current user"""
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+    except OSError:
+        # a cache that can't be written just isn't used
+        pass
+
+
+def remove_entry(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def entry_path(directory, *key):
+    digest = hashlib.sha256("|".join(key).encode("utf-8")).hexdigest()
+    return os.path.join(directory, f"{digest}.json")
+
+
+def token_identity(token):
+    """returns the identity of the lists fetched with token (a digest, the token itself is never stored)"""
+    return hashlib.sha256(str(token).encode("utf-8")).hexdigest()
+
+
+class ListCache:
+    """
+    On-controller file cache for the list responses of one npm instance, as seen by one API token.
+
+    npm filters lists by the permissions of the user, so every cached list is stored in its own file,
+    named after a hash of the instance url, the identity of the token (see token_identity) and the resource path.
+    Files are only readable by the current user, as certificate lists might contain provider credentials.
+    """
+
+    def __init__(self, directory, url, identity, ttl=60):
+        self.directory = os.path.expanduser(directory)
+        self.url = url
+        self.identity = identity
+        self.ttl = ttl
+
+    def path(self, resource):
+        return entry_path(self.directory, self.url, self.identity, resource)
+
+    def load(self, resource):
+        """returns the cached items of resource, or None if missing, expired or unreadable"""
+        entry = read_entry(self.path(resource))
+        if entry is None:
+            return None
+        for key, value in (
+            ("url", self.url),
+            ("identity", self.identity),
+            ("resource", resource),
+        ):
+            if not entry.get(key) == value:
+                return None
+        if time.time() - entry.get("stored_at", 0) > self.ttl:
+            return None
+        return entry.get("items")
+
+    def store(self, resource, items):
+        entry = dict(
+            url=self.url,
+            identity=self.identity,
+            resource=resource,
+            stored_at=time.time(),
+            items=items,
+        )
+        write_entry(self.directory, self.path(resource), entry)
+
+    def invalidate(self, resource):
+        remove_entry(self.path(resource))
+
+
+class TokenCache:
+    """
+    On-controller file cache for npm API tokens, keyed by instance url, user and requested expiry.
+
+    A cached token is only returned for the secret it has been fetched with, so the cache never
+    skips the check of the password. Entries store a salted, slow digest of the secret, not the secret itself.
+    """
+
+    # iterations of the key derivation of the secret digest
+    ROUNDS = 50000
+
+    def __init__(self, directory, url, user, secret, expiry):
+        self.directory = os.path.expanduser(directory)
+        self.url = url
+        self.user = user
+        self.secret = secret
+        self.expiry = expiry
+
+    def path(self):
+        return entry_path(self.directory, "token", self.url, self.user, self.expiry)
+
+    def digest(self, salt):
+        return hashlib.pbkdf2_hmac(
+            "sha256",
+            self.secret.encode("utf-8"),
+            bytes.fromhex(salt),
+            self.ROUNDS,
+        ).hex()
+
+    def load(self):
+        """returns (token, expires) of the cached token, or None if there is none for this secret"""
+        entry = read_entry(self.path())
+        if entry is None:
+            return None
+        for key in ("url", "user", "expiry"):
+            if not entry.get(key) == getattr(self, key):
+                return None
+        if not entry.get("token") or not entry.get("expires") or not entry.get("salt"):
+            return None
+        try:
+            if not hmac.compare_digest(
+                entry.get("secret", ""),
+                self.digest(entry["salt"]),
+            ):
+                return None
+        except (TypeError, ValueError):
+            return None
+        return (entry["token"], entry["expires"])
+
+    def store(self, token, expires):
+        salt = os.urandom(16).hex()
+        entry = dict(
+            url=self.url,
+            user=self.user,
+            expiry=self.expiry,
+            salt=salt,
+            secret=self.digest(salt),
+            token=token,
+            expires=expires,
+        )
+        write_entry(self.directory, self.path(), entry)
+
+    def invalidate(self):
+        remove_entry(self.path())
@@ -0,0 +1,204 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import api, diff
+
+
+RESOURCE = "/api/nginx/certificates"
+
+# seconds npm's answer is waited for, if a certificate is ordered without waiting for the ACME exchange
+SUBMIT_TIMEOUT = 2
+
+
+class CertificateIndex:
+    """
+    Suffix trie over the domain names of all certificates, walked by the reversed labels of a name
+    (www.example.com -> com, example, www). Each node holds the certificates naming it exactly and
+    those with a wildcard one label below it (*.example.com is held by the node of example.com).
+    Like in TLS a wildcard only covers a single label, so *.example.com covers www.example.com,
+    but neither example.com nor a.www.example.com.
+    """
+
+    def __init__(self, items=None):
+        self.root = self.new_node()
+        for item in items or list():
+            self.add(item)
+
+    @staticmethod
+    def new_node():
+        return dict(children=dict(), exact=list(), wildcard=list())
+
+    def node(self, labels, create=False):
+        """returns the node of the name given by labels (not reversed), or None"""
+        node = self.root
+        for label in reversed(labels):
+            if label not in node["children"]:
+                if not create:
+                    return None
+                node["children"][label] = self.new_node()
+            node = node["children"][label]
+        return node
+
+    def add(self, item):
+        for name in diff.normalize("domains", item.get("domain_names", list())):
+            labels = name.split(".")
+            if labels[0] == "*":
+                self.node(labels[1:], create=True)["wildcard"].append(item)
+            else:
+                self.node(labels, create=True)["exact"].append(item)
+
+    def candidates(self, name, wildcard=True):
+        """returns the certificates naming name exactly and (if wildcard) those covering it by a wildcard"""
+        labels = diff.normalize("host", name).split(".")
+        if labels[0] == "*":
+            # a wildcard name is only matched by the same wildcard
+            node = self.node(labels[1:])
+            return (list(node["wildcard"]) if node else list(), list())
+
+        node = self.node(labels)
+        exact = list(node["exact"]) if node else list()
+        parent = self.node(labels[1:]) if wildcard and len(labels) > 1 else None
+        return (exact, list(parent["wildcard"]) if parent else list())
+
+    def lookup(self, name, wildcard=True):
+        """
+        Returns the best certificate covering name or None.
+        Certificates that are not expired come first, then exact matches before wildcards,
+        then the one expiring latest.
+        """
+        exact, covering = self.candidates(name, wildcard)
+        ranked = [(rank(item, True), item) for item in exact]
+        ranked += [(rank(item, False), item) for item in covering]
+        if not ranked:
+            return None
+        return max(ranked, key=lambda entry: entry[0])[1]
+
+
+def rank(item, exact):
+    """sort key of a certificate covering a name, see CertificateIndex.lookup"""
+    expires = item.get("expires_on") or ""
+    try:
+        valid = not expires or api.seconds_left(expires) > 0
+    except ValueError:
+        valid = True
+    return (valid, exact, expires.replace(" ", "T")[:19])
+
+
+def is_valid(item):
+    """true if the certificate has been issued and isn't expired (npm sets expires_on to now until it's issued)"""
+    expires = item.get("expires_on")
+    try:
+        return bool(expires) and api.seconds_left(expires) > 0
+    except ValueError:
+        return False
+
+
+def list_all(client):
+    return client.list_items(RESOURCE)
+
+
+def search(client, name, wildcard=True):
+    """
+    Returns the best certificate covering name (see CertificateIndex.lookup), fetching the list of certificates once.
+    npm only searches the nice_name of certificates and can't match wildcards, so the full list is required.
+    """
+    success, items = list_all(client)
+    if not success:
+        return (False, items)
+    return (True, CertificateIndex(items).lookup(name, wildcard))
+
+
+def assign_certificates(client, entries):
+    """
+    Sets the certificate_id of every present entry with auto_certificate (and no certificate_id given)
+    to the best certificate covering its domain_name, the certificates are fetched at most once.
+    Returns the (copied) entries, or the error if no certificate covers some of them.
+    """
+    index = None
+    assigned = list()
+    missing = list()
+    for params in entries:
+        if (
+            params["state"] == "present"
+            and params.get("auto_certificate")
+            and not params.get("certificate_id")
+        ):
+            if index is None:
+                success, items = list_all(client)
+                if not success:
+                    return (False, f"error on fetching certificates: {items}")
+                index = CertificateIndex(items)
+            item = index.lookup(params["domain_name"])
+            if item is None:
+                missing.append(params["domain_name"])
+            else:
+                params = dict(params, certificate_id=item["id"])
+        assigned.append(params)
+    if missing:
+        return (False, f"no certificate covers: {', '.join(missing)}")
+    return (True, assigned)
+
+
+def create(client, data):
+    # the ACME exchange (especially DNS challenges) regularly takes minutes
+    timeout = (client.timeout[0], max(client.timeout[1], 600))
+    response = client.post(RESOURCE, data, timeout=timeout)
+    if not response.status_code == 201:
+        return (False, response.text)
+    return (True, response.json())
+
+
+def renew(client, item):
+    # like the order, the renewal runs the whole ACME exchange
+    timeout = (client.timeout[0], max(client.timeout[1], 600))
+    response = client.post(f"{RESOURCE}/{item}/renew", timeout=timeout)
+    if not response.status_code == 200:
+        return (False, response.text)
+    return (True, response.json())
+
+
+def submit(client, data, timeout=SUBMIT_TIMEOUT):
+    """
+    Orders a certificate without waiting for the ACME exchange to finish. npm stores the certificate before
+    the exchange starts and finishes it even if the client stopped waiting, so a timed out answer means
+    the order is pending. Returns the certificate if npm answered within timeout, None if it is pending.
+    """
+    requests = api.load_requests()
+    try:
+        response = client.post(RESOURCE, data, timeout=(client.timeout[0], timeout))
+    except requests.exceptions.ReadTimeout:
+        client.invalidate(RESOURCE)
+        return (True, None)
+    if not response.status_code == 201:
+        return (False, response.text)
+    return (True, response.json())
+
+
+def poll(client, names):
+    """
+    Fetches all certificates once (from the database if given, bypassing the list cache,
+    as issuing doesn't change the number of items) and returns the state (valid, pending or missing)
+    and the best certificate covering each of names.
+    """
+    success, items = client.list_items(RESOURCE, cached=False)
+    if not success:
+        return (False, items)
+    index = CertificateIndex(items)
+    states = dict()
+    for name in names:
+        item = index.lookup(name)
+        if item is None:
+            states[name] = ("missing", None)
+        else:
+            states[name] = ("valid" if is_valid(item) else "pending", item)
+    return (True, states)
+
+
+def delete(client, item):
+    response = client.delete(f"{RESOURCE}/{item}")
+    if not response.status_code == 200:
+        return (False, response.text)
+    return (True, response.json())
@@ -0,0 +1,189 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import json
+import threading
+
+from urllib.parse import quote
+
+
+# list endpoints and the table npm keeps their items in
+TABLES = {
+    "/api/nginx/proxy-hosts": "proxy_host",
+    "/api/nginx/redirection-hosts": "redirection_host",
+    "/api/nginx/certificates": "certificate",
+    "/api/nginx/access-lists": "access_list",
+    "/api/nginx/streams": "stream",
+    "/api/nginx/dead-hosts": "dead_host",
+}
+
+# rows of these tables are added to the access lists, like npm does with ?expand=items,clients
+# (without the passwords of items)
+ACCESS_LIST_ROWS = dict(
+    items=("access_list_auth", ("id", "username")),
+    clients=("access_list_client", ("id", "address", "directive")),
+)
+
+
+def load_json(value):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+# the flags of every table, like the boolFields of npm's models: npm's migrations declare them as integer,
+# the API returns them as booleans
+BOOLEAN_FIELDS = dict(
+    proxy_host=(
+        "ssl_forced",
+        "caching_enabled",
+        "block_exploits",
+        "allow_websocket_upgrade",
+        "http2_support",
+        "enabled",
+        "hsts_enabled",
+        "hsts_subdomains",
+        "trust_forwarded_proto",
+    ),
+    redirection_host=(
+        "enabled",
+        "preserve_path",
+        "ssl_forced",
+        "block_exploits",
+        "hsts_enabled",
+        "hsts_subdomains",
+        "http2_support",
+    ),
+    dead_host=(
+        "ssl_forced",
+        "http2_support",
+        "enabled",
+        "hsts_enabled",
+        "hsts_subdomains",
+    ),
+    stream=("enabled", "tcp_forwarding", "udp_forwarding"),
+    access_list=("satisfy_any", "pass_auth"),
+)
+
+# columns holding json, like the jsonAttributes of npm's models
+JSON_FIELDS = ("domain_names", "meta", "locations")
+
+# columns not listed above are converted by their declared type, or taken as they are
+CONVERTERS = dict(boolean=bool, json=load_json)
+
+
+def converter_of(table, name, declared):
+    """returns the function converting the values of column name of table to their API form, or None"""
+    if name in BOOLEAN_FIELDS.get(table, ()):
+        return bool
+    if name in JSON_FIELDS:
+        return load_json
+    return CONVERTERS.get(declared)
+
+
+class Database:
+    """
+    Read-only access to the sqlite database of a npm instance (data/database.sqlite, see role install_with_docker),
+    returning the items of the list endpoints in the same form as the API does.
+
+    The file is opened with mode=ro, so neither the database nor its journal are ever written, and
+    PRAGMA query_only is set on top. Every list is read by a single SELECT, which sqlite runs on a
+    consistent snapshot: in rollback journal mode (npm's default) it waits up to timeout seconds for a
+    write of npm to finish, in WAL mode it reads the last committed state without waiting.
+    """
+
+    def __init__(self, path, timeout=5):
+        self.path = path
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self._connection = None
+        self._columns = dict()
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            import sqlite3
+
+            connection = sqlite3.connect(
+                f"file:{quote(self.path)}?mode=ro",
+                uri=True,
+                timeout=self.timeout,
+                # the lists are read by parallel workers, every use is serialized by lock
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA query_only = 1")
+            self._connection = connection
+        return self._connection
+
+    def columns(self, table):
+        """returns the declared (lowercased) type of every column of table"""
+        if table not in self._columns:
+            rows = self.connection.execute(f'PRAGMA table_info("{table}")').fetchall()
+            self._columns[table] = {row[1]: (row[2] or "").lower() for row in rows}
+        return self._columns[table]
+
+    def select(self, table):
+        """returns all rows of table that are not deleted, as dicts with converted values"""
+        columns = self.columns(table)
+        if not columns:
+            raise LookupError(f"no such table: {table}")
+        query = f'SELECT * FROM "{table}"'
+        if "is_deleted" in columns:
+            query += " WHERE is_deleted = 0"
+        cursor = self.connection.execute(f"{query} ORDER BY id")
+        names = [d[0] for d in cursor.description]
+        converters = [
+            (name, converter_of(table, name, columns.get(name))) for name in names
+        ]
+        converted = [(name, c) for name, c in converters if c is not None]
+        rows = [dict(zip(names, values)) for values in cursor.fetchall()]
+        for row in rows:
+            for name, converter in converted:
+                if row[name] is not None:
+                    row[name] = converter(row[name])
+            row.pop("is_deleted", None)
+        return rows
+
+    def access_lists(self):
+        """returns the access lists with their items and clients, read within one transaction (one snapshot)"""
+        self.connection.execute("BEGIN")
+        try:
+            return self.expand_access_lists(self.select("access_list"))
+        finally:
+            self.connection.execute("COMMIT")
+
+    def expand_access_lists(self, items):
+        by_id = dict()
+        for item in items:
+            by_id[item["id"]] = item
+            for key in ACCESS_LIST_ROWS:
+                item[key] = list()
+        for key, (table, fields) in ACCESS_LIST_ROWS.items():
+            for row in self.select(table):
+                if row.get("access_list_id") in by_id:
+                    by_id[row["access_list_id"]][key].append(
+                        {f: row.get(f) for f in fields},
+                    )
+        return items
+
+    def list_items(self, resource):
+        """returns all items of the list endpoint resource, see TABLES"""
+        # sqlite3 is only imported if a database is used
+        import sqlite3
+
+        try:
+            with self.lock:
+                if TABLES[resource] == "access_list":
+                    return (True, self.access_lists())
+                return (True, self.select(TABLES[resource]))
+        except (sqlite3.Error, LookupError) as e:
+            return (False, f"error on reading {self.path}: {e}")
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,91 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import ipaddress
+
+from ansible.module_utils.parsing.convert_bool import boolean
+
+
+def normalize(kind, value):
+    """
+    Returns the canonical form of value, so values npm treats the same compare equal.
+    kind is one of domains, host, target, choice, int, bool, text, clients and users, any other kind leaves value as is.
+    """
+    if value is None:
+        return None
+    if kind == "domains":
+        # npm stores domain names lowercased, the order is not significant
+        return sorted(set(str(d).strip().lower() for d in value))
+    if kind in ("host", "choice"):
+        return str(value).strip().lower()
+    if kind == "target":
+        # a host optionally followed by a path, only the host is case-insensitive
+        host, slash, path = str(value).strip().partition("/")
+        return host.lower() + slash + path
+    if kind == "int":
+        return int(value)
+    if kind == "bool":
+        # depending on the database npm returns 0/1 instead of false/true
+        return boolean(value, strict=False)
+    if kind == "text":
+        # trailing whitespace and surrounding empty lines don't change the nginx config
+        lines = str(value).replace("\r\n", "\n").split("\n")
+        return "\n".join(line.rstrip() for line in lines).strip("\n")
+    if kind == "clients":
+        # the rules of an access list, their order is significant (nginx applies the first matching one)
+        return [
+            (str(c.get("directive")).strip().lower(), address(c.get("address")))
+            for c in value
+        ]
+    if kind == "users":
+        # the users of an access list, their passwords are never returned by npm
+        return sorted(set(str(i.get("username")).strip() for i in value))
+    return value
+
+
+def address(value):
+    """returns the canonical form of an address of an access list (a single IP, a network or all)"""
+    value = str(value).strip().lower()
+    try:
+        network = ipaddress.ip_network(value, strict=False)
+    except ValueError:
+        return value
+    if network.prefixlen == network.max_prefixlen:
+        return str(network.network_address)
+    return str(network)
+
+
+def changes(expected, actual, fields):
+    """
+    Returns the names of the fields (dict of name and kind) whose normalized values differ
+    between expected and actual, a field missing in one of them is a difference.
+    """
+    differing = list()
+    for key, kind in fields.items():
+        if key not in expected or key not in actual:
+            differing.append(key)
+            continue
+        try:
+            same = normalize(kind, expected[key]) == normalize(kind, actual[key])
+        except (TypeError, ValueError):
+            same = False
+        if not same:
+            differing.append(key)
+    return differing
+
+
+def as_diff(before, after, keys, header=None):
+    """
+    Builds the diff returned in --diff mode, containing keys of before (the item on npm) and after (the data sent).
+    before is None if the item is created, after is None if it is deleted.
+    """
+    result = dict(
+        before={k: before[k] for k in keys if k in before} if before else dict(),
+        after={k: after[k] for k in keys if k in after} if after else dict(),
+    )
+    if header is not None:
+        result.update(before_header=header, after_header=header)
+    return result
@@ -0,0 +1,86 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import codecs
+import json
+
+
+CHUNK_SIZE = 16 * 1024
+WHITESPACE = " \t\n\r"
+
+
+def iter_array(chunks, received=None):
+    """
+    Yields the elements of a JSON array, parsing it while the chunks (bytes) arrive.
+    Only the element currently parsed and the unparsed rest of the last chunk are held in memory,
+    so a caller that stops iterating stops reading. received(count) is called with the size of every chunk.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    position = 0
+    started = False
+    exhausted = False
+
+    def more():
+        nonlocal buffer, position, exhausted
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            exhausted = True
+            buffer = buffer[position:] + text.decode(b"", final=True)
+        else:
+            if received is not None:
+                received(len(chunk))
+            buffer = buffer[position:] + text.decode(chunk)
+        position = 0
+
+    while True:
+        while position < len(buffer) and buffer[position] in WHITESPACE:
+            position += 1
+        if position >= len(buffer):
+            if exhausted:
+                raise ValueError("unexpected end of JSON array")
+            more()
+            continue
+
+        if not started:
+            if buffer[position] != "[":
+                raise ValueError(f"expected a JSON array, got {buffer[position]!r}")
+            started = True
+            position += 1
+            continue
+        if buffer[position] == "]":
+            return
+        if buffer[position] == ",":
+            position += 1
+            continue
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            item, end = None, None
+        # an element is only complete if a separator follows, otherwise it might be truncated (e.g. a number)
+        following = end
+        while (
+            following is not None
+            and following < len(buffer)
+            and buffer[following] in WHITESPACE
+        ):
+            following += 1
+        if end is None or following >= len(buffer) or buffer[following] not in ",]":
+            if exhausted:
+                raise ValueError("invalid or truncated JSON array")
+            more()
+            continue
+        position = end
+        yield item
+
+
+def iter_response(response, received=None, chunk_size=CHUNK_SIZE):
+    """yields the elements of the JSON array in the body of a streamed requests response"""
+    return iter_array(response.iter_content(chunk_size=chunk_size), received)
@@ -0,0 +1,158 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RateLimiter:
+    """
+    Spaces out calls to wait() so that at most rate of them pass per second.
+    A rate of 0 (or less) disables limiting.
+    """
+
+    def __init__(self, rate=0):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self.lock = threading.Lock()
+        self.next_slot = 0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def run_task(task, limiter):
+    limiter.wait()
+    try:
+        return task()
+    except Exception as e:
+        return (False, f"{e}")
+
+
+def run_parallel(tasks, workers=1, rate=0):
+    """
+    Executes tasks (callables returning a (success, value) tuple) with up to
+    workers threads and at most rate task starts per second.
+
+    Returns the (success, value) tuples in the order of tasks. An exception
+    raised by a task is turned into (False, message), so one failing task
+    doesn't prevent the others from being executed.
+    """
+    limiter = RateLimiter(rate)
+    if workers <= 1 or len(tasks) <= 1:
+        return [run_task(task, limiter) for task in tasks]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_task, task, limiter) for task in tasks]
+        return [future.result() for future in futures]
+
+
+class WriteThrottle:
+    """
+    Paces the writes to npm, as every create, update or delete makes npm regenerate
+    its config and reload nginx, and overlapping reloads slow down live traffic.
+
+    The number of concurrent writes is controlled AIMD-style between 1 and maximum:
+    every write answered in time adds 1/limit (so about 1 per round of writes),
+    a slow (longer than latency_target) or failed (5xx, 429 or no answer) write halves it.
+    Only writes started after the last decrease can decrease it again, as the others still
+    reflect the former limit. Without latency_target, writes taking tolerance times as long
+    as the fastest write so far (and LATENCY_SLACK seconds more) count as slow.
+    Independent of that, at most per_minute writes are started per minute.
+    """
+
+    # latency differences below this are considered noise
+    LATENCY_SLACK = 0.1
+
+    def __init__(
+        self,
+        maximum=1,
+        adaptive=True,
+        latency_target=0,
+        tolerance=2.0,
+        per_minute=0,
+    ):
+        self.maximum = max(1, maximum)
+        self.adaptive = adaptive
+        self.latency_target = latency_target
+        self.tolerance = tolerance
+        self.limiter = RateLimiter(per_minute / 60.0)
+        self.condition = threading.Condition()
+        self.limit = float(self.maximum)
+        self.lowest = self.maximum
+        self.in_flight = 0
+        self.fastest = None
+        self.decreased_at = 0
+        self.decreases = 0
+        self.writes = 0
+
+    def is_slow(self, seconds):
+        if self.latency_target > 0:
+            return seconds > self.latency_target
+        if self.fastest is None:
+            return False
+        return seconds > max(
+            self.fastest * self.tolerance,
+            self.fastest + self.LATENCY_SLACK,
+        )
+
+    def acquire(self):
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+
+    def release(self, started, seconds, failed):
+        with self.condition:
+            self.in_flight -= 1
+            if not failed and (self.fastest is None or seconds < self.fastest):
+                self.fastest = seconds
+            if failed or self.is_slow(seconds):
+                if started >= self.decreased_at:
+                    self.limit = max(1.0, self.limit / 2)
+                    self.lowest = min(self.lowest, int(self.limit))
+                    self.decreased_at = time.monotonic()
+                    self.decreases += 1
+            else:
+                self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+            self.condition.notify_all()
+
+    def run(self, send):
+        """
+        Calls send (a write, returning the response) once a slot is free and the rate allows it.
+        Responses with a status code of 500 and above or 429, and exceptions, count as failed.
+        """
+        self.limiter.wait()
+        with self.condition:
+            self.writes += 1
+        if not self.adaptive:
+            return send()
+        self.acquire()
+        started = time.monotonic()
+        failed = True
+        try:
+            response = send()
+            failed = response.status_code >= 500 or response.status_code == 429
+            return response
+        finally:
+            self.release(started, time.monotonic() - started, failed)
+
+    def as_dict(self):
+        with self.condition:
+            return dict(
+                writes=self.writes,
+                limit=int(self.limit),
+                lowest=self.lowest,
+                decreases=self.decreases,
+            )
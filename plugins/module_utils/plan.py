@@ -0,0 +1,177 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import datetime
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import (
+    bulk,
+    diff,
+    proxy_host,
+    redirection_host,
+)
+
+
+# format of the plans written by npm_plan, npm_apply refuses plans of other versions
+VERSION = 1
+
+# resources a plan can contain, keyed by the name used in plans
+RESOURCES = dict(
+    proxy_hosts=proxy_host,
+    redirection_hosts=redirection_host,
+)
+
+# action of a change in a plan and of the corresponding entry in the results of bulk.plan
+ACTIONS = dict(created="create", updated="update", deleted="delete")
+RESULTS = {v: k for k, v in ACTIONS.items()}
+
+
+def fetch(client, resource):
+    """fetches all items of resource (from the database if given), bypassing the list cache (which doesn't notice modifications)"""
+    return client.list_items(resource.RESOURCE, cached=False)
+
+
+def serialize(name, operations):
+    """turns the operations of resource name (see bulk.plan) into the changes of a plan"""
+    changes = list()
+    for op in operations:
+        before = op["before"] or dict()
+        changes.append(
+            dict(
+                resource=name,
+                action=ACTIONS[op["entry"]["action"]],
+                domain_name=op["entry"]["domain_name"],
+                id=before.get("id"),
+                modified_on=before.get("modified_on"),
+                data=op["data"],
+                diff=op["diff"],
+                touches=sorted(op["touches"]),
+                pruned=op["entry"].get("pruned", False),
+            ),
+        )
+    return changes
+
+
+def build(changes):
+    """
+    Returns the plan of changes. Deletions are moved to the front, as npm doesn't allow
+    a domain name on two hosts, even if they are of different kinds.
+    """
+    changes = [c for c in changes if c["action"] == "delete"] + [
+        c for c in changes if not c["action"] == "delete"
+    ]
+    summary = {action: 0 for action in ACTIONS.values()}
+    for change in changes:
+        summary[change["action"]] += 1
+    return dict(
+        version=VERSION,
+        created_on=datetime.datetime.now(datetime.timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%SZ",
+        ),
+        summary=summary,
+        changes=changes,
+    )
+
+
+def verify(client, changes):
+    """
+    Compares changes with the current items on npm, fetching each resource once.
+    Returns the conflicts (updated or deleted items that have been modified or deleted in the meantime,
+    created domain names that exist by now), the plan can only be applied as is if there are none.
+    An item counts as modified if its modified_on or one of the fields in the diff of its change differ.
+    """
+    current = dict()
+    for name in dict.fromkeys(change["resource"] for change in changes):
+        success, items = fetch(client, RESOURCES[name])
+        if not success:
+            return (False, f"error on fetching {name}: {items}")
+        current[name] = (
+            {item.get("id"): item for item in items},
+            bulk.index_items(items),
+        )
+
+    # domain names released by the plan's own updates and deletes don't block its creates,
+    # as long as the item releasing them is unchanged (deletions are applied first, waves keep updates before creates)
+    for change in changes:
+        if change["action"] == "create":
+            continue
+        by_id, by_domain = current[change["resource"]]
+        item = by_id.get(change["id"])
+        if item is None or not item.get("modified_on") == change["modified_on"]:
+            continue
+        for name in change["touches"]:
+            if by_domain.get(name) is item:
+                del by_domain[name]
+
+    conflicts = list()
+    for change in changes:
+        by_id, by_domain = current[change["resource"]]
+        reason = None
+        if change["action"] == "create":
+            names = diff.normalize("domains", change["data"]["domain_names"])
+            existing = [by_domain[n]["id"] for n in names if n in by_domain]
+            if existing:
+                reason = f"exists by now as item {existing[0]}"
+        else:
+            item = by_id.get(change["id"])
+            if item is None:
+                reason = f"item {change['id']} has been deleted"
+            elif not item.get("modified_on") == change["modified_on"]:
+                reason = f"item {change['id']} has been modified on {item.get('modified_on')}"
+            else:
+                # modified_on only has a resolution of seconds, the fields the plan relies on are compared as well
+                before = change["diff"]["before"]
+                fields = RESOURCES[change["resource"]].FIELDS
+                changed = diff.changes(
+                    before,
+                    item,
+                    {k: fields[k] for k in before if k in fields},
+                )
+                if changed:
+                    reason = (
+                        f"item {change['id']} has been modified: {', '.join(changed)}"
+                    )
+        if reason is not None:
+            conflicts.append(
+                dict(
+                    resource=change["resource"],
+                    action=change["action"],
+                    domain_name=change["domain_name"],
+                    reason=reason,
+                ),
+            )
+    return (True, conflicts)
+
+
+def task_of(client, change):
+    """returns the callable doing the write of change"""
+    resource = RESOURCES[change["resource"]]
+    if change["action"] == "create":
+        return lambda: resource.create(client, change["data"])
+    if change["action"] == "update":
+        return lambda: resource.update(client, change["id"], change["data"])
+    return lambda: resource.delete(client, change["id"])
+
+
+def operations(client, changes, result):
+    """turns the changes of a plan into operations for bulk.execute, their entries are appended to result["results"]"""
+    ops = list()
+    for change in changes:
+        entry = dict(
+            resource=change["resource"],
+            domain_name=change["domain_name"],
+            action=RESULTS[change["action"]],
+            item=None,
+        )
+        result["results"].append(entry)
+        ops.append(
+            dict(
+                entry=entry,
+                task=task_of(client, change),
+                touches=set(change["touches"]),
+                diff=change["diff"],
+            ),
+        )
+    return ops
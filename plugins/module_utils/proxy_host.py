@@ -0,0 +1,121 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import diff
+
+
+RESOURCE = "/api/nginx/proxy-hosts"
+
+# fields compared with the item on npm and how they are normalized (see diff.normalize)
+# Note: 'locations' and 'meta' are intentionally excluded from comparison
+# - locations: complex array structure, future feature (see TODO.md)
+# - meta: read-only API response field
+FIELDS = dict(
+    domain_names="domains",
+    forward_scheme="choice",
+    forward_host="host",
+    forward_port="int",
+    caching_enabled="bool",
+    allow_websocket_upgrade="bool",
+    certificate_id="int",
+    ssl_forced="bool",
+    http2_support="bool",
+    hsts_enabled="bool",
+    hsts_subdomains="bool",
+    trust_forwarded_proto="bool",
+    advanced_config="text",
+    block_exploits="bool",
+    access_list_id="int",
+)
+
+
+def proxy_host_spec():
+    """returns the options describing a single proxy host, shared by modules proxy and proxy_hosts"""
+    return dict(
+        domain_name=dict(type="str", required=True),
+        forward_host=dict(type="str", required=False, default=None),
+        forward_scheme=dict(
+            type="str",
+            required=False,
+            default="http",
+            choices=["http", "https"],
+        ),
+        forward_port=dict(type="int", required=False, default=80),
+        enable_caching=dict(type="bool", required=False, default=False),
+        allow_websockets=dict(type="bool", required=False, default=False),
+        certificate_id=dict(type="int", required=False, default=0),
+        auto_certificate=dict(type="bool", required=False, default=False),
+        force_ssl=dict(type="bool", required=False, default=False),
+        http2_support=dict(type="bool", required=False, default=False),
+        hsts_enabled=dict(type="bool", required=False, default=False),
+        hsts_subdomains=dict(type="bool", required=False, default=False),
+        trust_forwarded_proto=dict(type="bool", required=False, default=False),
+        advanced_config=dict(type="str", required=False, default=""),
+        block_exploits=dict(type="bool", required=False, default=False),
+        access_list_id=dict(type="int", required=False, default=0),
+        state=dict(type="str", default="present", choices=["absent", "present"]),
+    )
+
+
+def build_data(params):
+    """translates module parameters of one proxy host into the npm API representation"""
+    return dict(
+        domain_names=[params["domain_name"]],
+        forward_scheme=params["forward_scheme"],
+        forward_host=params["forward_host"],
+        forward_port=params["forward_port"],
+        caching_enabled=params["enable_caching"],
+        allow_websocket_upgrade=params["allow_websockets"],
+        certificate_id=params["certificate_id"],
+        ssl_forced=params["force_ssl"],
+        http2_support=params["http2_support"],
+        hsts_enabled=params["hsts_enabled"],
+        hsts_subdomains=params["hsts_subdomains"],
+        trust_forwarded_proto=params["trust_forwarded_proto"],
+        advanced_config=params["advanced_config"],
+        block_exploits=params["block_exploits"],
+        access_list_id=params["access_list_id"],
+        # NOTE: locations and meta are read-only fields returned by API
+        # and should NOT be included in create/update requests
+    )
+
+
+def data_as_expected(d1, d2):
+    return not diff.changes(d1, d2, FIELDS)
+
+
+def list_all(client):
+    return client.list_items(RESOURCE)
+
+
+def search(client, name):
+    name = diff.normalize("host", name)
+
+    def match(item):
+        return name in diff.normalize("domains", item.get("domain_names", list()))
+
+    return client.find_item(RESOURCE, match, term=name)
+
+
+def create(client, data):
+    response = client.post(RESOURCE, data)
+    if not response.status_code == 201:
+        return (False, response.text)
+    return (True, response.json())
+
+
+def update(client, item, data):
+    response = client.put(f"{RESOURCE}/{item}", data)
+    if not response.status_code == 200:
+        return (False, response.text)
+    return (True, response.json())
+
+
+def delete(client, item):
+    response = client.delete(f"{RESOURCE}/{item}")
+    if not response.status_code == 200:
+        return (False, response.text)
+    return (True, response.json())
@@ -0,0 +1,105 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import diff
+
+
+RESOURCE = "/api/nginx/redirection-hosts"
+
+# fields compared with the item on npm and how they are normalized (see diff.normalize)
+FIELDS = dict(
+    domain_names="domains",
+    forward_http_code="int",
+    forward_scheme="choice",
+    forward_domain_name="target",
+    preserve_path="bool",
+    certificate_id="int",
+    ssl_forced="bool",
+    http2_support="bool",
+)
+
+
+def redirection_host_spec():
+    """returns the options describing a single redirection host, shared by modules redirection and redirection_hosts"""
+    return dict(
+        domain_name=dict(type="str", required=True),
+        forward_host=dict(type="str", required=False, default=None),
+        forward_code=dict(
+            type="int",
+            required=False,
+            default=301,
+            choices=[300, 301, 302, 303, 307, 308],
+        ),
+        forward_scheme=dict(
+            type="str",
+            required=False,
+            default="auto",
+            choices=["auto", "http", "https"],
+        ),
+        preserve_path=dict(type="bool", required=False, default=False),
+        certificate_id=dict(type="int", required=False, default=0),
+        auto_certificate=dict(type="bool", required=False, default=False),
+        force_ssl=dict(type="bool", required=False, default=False),
+        http2_support=dict(type="bool", required=False, default=False),
+        state=dict(type="str", default="present", choices=["absent", "present"]),
+    )
+
+
+def build_data(params):
+    """translates module parameters of one redirection host into the npm API representation"""
+    return dict(
+        domain_names=[params["domain_name"]],
+        forward_http_code=params["forward_code"],
+        forward_scheme=params["forward_scheme"],
+        forward_domain_name=params["forward_host"],
+        preserve_path=params["preserve_path"],
+        certificate_id=params["certificate_id"],
+        ssl_forced=params["force_ssl"],
+        http2_support=params["http2_support"],
+        advanced_config="",
+        block_exploits=False,
+        hsts_enabled=False,
+        hsts_subdomains=False,
+        meta={},
+    )
+
+
+def data_as_expected(d1, d2):
+    return not diff.changes(d1, d2, FIELDS)
+
+
+def list_all(client):
+    return client.list_items(RESOURCE)
+
+
+def search(client, name):
+    name = diff.normalize("host", name)
+
+    def match(item):
+        return name in diff.normalize("domains", item.get("domain_names", list()))
+
+    return client.find_item(RESOURCE, match, term=name)
+
+
+def create(client, data):
+    response = client.post(RESOURCE, data)
+    if not response.status_code == 201:
+        return (False, response.text)
+    return (True, response.json())
+
+
+def update(client, item, data):
+    response = client.put(f"{RESOURCE}/{item}", data)
+    if not response.status_code == 200:
+        return (False, response.text)
+    return (True, response.json())
+
+
+def delete(client, item):
+    response = client.delete(f"{RESOURCE}/{item}")
+    if not response.status_code == 200:
+        return (False, response.text)
+    return (True, response.json())
@@ -0,0 +1,54 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import random
+import threading
+
+
+# methods that can safely be sent again, if it's unknown whether npm processed them
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+def backoff_delay(attempt, base, cap=30.0):
+    """full jitter exponential backoff: a random delay between 0 and base * 2^attempt"""
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+class CircuitBreaker:
+    """
+    Counts consecutive failed requests against one npm instance. Once threshold
+    is reached the circuit opens, and every further request fails immediately
+    instead of adding load to an instance that is already struggling.
+    A threshold of 0 disables the breaker.
+    """
+
+    def __init__(self, threshold=5):
+        self.threshold = threshold
+        self.failures = 0
+        self.lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self.threshold > 0 and self.failures >= self.threshold
+
+    def check(self):
+        if self.is_open:
+            raise CircuitOpenError(
+                f"circuit breaker open after {self.failures} consecutive failed requests",
+            )
+
+    def success(self):
+        with self.lock:
+            if not self.is_open:
+                self.failures = 0
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
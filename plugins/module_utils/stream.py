@@ -0,0 +1,122 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import diff
+
+
+RESOURCE = "/api/nginx/streams"
+
+# fields compared with the item on npm and how they are normalized (see diff.normalize)
+FIELDS = dict(
+    incoming_port="int",
+    forwarding_host="host",
+    forwarding_port="int",
+    tcp_forwarding="bool",
+    udp_forwarding="bool",
+    certificate_id="int",
+)
+
+# the protocols a stream can forward and the field enabling each of them
+PROTOCOLS = dict(tcp="tcp_forwarding", udp="udp_forwarding")
+
+
+def stream_spec():
+    """returns the options describing a single stream"""
+    return dict(
+        incoming_port=dict(type="int", required=True),
+        forwarding_host=dict(type="str", required=False, default=None),
+        forwarding_port=dict(type="int", required=False, default=None),
+        tcp_forwarding=dict(type="bool", required=False, default=True),
+        udp_forwarding=dict(type="bool", required=False, default=False),
+        certificate_id=dict(type="int", required=False, default=0),
+        state=dict(type="str", default="present", choices=["absent", "present"]),
+    )
+
+
+def build_data(params):
+    """translates module parameters of one stream into the npm API representation"""
+    return dict(
+        incoming_port=params["incoming_port"],
+        forwarding_host=params["forwarding_host"],
+        forwarding_port=params["forwarding_port"],
+        tcp_forwarding=params["tcp_forwarding"],
+        udp_forwarding=params["udp_forwarding"],
+        certificate_id=params["certificate_id"],
+    )
+
+
+def keys_of(item):
+    """returns the (incoming port, protocol) pairs item (a stream or the parameters of one) listens on"""
+    port = diff.normalize("int", item.get("incoming_port"))
+    return set(
+        (port, protocol)
+        for protocol, field in PROTOCOLS.items()
+        if diff.normalize("bool", item.get(field, False))
+    )
+
+
+def name_of(key):
+    return f"{key[0]}/{key[1]}"
+
+
+def label_of(obj):
+    """returns the incoming port of a stream or an entry, naming it in results and messages"""
+    return obj.get("incoming_port")
+
+
+def check_entries(module, entries, result):
+    """
+    Fails on entries listening on the same incoming port and protocol (collisions), on present entries
+    without forwarding_host or forwarding_port and on entries without any protocol.
+    """
+    seen = dict()
+    for params in entries:
+        port = params["incoming_port"]
+        keys = keys_of(params)
+        if not keys:
+            module.fail_json(
+                msg=f'at least one of "tcp_forwarding" and "udp_forwarding" is required: {port}',
+                **result,
+            )
+        for key in sorted(keys):
+            if key in seen:
+                module.fail_json(
+                    msg=f"incoming_port and protocol are listed more than once: {name_of(key)}",
+                    **result,
+                )
+            seen[key] = params
+        if params["state"] == "present":
+            for field in ("forwarding_host", "forwarding_port"):
+                if params.get(field) is None:
+                    module.fail_json(
+                        msg=f'"{field}" is required if "state" is "present": {port}',
+                        **result,
+                    )
+
+
+def list_all(client):
+    return client.list_items(RESOURCE)
+
+
+def create(client, data):
+    response = client.post(RESOURCE, data)
+    if not response.status_code == 201:
+        return (False, response.text)
+    return (True, response.json())
+
+
+def update(client, item, data):
+    response = client.put(f"{RESOURCE}/{item}", data)
+    if not response.status_code == 200:
+        return (False, response.text)
+    return (True, response.json())
+
+
+def delete(client, item):
+    response = client.delete(f"{RESOURCE}/{item}")
+    if not response.status_code == 200:
+        return (False, response.text)
+    return (True, response.json())
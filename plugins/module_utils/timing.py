@@ -0,0 +1,103 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import threading
+import time
+
+
+# taken on first import, which happens right at module start (before argument parsing)
+MODULE_STARTED = time.monotonic()
+
+
+def operation_of(method, path):
+    """names the kind of API call, as reported in the timings block"""
+    path = path.split("?")[0]
+    if path.startswith("/api/tokens"):
+        return "token"
+    if path.startswith("/api/reports"):
+        return "probe"
+    if method == "GET":
+        return "search"
+    if method == "POST":
+        return "create"
+    if method == "PUT":
+        return "update"
+    if method == "DELETE":
+        return "delete"
+    return method.lower()
+
+
+class Timings:
+    """collects number, duration and size of API calls done during one module run"""
+
+    def __init__(self, started=MODULE_STARTED):
+        self.started = started
+        self.lock = threading.Lock()
+        self.http_calls = 0
+        self.bytes_received = 0
+        self.items_scanned = 0
+        self.operations = dict()
+        # the WriteThrottle of the client, its state is reported as well
+        self.throttle = None
+
+    @classmethod
+    def for_module(cls, module):
+        """
+        returns Timings for a run of module, measured from the start time the module carries
+        (if it runs inside the controller) or else from the import of this file
+        """
+        return cls(getattr(module, "started", MODULE_STARTED))
+
+    def record(self, operation, seconds, received):
+        with self.lock:
+            self.http_calls += 1
+            self.bytes_received += received
+            op = self.operations.setdefault(operation, dict(calls=0, seconds=0.0))
+            op["calls"] += 1
+            op["seconds"] += seconds
+
+    def received(self, count):
+        """adds bytes of a streamed body, that were read after the call was recorded"""
+        with self.lock:
+            self.bytes_received += count
+
+    def scanned(self, count):
+        with self.lock:
+            self.items_scanned += count
+
+    def as_dict(self):
+        throttle = self.throttle.as_dict() if self.throttle is not None else None
+        with self.lock:
+            timings = dict(
+                http_calls=self.http_calls,
+                bytes_received=self.bytes_received,
+                items_scanned=self.items_scanned,
+                operations={
+                    k: dict(calls=v["calls"], seconds=round(v["seconds"], 6))
+                    for k, v in self.operations.items()
+                },
+                total_seconds=round(time.monotonic() - self.started, 6),
+            )
+        if throttle is not None and throttle["writes"]:
+            timings["write_concurrency"] = throttle
+        return timings
+
+
+def report_timings(module, timings):
+    """
+    Adds the timings block to whatever result module exits (or fails) with,
+    if the module parameter timings is enabled.
+    """
+    if not module.params.get("timings"):
+        return
+    for name in ("exit_json", "fail_json"):
+        original = getattr(module, name)
+
+        def with_timings(original=original, **kwargs):
+            kwargs["timings"] = timings.as_dict()
+            original(**kwargs)
+
+        setattr(module, name, with_timings)
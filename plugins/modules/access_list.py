@@ -0,0 +1,352 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import (
+    access_list,
+    api,
+    diff,
+    timing,
+)
+
+
+DOCUMENTATION = r"""
+---
+module: access_list
+
+author: Nils Ost (@nils-ost)
+
+version_added: "2.1.0"
+
+short_description: create, update or delete npm access list
+
+description:
+    - This module creates, updates, deletes or just returns a Nginx Proxy Manager access list, including its clients and users
+    - Before they are sent, the clients are deduplicated and neighbouring networks of the same directive are merged and sorted,
+    - without changing which addresses are allowed (nginx applies the first matching rule), see I(collapse)
+    - An existing item is only updated if a field really differs, values are normalized before comparing,
+    - run with C(--diff) to get the differing fields
+    - The id of the access list (I(item.id)) is what M(nils_ost.proxymanager.proxy) expects as I(access_list_id)
+    - If the task is executed on the controller (e.g. delegated to localhost) the module runs inside the controller process,
+    - set variable C(npm_run_on_controller) to C(false) to run it as regular module instead
+
+extends_documentation_fragment:
+    - nils_ost.proxymanager.api
+    - nils_ost.proxymanager.api.http
+
+options:
+    name:
+        description:
+            - name of the access list, identifies the access list on npm
+        required: true
+        type: str
+    satisfy_any:
+        description:
+            - if access is granted if either a client rule or the basic authentication is satisfied, instead of both
+        required: false
+        type: bool
+        default: false
+    pass_auth:
+        description:
+            - if the Authorization header should be passed on to the backend
+        required: false
+        type: bool
+        default: false
+    items:
+        description:
+            - users of the HTTP basic authentication, existing users not listed are removed
+        required: false
+        type: list
+        elements: dict
+        default: []
+        suboptions:
+            username:
+                description:
+                    - name of the user
+                required: true
+                type: str
+            password:
+                description:
+                    - password of the user, required for users not existing yet
+                required: false
+                type: str
+    update_password:
+        description:
+            - C(on_create) only sets the passwords of new users, the passwords of existing users are kept
+            - C(always) sets the given passwords on every run, as npm never returns passwords they can't be compared,
+            - so the access list is updated (and changed is reported) on every run any password is given
+        required: false
+        type: str
+        default: 'on_create'
+        choices: ['always', 'on_create']
+    clients:
+        description:
+            - the allow and deny rules, nginx applies the first rule matching the address of a request
+            - rules not listed are removed
+        required: false
+        type: list
+        elements: dict
+        default: []
+        suboptions:
+            address:
+                description:
+                    - IPv4 or IPv6 address or network (CIDR notation), or C(all)
+                required: true
+                type: str
+            directive:
+                description:
+                    - if the address is allowed or denied
+                required: false
+                type: str
+                default: 'allow'
+                choices: ['allow', 'deny']
+    collapse:
+        description:
+            - if true, duplicate clients are removed and following clients of the same directive are sorted and merged
+            - into the fewest networks covering exactly the same addresses (e.g. 10.0.0.0/25 and 10.0.0.128/25 become 10.0.0.0/24)
+            - clients after a client with address C(all) are never reached and left out
+            - fails on invalid addresses, if false the clients are sent as given
+        required: false
+        type: bool
+        default: true
+    state:
+        description:
+            - if the access list should be created or deleted
+        required: false
+        type: str
+        default: 'present'
+        choices: ['absent', 'present']
+"""
+
+EXAMPLES = r"""
+# create access list of partner networks
+- name: create npm access list
+  nils_ost.proxymanager.access_list:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    name: "partners"
+    clients:
+      - address: "203.0.113.0/25"
+      - address: "203.0.113.128/25"
+      - address: "2001:db8::/48"
+      - address: "198.51.100.7"
+    state: present
+  delegate_to: localhost
+  register: partners
+
+# use the access list for a proxy
+- name: create npm proxy for partners
+  nils_ost.proxymanager.proxy:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    domain_name: "partners.some.domain"
+    forward_host: "192.168.1.234"
+    access_list_id: "{{ partners.item.id }}"
+    state: present
+  delegate_to: localhost
+
+# allow the office network and require a user for everybody else
+- name: create npm access list with users
+  nils_ost.proxymanager.access_list:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    name: "office"
+    satisfy_any: true
+    items:
+      - username: "admin"
+        password: "{{ admin_password }}"
+    clients:
+      - address: "192.168.1.0/24"
+      - address: "all"
+        directive: deny
+    state: present
+  delegate_to: localhost
+
+# delete the access list
+- name: delete npm access list
+  nils_ost.proxymanager.access_list:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    name: "office"
+    state: absent
+  delegate_to: localhost
+"""
+
+RETURN = r"""
+item:
+    description:
+        - the item corresponding to name created, updated or found on npm. might be None in case of errors or deletion
+        - passwords are replaced by C(********)
+    type: dict or None
+    returned: always
+clients:
+    description:
+        - number of clients given (C(given)) and of clients sent to npm after collapsing (C(sent))
+    type: dict
+    returned: if state is present
+diff:
+    description:
+        - the compared fields of the item before and after the change, on updates only the fields that differ
+        - values are compared normalized (e.g. addresses, order of users), passwords are replaced by C(********)
+    type: dict
+    returned: changed and in --diff mode
+timings:
+    description:
+        - number, duration and size of the API calls done in this run, see I(timings)
+    type: dict
+    returned: if timings is enabled
+"""
+
+
+def argument_spec():
+    # define available arguments/parameters a user can pass to the module
+    module_args = api.npm_argument_spec()
+    module_args.update(access_list.access_list_spec())
+    return module_args
+
+
+def run(module):
+    """
+    Does the work of the module, module needs to provide params, check_mode, exit_json and fail_json.
+    Called by run_module() and by the action plugin of the same name, if it runs on the controller.
+    """
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # changed is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        item=None,
+    )
+
+    try:
+        client = api.NpmClient.from_module(module)
+        timing.report_timings(module, client.timings)
+
+        success, item = access_list.search(client, module.params["name"])
+        if not success:
+            module.fail_json(msg=f"error on searching for item: {item}", **result)
+
+        if module.params["state"] == "present":
+            try:
+                data = access_list.build_data(module.params, item)
+            except ValueError as e:
+                module.fail_json(msg=f"{e}", **result)
+            result["clients"] = dict(
+                given=len(module.params["clients"]),
+                sent=len(data["clients"]),
+            )
+            missing = access_list.missing_passwords(data, item)
+            if missing:
+                module.fail_json(
+                    msg=f'"password" is required for new users: {", ".join(missing)}',
+                    **result,
+                )
+
+            if item is None:
+                result["changed"] = True
+                if module._diff:
+                    result["diff"] = diff.as_diff(
+                        None,
+                        access_list.masked(data),
+                        access_list.FIELDS,
+                    )
+                if not module.check_mode:
+                    success, item = access_list.create(client, data)
+                    if not success:
+                        module.fail_json(
+                            msg=f"error on createing new item: {item}",
+                            **result,
+                        )
+                    result["item"] = access_list.masked(item)
+                    module.exit_json(msg=f"created item: {item['id']}", **result)
+                else:
+                    result["item"] = access_list.masked(data)
+                    module.exit_json(msg="would have created a item", **result)
+
+            else:
+                changes = diff.changes(data, item, access_list.FIELDS)
+                if module.params["update_password"] == "always" and any(
+                    i["password"] for i in data["items"]
+                ):
+                    # passwords can't be compared, given ones are always sent
+                    changes = [
+                        k for k in access_list.FIELDS if k in changes or k == "items"
+                    ]
+                if not changes:
+                    result["item"] = access_list.masked(item)
+                    module.exit_json(
+                        msg=f"item is already as expected: {item['id']}",
+                        **result,
+                    )
+                result["changed"] = True
+                if module._diff:
+                    result["diff"] = diff.as_diff(
+                        access_list.masked(item),
+                        access_list.masked(data),
+                        changes,
+                    )
+                if not module.check_mode:
+                    success, item = access_list.update(client, item.get("id"), data)
+                    if not success:
+                        module.fail_json(
+                            msg=f"error on updateing existing item: {item}",
+                            **result,
+                        )
+                    result["item"] = access_list.masked(item)
+                    module.exit_json(msg=f"updated item: {item['id']}", **result)
+                else:
+                    result["item"] = access_list.masked(data)
+                    module.exit_json(
+                        msg=f"would have updated item: {item['id']}",
+                        **result,
+                    )
+
+        else:
+            if item is None:
+                module.exit_json(msg="item is already deleted", **result)
+            result["changed"] = True
+            if module._diff:
+                result["diff"] = diff.as_diff(
+                    access_list.masked(item),
+                    None,
+                    access_list.FIELDS,
+                )
+            if not module.check_mode:
+                success, item = access_list.delete(client, item.get("id"))
+                if not success:
+                    module.fail_json(msg=f"error on deleteing item: {item}", **result)
+                module.exit_json(msg="deleted item", **result)
+            else:
+                module.exit_json(msg="would have deleted a item", **result)
+
+    except Exception as e:
+        module.fail_json(msg=f"Error: {e}", **result)
+
+
+def run_module():
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=True,
+    )
+
+    run(module)
+
+
+def main():
+    run_module()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,14 @@ from __future__ import absolute_import, division, print_function
 
 
 __metaclass__ = type
-import requests
-
 from ansible.module_utils.basic import AnsibleModule
 
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import (
+    api,
+    certificate,
+    timing,
+)
+
 
 DOCUMENTATION = r"""
 ---
@@ -26,18 +30,17 @@ description:
     - On creation always generates a wildcard certificate for "domain_name"
     - Creation currently only works for provider "domainoffensive"
     - For "other" provider it's only checked if certificate is present, and if so, the item is returend
+    - A present certificate is one naming domain_name or covering it by a wildcard (e.g. C(*.some.domain) for C(www.some.domain)),
+    - if several do, the one not expired, naming domain_name exactly and expiring latest is used
+    - On deletion only a certificate naming domain_name exactly is deleted
+    - If the task is executed on the controller (e.g. delegated to localhost) the module runs inside the controller process,
+    - set variable C(npm_run_on_controller) to C(false) to run it as regular module instead
+
+extends_documentation_fragment:
+    - nils_ost.proxymanager.api
+    - nils_ost.proxymanager.api.http
 
 options:
-    url:
-        description:
-            - the full URL of API-Endpoint
-        required: true
-        type: str
-    token:
-        description:
-            - the token used for authentication on API-Endpoint
-        required: true
-        type: str
     domain_name:
         description:
             - domain of certificate
@@ -56,6 +59,14 @@ options:
         required: false
         type: str
         default: ''
+    wait:
+        description:
+            - if false, the creation of a certificate only submits the order and returns without waiting for the ACME exchange,
+            - which (especially with DNS challenges) regularly takes minutes
+            - use M(nils_ost.proxymanager.certificate_wait) to wait for all submitted certificates at once
+        required: false
+        type: bool
+        default: true
     state:
         description:
             - if a certificate for domain_name should be created or deleted
@@ -78,6 +89,25 @@ EXAMPLES = r"""
   delegate_to: localhost
   register: some_cert
 
+# order certificates without waiting for each, then wait for all of them at once
+- name: order certificates
+  nils_ost.proxymanager.certificate:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    domain_name: "{{ item }}"
+    provider: 'domainoffensive'
+    provider_credentials: '{{ do_de_token }}'
+    wait: false
+  loop: "{{ domains }}"
+  delegate_to: localhost
+
+- name: wait for the ordered certificates
+  nils_ost.proxymanager.certificate_wait:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    domain_names: "{{ domains }}"
+  delegate_to: localhost
+
 # check for certificate existance and return item
 - name: check some.domain certificate
   nils_ost.proxymanager.certificate:
@@ -104,57 +134,23 @@ item:
         - the item corresponding to domain_name created or found on npm. might be None in case of errors or deletion
     type: dict or None
     returned: always
+pending:
+    description:
+        - true if the order has been submitted, but the certificate isn't issued yet
+    type: bool
+    returned: on creation if wait is false
+timings:
+    description:
+        - number, duration and size of the API calls done in this run, see I(timings)
+    type: dict
+    returned: if timings is enabled
 """
 
 
-def search(url, token, name):
-    uri = f"{url}/api/nginx/certificates"
-
-    headers = dict()
-    headers["Authorization"] = "Bearer %s" % token
-    headers["Content-Type"] = "application/json"
-
-    response = requests.get(uri, headers=headers)
-    if not response.status_code == 200:
-        return (False, response.text)
-
-    for item in response.json():
-        if name in item.get("domain_names", list()):
-            return (True, item)
-    return (True, None)
-
-
-def create(url, token, data):
-    uri = f"{url}/api/nginx/certificates"
-
-    headers = dict()
-    headers["Authorization"] = "Bearer %s" % token
-    headers["Content-Type"] = "application/json"
-
-    response = requests.post(uri, json=data, headers=headers)
-    if not response.status_code == 201:
-        return (False, response.text)
-    return (True, response.json())
-
-
-def delete(url, token, item):
-    uri = f"{url}/api/nginx/certificates/{item}"
-
-    headers = dict()
-    headers["Authorization"] = "Bearer %s" % token
-    headers["Content-Type"] = "application/json"
-
-    response = requests.delete(uri, headers=headers)
-    if not response.status_code == 200:
-        return (False, response.text)
-    return (True, response.json())
-
-
-def run_module():
+def argument_spec():
     # define available arguments/parameters a user can pass to the module
-    module_args = dict(
-        url=dict(type="str", required=True),
-        token=dict(type="str", required=True, no_log=True),
+    module_args = api.npm_argument_spec()
+    module_args.update(
         domain_name=dict(type="str", required=True),
         provider=dict(
             type="str",
@@ -163,9 +159,17 @@ def run_module():
             choices=["domainoffensive", "other"],
         ),
         provider_credentials=dict(type="str", required=False, default=""),
+        wait=dict(type="bool", required=False, default=True),
         state=dict(type="str", default="present", choices=["absent", "present"]),
     )
+    return module_args
+
 
+def run(module):
+    """
+    Does the work of the module, module needs to provide params, check_mode, exit_json and fail_json.
+    Called by run_module() and by the action plugin of the same name, if it runs on the controller.
+    """
     # seed the result dict in the object
     # we primarily care about changed and state
     # changed is if this module effectively modified the target
@@ -176,20 +180,17 @@ def run_module():
         item=None,
     )
 
-    # the AnsibleModule object will be our abstraction working with Ansible
-    # this includes instantiation, a couple of common attr would be the
-    # args/params passed to the execution, as well as if the module
-    # supports check mode
-    module = AnsibleModule(
-        argument_spec=module_args,
-        supports_check_mode=True,
-    )
-
     try:
-        url = module.params["url"]
-        token = module.params["token"]
-
-        success, item = search(url, token, module.params["domain_name"])
+        client = api.NpmClient.from_module(module)
+        timing.report_timings(module, client.timings)
+
+        # an existing certificate covering domain_name (e.g. by a wildcard) is reused,
+        # but only a certificate naming domain_name exactly is deleted
+        success, item = certificate.search(
+            client,
+            module.params["domain_name"],
+            wildcard=module.params["state"] == "present",
+        )
         if not success:
             module.fail_json(msg=f"error on searching for item: {item}", **result)
 
@@ -218,14 +219,26 @@ def run_module():
             )
 
             if not module.check_mode:
-                success, item = create(url, token, data)
+                if module.params["wait"]:
+                    success, item = certificate.create(client, data)
+                else:
+                    success, item = certificate.submit(client, data)
                 if not success:
                     module.fail_json(
                         msg=f"error on createing new item: {item}",
                         **result,
                     )
                 result["changed"] = True
+                if item is None:
+                    result["item"] = data
+                    result["pending"] = True
+                    module.exit_json(
+                        msg=f"submitted order of item: {module.params['domain_name']}",
+                        **result,
+                    )
                 result["item"] = item
+                if not module.params["wait"]:
+                    result["pending"] = not certificate.is_valid(item)
                 module.exit_json(msg=f"created item: {item['id']}", **result)
             else:
                 result["changed"] = True
@@ -239,7 +252,7 @@ def run_module():
             if item is None:
                 module.exit_json(msg="item is already deleted", **result)
             if not module.check_mode:
-                success, item = delete(url, token, item.get("id"))
+                success, item = certificate.delete(client, item.get("id"))
                 if not success:
                     module.fail_json(msg=f"error on deleteing item: {item}", **result)
                 result["changed"] = True
@@ -252,6 +265,19 @@ def run_module():
         module.fail_json(msg=f"Error: {e}", **result)
 
 
+def run_module():
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=True,
+    )
+
+    run(module)
+
+
 def main():
     run_module()
 
@@ -0,0 +1,270 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import (
+    api,
+    certificate,
+    parallel,
+    timing,
+)
+
+
+DOCUMENTATION = r"""
+---
+module: certificate_renew
+
+author: Nils Ost (@nils-ost)
+
+version_added: "2.1.0"
+
+short_description: renew npm certificates that expire soon
+
+description:
+    - This module renews the Let's Encrypt certificates of a Nginx Proxy Manager instance, that expire within I(window) days
+    - The list of certificates is fetched once and sorted by C(expires_on), the certificates expiring first are renewed first
+    - At most I(max_renewals) certificates are renewed per run, the others are left to the next run (e.g. a daily schedule),
+    - this spreads certificates issued at the same time over several days, so their future renewals don't bunch together either
+    - At most I(workers) renewals (each a run of certbot on npm) are executed at the same time
+    - Certificates of other providers and orders that are not issued yet are ignored
+    - If the task is executed on the controller (e.g. delegated to localhost) the module runs inside the controller process,
+    - set variable C(npm_run_on_controller) to C(false) to run it as regular module instead
+
+extends_documentation_fragment:
+    - nils_ost.proxymanager.api
+    - nils_ost.proxymanager.api.http
+
+options:
+    window:
+        description:
+            - certificates expiring within this many days (or already expired) are renewed
+        required: false
+        type: int
+        default: 30
+    max_renewals:
+        description:
+            - maximum number of certificates renewed in one run, C(0) means unlimited
+        required: false
+        type: int
+        default: 10
+    workers:
+        description:
+            - number of renewals executed in parallel
+        required: false
+        type: int
+        default: 2
+    rate_limit:
+        description:
+            - maximum number of renewals started per second, C(0) means unlimited
+        required: false
+        type: float
+        default: 0
+    report_next:
+        description:
+            - number of certificates reported in I(due_next)
+        required: false
+        type: int
+        default: 10
+"""
+
+EXAMPLES = r"""
+- name: renew certificates expiring within 3 weeks, at most 5 per run
+  nils_ost.proxymanager.certificate_renew:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    window: 21
+    max_renewals: 5
+  delegate_to: localhost
+  register: renewal
+
+- name: show the next certificate to be renewed
+  ansible.builtin.debug:
+    msg: "{{ renewal.due_next[0].domain_names }} expires in {{ renewal.due_next[0].days_left }} days"
+  when: renewal.due_next | length > 0
+"""
+
+RETURN = r"""
+renewed:
+    description:
+        - the certificates renewed (or in check mode to be renewed) in this run, ordered by expiry
+    type: list
+    elements: dict
+    returned: always
+    contains:
+        id:
+            description:
+                - id of the certificate
+            type: int
+        domain_names:
+            description:
+                - domain names of the certificate
+            type: list
+            elements: str
+        expires_on:
+            description:
+                - expiry of the certificate before the renewal
+            type: str
+        days_left:
+            description:
+                - days until expires_on (negative if already expired)
+            type: float
+        item:
+            description:
+                - the renewed certificate as returned by npm
+            type: dict
+            returned: on successful renewals
+        failed:
+            description:
+                - true if the renewal failed, the error is given in I(msg)
+            type: bool
+            returned: on failed renewals
+        msg:
+            description:
+                - the error returned by npm for this certificate
+            type: str
+            returned: on failed renewals
+due_next:
+    description:
+        - the next I(report_next) certificates to be renewed, that haven't been renewed in this run, ordered by expiry
+        - contains id, domain_names, expires_on and days_left like I(renewed)
+    type: list
+    elements: dict
+    returned: always
+timings:
+    description:
+        - number, duration and size of the API calls done in this run, see I(timings)
+    type: dict
+    returned: if timings is enabled
+"""
+
+SECONDS_PER_DAY = 86400
+
+
+def days_left(item):
+    return api.seconds_left(item["expires_on"]) / SECONDS_PER_DAY
+
+
+def renewable(item):
+    """true for issued Let's Encrypt certificates (npm keeps expires_on at created_on until an order is issued)"""
+    if not item.get("provider") == "letsencrypt":
+        return False
+    try:
+        days_left(item)
+    except (KeyError, TypeError, ValueError):
+        return False
+    created = (item.get("created_on") or "").replace(" ", "T")[:19]
+    return item["expires_on"].replace(" ", "T")[:19] > created
+
+
+def summary(item):
+    return dict(
+        id=item["id"],
+        domain_names=item.get("domain_names", list()),
+        expires_on=item["expires_on"],
+        days_left=round(days_left(item), 2),
+    )
+
+
+def argument_spec():
+    # define available arguments/parameters a user can pass to the module
+    module_args = api.npm_argument_spec()
+    module_args.update(
+        window=dict(type="int", required=False, default=30),
+        max_renewals=dict(type="int", required=False, default=10),
+        workers=dict(type="int", required=False, default=2),
+        rate_limit=dict(type="float", required=False, default=0),
+        report_next=dict(type="int", required=False, default=10),
+    )
+    return module_args
+
+
+def run(module):
+    """
+    Does the work of the module, module needs to provide params, check_mode, exit_json and fail_json.
+    Called by run_module() and by the action plugin of the same name, if it runs on the controller.
+    """
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # changed is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        renewed=list(),
+        due_next=list(),
+    )
+
+    try:
+        client = api.NpmClient.from_module(module)
+        timing.report_timings(module, client.timings)
+
+        success, items = certificate.list_all(client)
+        if not success:
+            module.fail_json(msg=f"error on fetching items: {items}", **result)
+
+        items = sorted((i for i in items if renewable(i)), key=days_left)
+        due = [i for i in items if days_left(i) <= module.params["window"]]
+        limit = module.params["max_renewals"]
+        if limit > 0:
+            due = due[:limit]
+        count = len(due)
+        report = module.params["report_next"]
+        result["renewed"] = [summary(i) for i in due]
+        result["due_next"] = [summary(i) for i in items[count:][:report]]
+
+        if module.check_mode:
+            result["changed"] = len(due) > 0
+            module.exit_json(msg=f"would have renewed items: {len(due)}", **result)
+
+        responses = parallel.run_parallel(
+            [lambda i=item["id"]: certificate.renew(client, i) for item in due],
+            workers=module.params["workers"],
+            rate=module.params["rate_limit"],
+        )
+        for entry, (success, response) in zip(result["renewed"], responses):
+            if success:
+                entry["item"] = response
+            else:
+                entry["failed"] = True
+                entry["msg"] = f"{response}"
+
+        failed = [
+            str(entry["id"]) for entry in result["renewed"] if entry.get("failed")
+        ]
+        result["changed"] = len(failed) < len(due)
+        if failed:
+            module.fail_json(
+                msg=f"error on renewing items: {', '.join(failed)}",
+                **result,
+            )
+        module.exit_json(msg=f"renewed items: {len(due)}", **result)
+
+    except Exception as e:
+        module.fail_json(msg=f"Error: {e}", **result)
+
+
+def run_module():
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=True,
+    )
+
+    run(module)
+
+
+def main():
+    run_module()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import (
+    api,
+    certificate,
+    timing,
+)
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils.retry import (
+    backoff_delay,
+)
+
+
+DOCUMENTATION = r"""
+---
+module: certificate_wait
+
+author: Nils Ost (@nils-ost)
+
+version_added: "2.1.0"
+
+short_description: wait for npm certificates to be issued
+
+description:
+    - This module waits until a valid (issued and not expired) certificate covers each of the given domain names,
+    - e.g. after ordering them with M(nils_ost.proxymanager.certificate) and I(wait=false)
+    - All domain names are checked together with a single fetch of the certificate list per round,
+    - the rounds are spaced by an exponential backoff with jitter until all are valid or I(timeout) is reached
+    - If the task is executed on the controller (e.g. delegated to localhost) the module runs inside the controller process,
+    - set variable C(npm_run_on_controller) to C(false) to run it as regular module instead
+
+extends_documentation_fragment:
+    - nils_ost.proxymanager.api
+    - nils_ost.proxymanager.api.http
+
+options:
+    domain_names:
+        description:
+            - the domains a valid certificate is waited for, a certificate covering a domain by a wildcard counts as well
+        required: true
+        type: list
+        elements: str
+    timeout:
+        description:
+            - seconds after which the module fails, if not all certificates are valid
+        required: false
+        type: int
+        default: 900
+    delay:
+        description:
+            - upper bound of the (random) seconds between the first rounds, doubled every round
+        required: false
+        type: float
+        default: 5
+    max_delay:
+        description:
+            - maximum seconds between two rounds
+        required: false
+        type: float
+        default: 60
+"""
+
+EXAMPLES = r"""
+- name: order certificates
+  nils_ost.proxymanager.certificate:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    domain_name: "{{ item }}"
+    provider: 'domainoffensive'
+    provider_credentials: '{{ do_de_token }}'
+    wait: false
+  loop: ['some.domain', 'other.domain']
+  delegate_to: localhost
+
+- name: wait up to 30 minutes for the ordered certificates
+  nils_ost.proxymanager.certificate_wait:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    domain_names: ['some.domain', 'other.domain']
+    timeout: 1800
+  delegate_to: localhost
+  register: certs
+"""
+
+RETURN = r"""
+results:
+    description:
+        - one entry per element of domain_names, in the same order
+    type: list
+    elements: dict
+    returned: always
+    contains:
+        domain_name:
+            description:
+                - the corresponding element of domain_names
+            type: str
+        state:
+            description:
+                - C(valid) if a valid certificate covers domain_name
+                - C(pending) if the covering certificate isn't issued yet (or is expired)
+                - C(missing) if no certificate covers domain_name (e.g. npm dropped a failed order)
+            type: str
+        item:
+            description:
+                - the best certificate covering domain_name, None if missing
+            type: dict or None
+elapsed:
+    description:
+        - seconds spent waiting
+    type: float
+    returned: always
+timings:
+    description:
+        - number, duration and size of the API calls done in this run, see I(timings)
+    type: dict
+    returned: if timings is enabled
+"""
+
+
+def argument_spec():
+    # define available arguments/parameters a user can pass to the module
+    module_args = api.npm_argument_spec()
+    module_args.update(
+        domain_names=dict(type="list", elements="str", required=True),
+        timeout=dict(type="int", required=False, default=900),
+        delay=dict(type="float", required=False, default=5),
+        max_delay=dict(type="float", required=False, default=60),
+    )
+    return module_args
+
+
+def run(module):
+    """
+    Does the work of the module, module needs to provide params, check_mode, exit_json and fail_json.
+    Called by run_module() and by the action plugin of the same name, if it runs on the controller.
+    """
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # changed is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        results=list(),
+        elapsed=0.0,
+    )
+
+    try:
+        client = api.NpmClient.from_module(module)
+        timing.report_timings(module, client.timings)
+
+        names = list(dict.fromkeys(module.params["domain_names"]))
+        started = time.monotonic()
+        deadline = started + module.params["timeout"]
+        attempt = 0
+        while True:
+            success, states = certificate.poll(client, names)
+            if not success:
+                module.fail_json(msg=f"error on fetching items: {states}", **result)
+            waiting = [name for name in names if not states[name][0] == "valid"]
+            remaining = deadline - time.monotonic()
+            if not waiting or remaining <= 0:
+                break
+            delay = backoff_delay(
+                attempt,
+                module.params["delay"],
+                cap=module.params["max_delay"],
+            )
+            time.sleep(min(delay, remaining))
+            attempt += 1
+
+        result["elapsed"] = round(time.monotonic() - started, 3)
+        for name in module.params["domain_names"]:
+            state, item = states[name]
+            result["results"].append(dict(domain_name=name, state=state, item=item))
+
+        if waiting:
+            module.fail_json(
+                msg=f"items not valid after {result['elapsed']}s: {', '.join(waiting)}",
+                **result,
+            )
+        module.exit_json(msg=f"valid items: {len(names)}", **result)
+
+    except Exception as e:
+        module.fail_json(msg=f"Error: {e}", **result)
+
+
+def run_module():
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=True,
+    )
+
+    run(module)
+
+
+def main():
+    run_module()
+
+
+if __name__ == "__main__":
+    main()
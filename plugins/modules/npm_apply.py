@@ -0,0 +1,227 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import json
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import (
+    api,
+    bulk,
+    plan,
+    timing,
+)
+
+
+DOCUMENTATION = r"""
+---
+module: npm_apply
+
+author: Nils Ost (@nils-ost)
+
+version_added: "2.1.0"
+
+short_description: apply a plan of changes to npm hosts
+
+description:
+    - This module executes exactly the changes of a plan computed by M(nils_ost.proxymanager.npm_plan)
+    - Before anything is changed, the affected hosts are fetched again (once per kind of host),
+    - if an updated or deleted host has been modified (its C(modified_on) changed) or deleted since the plan was computed,
+    - or a host to be created exists by now, the module refuses to apply the plan and returns the conflicts
+    - In check mode only the conflicts are checked
+    - If the task is executed on the controller (e.g. delegated to localhost) the module runs inside the controller process,
+    - set variable C(npm_run_on_controller) to C(false) to run it as regular module instead
+
+extends_documentation_fragment:
+    - nils_ost.proxymanager.api
+    - nils_ost.proxymanager.api.http
+    - nils_ost.proxymanager.throttle
+
+options:
+    plan:
+        description:
+            - the plan as returned by M(nils_ost.proxymanager.npm_plan)
+            - either I(plan) or I(src) is required
+        required: false
+        type: dict
+    src:
+        description:
+            - file the plan has been written to by M(nils_ost.proxymanager.npm_plan) (option I(dest))
+            - either I(plan) or I(src) is required
+        required: false
+        type: path
+    workers:
+        description:
+            - number of changes sent to npm in parallel
+            - changes touching the same domain names are still executed one after another, in the order of the plan
+        required: false
+        type: int
+        default: 4
+    rate_limit:
+        description:
+            - maximum number of changes started per second, C(0) means unlimited
+        required: false
+        type: float
+        default: 0
+"""
+
+EXAMPLES = r"""
+- name: apply a plan registered before
+  nils_ost.proxymanager.npm_apply:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    plan: "{{ npm_plan.plan }}"
+  delegate_to: localhost
+
+- name: apply a reviewed plan file
+  nils_ost.proxymanager.npm_apply:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    src: /tmp/npm-plan.json
+  delegate_to: localhost
+"""
+
+RETURN = r"""
+results:
+    description:
+        - one entry per change of the plan, in the same order
+    type: list
+    elements: dict
+    returned: always
+    contains:
+        resource:
+            description:
+                - kind of host, C(proxy_hosts) or C(redirection_hosts)
+            type: str
+        domain_name:
+            description:
+                - the domain_name of the change
+            type: str
+        action:
+            description:
+                - what has been (or in check mode would have been) done, one of C(created), C(updated) or C(deleted)
+            type: str
+        failed:
+            description:
+                - true if the change failed, the error is given in I(msg)
+            type: bool
+            returned: on failed changes
+        msg:
+            description:
+                - the error returned by npm for this change
+            type: str
+            returned: on failed changes
+        item:
+            description:
+                - the created or updated host as returned by npm, None on deletion
+            type: dict or None
+conflicts:
+    description:
+        - the changes that can't be applied as planned, with their resource, action, domain_name and the reason
+    type: list
+    elements: dict
+    returned: always
+timings:
+    description:
+        - number, duration and size of the API calls done in this run, see I(timings)
+    type: dict
+    returned: if timings is enabled
+"""
+
+
+def argument_spec():
+    # define available arguments/parameters a user can pass to the module
+    module_args = api.npm_argument_spec()
+    module_args.update(api.throttle_argument_spec())
+    module_args.update(
+        plan=dict(type="dict", required=False, default=None),
+        src=dict(type="path", required=False, default=None),
+        workers=dict(type="int", required=False, default=4),
+        rate_limit=dict(type="float", required=False, default=0),
+    )
+    return module_args
+
+
+def run(module):
+    """
+    Does the work of the module, module needs to provide params, check_mode, exit_json and fail_json.
+    Called by run_module() and by the action plugin of the same name, if it runs on the controller.
+    """
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # changed is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        results=list(),
+        conflicts=list(),
+    )
+
+    try:
+        if (module.params["plan"] is None) == (module.params["src"] is None):
+            module.fail_json(msg='either "plan" or "src" is required', **result)
+        changes_of = module.params["plan"]
+        if changes_of is None:
+            with open(module.params["src"], "r") as f:
+                changes_of = json.load(f)
+        if not changes_of.get("version") == plan.VERSION:
+            module.fail_json(
+                msg=f"unsupported version of plan: {changes_of.get('version')}",
+                **result,
+            )
+        changes = changes_of.get("changes", list())
+
+        client = api.NpmClient.from_module(module)
+        timing.report_timings(module, client.timings)
+
+        success, conflicts = plan.verify(client, changes)
+        if not success:
+            module.fail_json(msg=conflicts, **result)
+        if conflicts:
+            result["conflicts"] = conflicts
+            listed = ", ".join(f"{c['domain_name']} ({c['reason']})" for c in conflicts)
+            module.fail_json(
+                msg=f"refusing to apply outdated plan, conflicts: {listed}",
+                **result,
+            )
+
+        bulk.execute(module, plan.operations(client, changes, result), result)
+
+        summary = bulk.summarize(result["results"]) or "nothing"
+        failed = [entry for entry in result["results"] if entry.get("failed")]
+        if failed:
+            names = ", ".join(entry["domain_name"] for entry in failed)
+            module.fail_json(msg=f"error on applying {names}: {summary}", **result)
+        if module.check_mode:
+            module.exit_json(msg=f"would have applied plan: {summary}", **result)
+        module.exit_json(msg=f"applied plan: {summary}", **result)
+
+    except Exception as e:
+        module.fail_json(msg=f"Error: {e}", **result)
+
+
+def run_module():
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=True,
+    )
+
+    run(module)
+
+
+def main():
+    run_module()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import (
+    access_list,
+    api,
+    diff,
+    parallel,
+    stream,
+    timing,
+)
+
+
+DOCUMENTATION = r"""
+---
+module: npm_facts
+
+author: Nils Ost (@nils-ost)
+
+version_added: "2.1.0"
+
+short_description: gather all npm objects as facts
+
+description:
+    - This module fetches the lists of proxy hosts, redirection hosts, certificates, access lists, streams and dead hosts
+    - of a Nginx Proxy Manager instance concurrently and returns them as facts below C(proxymanager)
+    - Every kind of object is indexed by id and by domain name (access lists by name, streams by incoming port and protocol),
+    - so later tasks can look up ids and items without further API calls
+    - If the task is executed on the controller (e.g. delegated to localhost) the module runs inside the controller process,
+    - set variable C(npm_run_on_controller) to C(false) to run it as regular module instead
+
+extends_documentation_fragment:
+    - nils_ost.proxymanager.api
+    - nils_ost.proxymanager.api.http
+
+options:
+    gather:
+        description:
+            - the kinds of objects to be fetched
+        required: false
+        type: list
+        elements: str
+        default: ['proxy_hosts', 'redirection_hosts', 'certificates', 'access_lists', 'streams', 'dead_hosts']
+        choices: ['proxy_hosts', 'redirection_hosts', 'certificates', 'access_lists', 'streams', 'dead_hosts']
+"""
+
+EXAMPLES = r"""
+- name: gather npm facts
+  nils_ost.proxymanager.npm_facts:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+  delegate_to: localhost
+
+- name: create proxy with the certificate of its domain
+  nils_ost.proxymanager.proxy:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    domain_name: "some.domain"
+    forward_host: "192.168.1.234"
+    certificate_id: "{{ proxymanager.certificates.by_domain['some.domain'] }}"
+    access_list_id: "{{ proxymanager.access_lists.by_name['internal'] }}"
+  delegate_to: localhost
+
+- name: show the existing proxy host of some.domain
+  ansible.builtin.debug:
+    var: proxymanager.proxy_hosts.by_id[proxymanager.proxy_hosts.by_domain['some.domain'] | string]
+"""
+
+RETURN = r"""
+ansible_facts:
+    description:
+        - the gathered objects
+    type: dict
+    returned: always
+    contains:
+        proxymanager:
+            description:
+                - one entry per kind of object given in I(gather)
+                - (C(proxy_hosts), C(redirection_hosts), C(certificates), C(access_lists), C(streams) and C(dead_hosts))
+            type: dict
+            contains:
+                by_id:
+                    description:
+                        - the items as returned by npm, keyed by their id (as string)
+                        - access lists include their users (I(items), without passwords) and I(clients)
+                    type: dict
+                by_domain:
+                    description:
+                        - the id of the item, keyed by each of its domain names (lowercased)
+                        - not for access lists and streams
+                    type: dict
+                by_name:
+                    description:
+                        - the id of the access list, keyed by its name
+                        - only for access lists
+                    type: dict
+                by_port:
+                    description:
+                        - the id of the stream, keyed by each incoming port and protocol it listens on (e.g. C(5000/tcp))
+                        - only for streams
+                    type: dict
+timings:
+    description:
+        - number, duration and size of the API calls done in this run, see I(timings)
+    type: dict
+    returned: if timings is enabled
+"""
+
+
+def domains_of(item):
+    return diff.normalize("domains", item.get("domain_names") or list())
+
+
+def name_of(item):
+    return [] if item.get("name") is None else [item["name"]]
+
+
+def ports_of(item):
+    # a TCP and a UDP stream can listen on the same port
+    return [stream.name_of(key) for key in sorted(stream.keys_of(item))]
+
+
+# list endpoint and the index (name and the keys of an item) of every kind of object
+RESOURCES = dict(
+    proxy_hosts=("/api/nginx/proxy-hosts", "by_domain", domains_of),
+    redirection_hosts=("/api/nginx/redirection-hosts", "by_domain", domains_of),
+    certificates=("/api/nginx/certificates", "by_domain", domains_of),
+    access_lists=(access_list.RESOURCE, "by_name", name_of),
+    streams=(stream.RESOURCE, "by_port", ports_of),
+    dead_hosts=("/api/nginx/dead-hosts", "by_domain", domains_of),
+)
+
+# relations npm should add to the items of a kind of object
+EXPAND = dict(
+    access_lists=access_list.EXPAND,
+)
+
+
+def index(items, name, keys):
+    facts = {"by_id": dict(), name: dict()}
+    for item in items:
+        facts["by_id"][str(item["id"])] = item
+        for key in keys(item):
+            facts[name][str(key)] = item["id"]
+    return facts
+
+
+def argument_spec():
+    # define available arguments/parameters a user can pass to the module
+    module_args = api.npm_argument_spec()
+    module_args.update(
+        gather=dict(
+            type="list",
+            elements="str",
+            required=False,
+            default=list(RESOURCES),
+            choices=list(RESOURCES),
+        ),
+    )
+    return module_args
+
+
+def run(module):
+    """
+    Does the work of the module, module needs to provide params, check_mode, exit_json and fail_json.
+    Called by run_module() and by the action plugin of the same name, if it runs on the controller.
+    """
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # changed is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        ansible_facts=dict(proxymanager=dict()),
+    )
+
+    try:
+        client = api.NpmClient.from_module(module)
+        timing.report_timings(module, client.timings)
+
+        kinds = list(dict.fromkeys(module.params["gather"]))
+        lists = parallel.run_parallel(
+            [
+                lambda kind=kind: client.list_items(
+                    RESOURCES[kind][0],
+                    expand=EXPAND.get(kind),
+                )
+                for kind in kinds
+            ],
+            workers=len(kinds),
+        )
+
+        facts = result["ansible_facts"]["proxymanager"]
+        for kind, (success, items) in zip(kinds, lists):
+            if not success:
+                module.fail_json(msg=f"error on fetching {kind}: {items}", **result)
+            facts[kind] = index(items, *RESOURCES[kind][1:])
+
+        count = sum(len(facts[kind]["by_id"]) for kind in kinds)
+        module.exit_json(msg=f"gathered items: {count}", **result)
+
+    except Exception as e:
+        module.fail_json(msg=f"Error: {e}", **result)
+
+
+def run_module():
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=True,
+    )
+
+    run(module)
+
+
+def main():
+    run_module()
+
+
+if __name__ == "__main__":
+    main()
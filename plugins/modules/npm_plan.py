@@ -0,0 +1,451 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import json
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import (
+    api,
+    bulk,
+    certificate,
+    plan,
+    proxy_host,
+    redirection_host,
+    timing,
+)
+
+
+DOCUMENTATION = r"""
+---
+module: npm_plan
+
+author: Nils Ost (@nils-ost)
+
+version_added: "2.1.0"
+
+short_description: plan the changes for a desired set of npm hosts
+
+description:
+    - This module computes the creates, updates (with the differing fields) and deletes needed to bring the proxy
+    - and redirection hosts of a Nginx Proxy Manager instance in line with the given lists, without changing anything
+    - The plan is based on one snapshot of npm (one fetch per kind of host) and can be reviewed and later executed
+    - exactly as planned by M(nils_ost.proxymanager.npm_apply), which refuses if the affected hosts changed in the meantime
+    - If the task is executed on the controller (e.g. delegated to localhost) the module runs inside the controller process,
+    - set variable C(npm_run_on_controller) to C(false) to run it as regular module instead
+
+extends_documentation_fragment:
+    - nils_ost.proxymanager.api
+    - nils_ost.proxymanager.api.http
+
+options:
+    proxies:
+        description:
+            - the complete desired list of proxy hosts, like I(proxies) of M(nils_ost.proxymanager.proxy_hosts)
+            - proxy hosts are left out of the plan if not given
+        required: false
+        type: list
+        elements: dict
+        suboptions:
+            domain_name:
+                description:
+                    - domain to be proxyed
+                required: true
+                type: str
+            forward_host:
+                description:
+                    - backend destination of proxy
+                required: false (true if state equals present)
+                type: str
+            forward_scheme:
+                description:
+                    - protocol to be used for communication with backend destination
+                required: false
+                type: str
+                default: 'http'
+                choices: ['http', 'https']
+            forward_port:
+                description:
+                    - backend destination port of proxy
+                required: false
+                type: int
+                default: 80
+            enable_caching:
+                description:
+                    - if assets should be cached by npm
+                required: false
+                type: bool
+                default: false
+            allow_websockets:
+                description:
+                    - if websocket support should be enabled
+                required: false
+                type: bool
+                default: false
+            certificate_id:
+                description:
+                    - id of npm certificate to be used
+                required: false
+                type: int
+                default: 0
+            auto_certificate:
+                description:
+                    - if no certificate_id is given, use the existing certificate covering domain_name, also by a wildcard
+                    - if several do, the one not expired, naming domain_name exactly and expiring latest is used
+                    - fails if no certificate covers domain_name
+                required: false
+                type: bool
+                default: false
+            force_ssl:
+                description:
+                    - if ssl should be forced
+                required: false
+                type: bool
+                default: false
+            http2_support:
+                description:
+                    - if http/2 support should be enabled
+                required: false
+                type: bool
+                default: false
+            hsts_enabled:
+                description:
+                    - if HTTP Strict Transport Security should be enabled
+                required: false
+                type: bool
+                default: false
+            hsts_subdomains:
+                description:
+                    - if HSTS should include subdomains
+                required: false
+                type: bool
+                default: false
+            trust_forwarded_proto:
+                description:
+                    - if X-Forwarded-Proto header should be trusted
+                required: false
+                type: bool
+                default: false
+            advanced_config:
+                description:
+                    - custom nginx configuration to be added to the proxy host
+                required: false
+                type: str
+                default: ''
+            block_exploits:
+                description:
+                    - if common exploits should be blocked
+                required: false
+                type: bool
+                default: false
+            access_list_id:
+                description:
+                    - id of npm access list to be used
+                required: false
+                type: int
+                default: 0
+            state:
+                description:
+                    - if a proxy for domain_name should be created or deleted
+                required: false
+                type: str
+                default: 'present'
+                choices: ['absent', 'present']
+    redirections:
+        description:
+            - the complete desired list of redirection hosts, like I(redirections) of M(nils_ost.proxymanager.redirection_hosts)
+            - redirection hosts are left out of the plan if not given
+        required: false
+        type: list
+        elements: dict
+        suboptions:
+            domain_name:
+                description:
+                    - domain to be redirected
+                required: true
+                type: str
+            forward_host:
+                description:
+                    - destination of redirection
+                required: false (true if state equals present)
+                type: str
+            forward_code:
+                description:
+                    - http return code signaling the redirection
+                required: false
+                type: int
+                default: 301
+                choices: [300, 301, 302, 303, 307, 308]
+            forward_scheme:
+                description:
+                    - protocol to be used for redirection destination
+                required: false
+                type: str
+                default: 'auto'
+                choices: ['auto', 'http', 'https']
+            preserve_path:
+                description:
+                    - if the requested path sould be forwareded to destination or not
+                required: false
+                type: bool
+                default: false
+            certificate_id:
+                description:
+                    - id of npm certificate to be used
+                required: false
+                type: int
+                default: 0
+            auto_certificate:
+                description:
+                    - if no certificate_id is given, use the existing certificate covering domain_name, also by a wildcard
+                    - if several do, the one not expired, naming domain_name exactly and expiring latest is used
+                    - fails if no certificate covers domain_name
+                required: false
+                type: bool
+                default: false
+            force_ssl:
+                description:
+                    - if ssl should be forced
+                required: false
+                type: bool
+                default: false
+            http2_support:
+                description:
+                    - if http/2 support should be enabled
+                required: false
+                type: bool
+                default: false
+            state:
+                description:
+                    - if a redirection for domain_name should be created or deleted
+                required: false
+                type: str
+                default: 'present'
+                choices: ['absent', 'present']
+
+    exclusive:
+        description:
+            - if true, every existing host of a given list's kind, that none of its entries refers to, is planned to be deleted
+        required: false
+        type: bool
+        default: false
+    max_deletions:
+        description:
+            - safety limit for I(exclusive) per kind of host, if more hosts would be deleted the module fails
+        required: false
+        type: int
+        default: 10
+    dest:
+        description:
+            - if given, the plan is written to this file (as JSON), on the host the module runs on
+        required: false
+        type: path
+"""
+
+EXAMPLES = r"""
+- name: plan the changes
+  nils_ost.proxymanager.npm_plan:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    exclusive: true
+    proxies:
+      - domain_name: "some.domain"
+        forward_host: "192.168.1.234"
+    redirections:
+      - domain_name: "www.some.domain"
+        forward_host: "some.domain"
+    dest: /tmp/npm-plan.json
+  delegate_to: localhost
+  register: npm_plan
+
+- name: show the planned changes
+  ansible.builtin.debug:
+    var: npm_plan.plan.summary
+
+- name: apply the reviewed plan
+  nils_ost.proxymanager.npm_apply:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    src: /tmp/npm-plan.json
+  delegate_to: localhost
+"""
+
+RETURN = r"""
+plan:
+    description:
+        - the planned changes, to be passed to M(nils_ost.proxymanager.npm_apply)
+    type: dict
+    returned: always
+    contains:
+        version:
+            description:
+                - format version of the plan
+            type: int
+        created_on:
+            description:
+                - time the plan has been computed (UTC)
+            type: str
+        summary:
+            description:
+                - number of planned changes per action (C(create), C(update) and C(delete))
+            type: dict
+        changes:
+            description:
+                - the planned changes, deletions first
+            type: list
+            elements: dict
+            contains:
+                resource:
+                    description:
+                        - kind of host, C(proxy_hosts) or C(redirection_hosts)
+                    type: str
+                action:
+                    description:
+                        - one of C(create), C(update) or C(delete)
+                    type: str
+                domain_name:
+                    description:
+                        - the domain_name of the entry (for deletions by exclusive the first domain name of the host)
+                    type: str
+                id:
+                    description:
+                        - id of the updated or deleted host, None on creation
+                    type: int
+                modified_on:
+                    description:
+                        - modified_on of the updated or deleted host at the time of planning
+                    type: str
+                data:
+                    description:
+                        - the data sent to npm on creation and update, None on deletion
+                    type: dict
+                diff:
+                    description:
+                        - the fields before and after the change, on updates only the fields that differ
+                    type: dict
+                touches:
+                    description:
+                        - the domain names affected by the change
+                    type: list
+                    elements: str
+                pruned:
+                    description:
+                        - true if the deletion is caused by I(exclusive)
+                    type: bool
+timings:
+    description:
+        - number, duration and size of the API calls done in this run, see I(timings)
+    type: dict
+    returned: if timings is enabled
+"""
+
+# the lists of hosts, keyed by the name of their kind in a plan
+LISTS = dict(proxy_hosts="proxies", redirection_hosts="redirections")
+
+
+def argument_spec():
+    # define available arguments/parameters a user can pass to the module
+    module_args = api.npm_argument_spec()
+    module_args.update(
+        proxies=dict(
+            type="list",
+            elements="dict",
+            required=False,
+            options=proxy_host.proxy_host_spec(),
+        ),
+        redirections=dict(
+            type="list",
+            elements="dict",
+            required=False,
+            options=redirection_host.redirection_host_spec(),
+        ),
+        exclusive=dict(type="bool", required=False, default=False),
+        max_deletions=dict(type="int", required=False, default=10),
+        dest=dict(type="path", required=False, default=None),
+    )
+    return module_args
+
+
+def run(module):
+    """
+    Does the work of the module, module needs to provide params, check_mode, exit_json and fail_json.
+    Called by run_module() and by the action plugin of the same name, if it runs on the controller.
+    """
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # changed is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        plan=None,
+    )
+
+    try:
+        client = api.NpmClient.from_module(module)
+        timing.report_timings(module, client.timings)
+
+        changes = list()
+        for name, key in LISTS.items():
+            if module.params[key] is None:
+                continue
+            resource = plan.RESOURCES[name]
+            bulk.check_entries(module, module.params[key], result)
+
+            success, entries = certificate.assign_certificates(
+                client,
+                module.params[key],
+            )
+            if not success:
+                module.fail_json(msg=entries, **result)
+            success, items = plan.fetch(client, resource)
+            if not success:
+                module.fail_json(msg=f"error on fetching {name}: {items}", **result)
+
+            # the entries bulk.plan records are not needed, the changes are taken from the operations
+            operations = bulk.plan(
+                module,
+                client,
+                resource,
+                items,
+                entries,
+                dict(results=list()),
+            )
+            changes += plan.serialize(name, operations)
+
+        result["plan"] = plan.build(changes)
+        if module.params["dest"] is not None:
+            with open(module.params["dest"], "w") as f:
+                json.dump(result["plan"], f, indent=2)
+
+        summary = ", ".join(f"{v} {k}" for k, v in result["plan"]["summary"].items())
+        module.exit_json(msg=f"planned changes: {summary}", **result)
+
+    except Exception as e:
+        module.fail_json(msg=f"Error: {e}", **result)
+
+
+def run_module():
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=True,
+    )
+
+    run(module)
+
+
+def main():
+    run_module()
+
+
+if __name__ == "__main__":
+    main()
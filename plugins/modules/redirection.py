@@ -6,10 +6,16 @@ from __future__ import absolute_import, division, print_function
 
 
 __metaclass__ = type
-import requests
-
 from ansible.module_utils.basic import AnsibleModule
 
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import (
+    api,
+    certificate,
+    diff,
+    redirection_host,
+    timing,
+)
+
 
 DOCUMENTATION = r"""
 ---
@@ -23,18 +29,16 @@ short_description: create, update or delete npm redirection
 
 description:
     - This module creates, updates, deletes or just returns a Nginx Proxy Manager redirection host
+    - An existing item is only updated if a field really differs, values are normalized before comparing,
+    - run with C(--diff) to get the differing fields
+    - If the task is executed on the controller (e.g. delegated to localhost) the module runs inside the controller process,
+    - set variable C(npm_run_on_controller) to C(false) to run it as regular module instead
+
+extends_documentation_fragment:
+    - nils_ost.proxymanager.api
+    - nils_ost.proxymanager.api.http
 
 options:
-    url:
-        description:
-            - the full URL of API-Endpoint
-        required: true
-        type: str
-    token:
-        description:
-            - the token used for authentication on API-Endpoint
-        required: true
-        type: str
     domain_name:
         description:
             - domain to be redirected
@@ -71,6 +75,14 @@ options:
         required: false
         type: int
         default: 0
+    auto_certificate:
+        description:
+            - if no certificate_id is given, use the existing certificate covering domain_name, also by a wildcard
+            - if several do, the one not expired, naming domain_name exactly and expiring latest is used
+            - fails if no certificate covers domain_name
+        required: false
+        type: bool
+        default: false
     force_ssl:
         description:
             - if ssl should be forced
@@ -133,112 +145,32 @@ item:
         - the item corresponding to domain_name created, updated or found on npm. might be None in case of errors or deletion
     type: dict or None
     returned: always
+diff:
+    description:
+        - the compared fields of the item before and after the change, on updates only the fields that differ
+        - values are compared normalized (e.g. order and case of domain names, trailing whitespace of advanced_config)
+    type: dict
+    returned: changed and in --diff mode
+timings:
+    description:
+        - number, duration and size of the API calls done in this run, see I(timings)
+    type: dict
+    returned: if timings is enabled
 """
 
 
-def data_as_expected(d1, d2):
-    keys = [
-        "domain_names",
-        "forward_http_code",
-        "forward_scheme",
-        "forward_domain_name",
-        "preserve_path",
-        "certificate_id",
-        "ssl_forced",
-        "http2_support",
-    ]
-    for k in keys:
-        if k not in d1:
-            return False
-        if k not in d2:
-            return False
-        if not d1.get(k) == d2.get(k):
-            return False
-    return True
-
-
-def search(url, token, name):
-    uri = f"{url}/api/nginx/redirection-hosts"
-
-    headers = dict()
-    headers["Authorization"] = "Bearer %s" % token
-    headers["Content-Type"] = "application/json"
-
-    response = requests.get(uri, headers=headers)
-    if not response.status_code == 200:
-        return (False, response.text)
-
-    for item in response.json():
-        if name in item.get("domain_names", list()):
-            return (True, item)
-    return (True, None)
-
-
-def create(url, token, data):
-    uri = f"{url}/api/nginx/redirection-hosts"
-
-    headers = dict()
-    headers["Authorization"] = "Bearer %s" % token
-    headers["Content-Type"] = "application/json"
-
-    response = requests.post(uri, json=data, headers=headers)
-    if not response.status_code == 201:
-        return (False, response.text)
-    return (True, response.json())
-
-
-def update(url, token, item, data):
-    uri = f"{url}/api/nginx/redirection-hosts/{item}"
-
-    headers = dict()
-    headers["Authorization"] = "Bearer %s" % token
-    headers["Content-Type"] = "application/json"
-
-    response = requests.put(uri, json=data, headers=headers)
-    if not response.status_code == 200:
-        return (False, response.text)
-    return (True, response.json())
-
-
-def delete(url, token, item):
-    uri = f"{url}/api/nginx/redirection-hosts/{item}"
-
-    headers = dict()
-    headers["Authorization"] = "Bearer %s" % token
-    headers["Content-Type"] = "application/json"
-
-    response = requests.delete(uri, headers=headers)
-    if not response.status_code == 200:
-        return (False, response.text)
-    return (True, response.json())
-
-
-def run_module():
+def argument_spec():
     # define available arguments/parameters a user can pass to the module
-    module_args = dict(
-        url=dict(type="str", required=True),
-        token=dict(type="str", required=True, no_log=True),
-        domain_name=dict(type="str", required=True),
-        forward_host=dict(type="str", required=False, default=None),
-        forward_code=dict(
-            type="int",
-            required=False,
-            default=301,
-            choices=[300, 301, 302, 303, 307, 308],
-        ),
-        forward_scheme=dict(
-            type="str",
-            required=False,
-            default="auto",
-            choices=["auto", "http", "https"],
-        ),
-        preserve_path=dict(type="bool", required=False, default=False),
-        certificate_id=dict(type="int", required=False, default=0),
-        force_ssl=dict(type="bool", required=False, default=False),
-        http2_support=dict(type="bool", required=False, default=False),
-        state=dict(type="str", default="present", choices=["absent", "present"]),
-    )
+    module_args = api.npm_argument_spec()
+    module_args.update(redirection_host.redirection_host_spec())
+    return module_args
+
 
+def run(module):
+    """
+    Does the work of the module, module needs to provide params, check_mode, exit_json and fail_json.
+    Called by run_module() and by the action plugin of the same name, if it runs on the controller.
+    """
     # seed the result dict in the object
     # we primarily care about changed and state
     # changed is if this module effectively modified the target
@@ -249,18 +181,9 @@ def run_module():
         item=None,
     )
 
-    # the AnsibleModule object will be our abstraction working with Ansible
-    # this includes instantiation, a couple of common attr would be the
-    # args/params passed to the execution, as well as if the module
-    # supports check mode
-    module = AnsibleModule(
-        argument_spec=module_args,
-        supports_check_mode=True,
-    )
-
     try:
-        url = module.params["url"]
-        token = module.params["token"]
+        client = api.NpmClient.from_module(module)
+        timing.report_timings(module, client.timings)
 
         if (
             module.params["state"] == "present"
@@ -271,62 +194,58 @@ def run_module():
                 **result,
             )
 
-        success, item = search(url, token, module.params["domain_name"])
+        success, item = redirection_host.search(client, module.params["domain_name"])
         if not success:
             module.fail_json(msg=f"error on searching for item: {item}", **result)
 
         if module.params["state"] == "present":
-            data = dict(
-                domain_names=[module.params["domain_name"]],
-                forward_http_code=module.params["forward_code"],
-                forward_scheme=module.params["forward_scheme"],
-                forward_domain_name=module.params["forward_host"],
-                preserve_path=module.params["preserve_path"],
-                certificate_id=module.params["certificate_id"],
-                ssl_forced=module.params["force_ssl"],
-                http2_support=module.params["http2_support"],
-                advanced_config="",
-                block_exploits=False,
-                hsts_enabled=False,
-                hsts_subdomains=False,
-                meta={},
-            )
+            success, params = certificate.assign_certificates(client, [module.params])
+            if not success:
+                module.fail_json(msg=params, **result)
+            data = redirection_host.build_data(params[0])
 
             if item is None:
+                result["changed"] = True
+                if module._diff:
+                    result["diff"] = diff.as_diff(None, data, redirection_host.FIELDS)
                 if not module.check_mode:
-                    success, item = create(url, token, data)
+                    success, item = redirection_host.create(client, data)
                     if not success:
                         module.fail_json(
                             msg=f"error on createing new item: {item}",
                             **result,
                         )
-                    result["changed"] = True
                     result["item"] = item
                     module.exit_json(msg=f"created item: {item['id']}", **result)
                 else:
-                    result["changed"] = True
                     result["item"] = data
                     module.exit_json(msg="would have created a item", **result)
 
             else:
+                changes = diff.changes(data, item, redirection_host.FIELDS)
+                if not changes:
+                    result["item"] = item
+                    module.exit_json(
+                        msg=f"item is already as expected: {item['id']}",
+                        **result,
+                    )
+                result["changed"] = True
+                if module._diff:
+                    result["diff"] = diff.as_diff(item, data, changes)
                 if not module.check_mode:
-                    if data_as_expected(data, item):
-                        result["item"] = item
-                        module.exit_json(
-                            msg=f"item is already as expected: {item['id']}",
-                            **result,
-                        )
-                    success, item = update(url, token, item.get("id"), data)
+                    success, item = redirection_host.update(
+                        client,
+                        item.get("id"),
+                        data,
+                    )
                     if not success:
                         module.fail_json(
                             msg=f"error on updateing existing item: {item}",
                             **result,
                         )
-                    result["changed"] = True
                     result["item"] = item
                     module.exit_json(msg=f"updated item: {item['id']}", **result)
                 else:
-                    result["changed"] = True
                     result["item"] = data
                     module.exit_json(
                         msg=f"would have updated item: {item['id']}",
@@ -336,20 +255,34 @@ def run_module():
         else:
             if item is None:
                 module.exit_json(msg="item is already deleted", **result)
+            result["changed"] = True
+            if module._diff:
+                result["diff"] = diff.as_diff(item, None, redirection_host.FIELDS)
             if not module.check_mode:
-                success, item = delete(url, token, item.get("id"))
+                success, item = redirection_host.delete(client, item.get("id"))
                 if not success:
                     module.fail_json(msg=f"error on deleteing item: {item}", **result)
-                result["changed"] = True
                 module.exit_json(msg="deleted item", **result)
             else:
-                result["changed"] = True
                 module.exit_json(msg="would have deleted a item", **result)
 
     except Exception as e:
         module.fail_json(msg=f"Error: {e}", **result)
 
 
+def run_module():
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=True,
+    )
+
+    run(module)
+
+
 def main():
     run_module()
 
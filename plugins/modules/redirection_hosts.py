@@ -0,0 +1,267 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import (
+    api,
+    bulk,
+    certificate,
+    redirection_host,
+    timing,
+)
+
+
+DOCUMENTATION = r"""
+---
+module: redirection_hosts
+
+author: Nils Ost (@nils-ost)
+
+version_added: "2.1.0"
+
+short_description: create, update or delete multiple npm redirections at once
+
+description:
+    - This module reconciles a whole list of Nginx Proxy Manager redirection hosts in one run
+    - The list of existing redirection hosts is fetched only once and indexed by domain name,
+    - afterwards only the required creates, updates and deletes are sent to the API
+    - Each entry of I(redirections) takes the same options as the M(nils_ost.proxymanager.redirection) module
+    - If the task is executed on the controller (e.g. delegated to localhost) the module runs inside the controller process,
+    - set variable C(npm_run_on_controller) to C(false) to run it as regular module instead
+
+extends_documentation_fragment:
+    - nils_ost.proxymanager.api
+    - nils_ost.proxymanager.api.http
+    - nils_ost.proxymanager.bulk
+    - nils_ost.proxymanager.throttle
+
+options:
+    redirections:
+        description:
+            - list of redirection hosts to be reconciled
+        required: true
+        type: list
+        elements: dict
+        suboptions:
+            domain_name:
+                description:
+                    - domain to be redirected
+                required: true
+                type: str
+            forward_host:
+                description:
+                    - destination of redirection
+                required: false (true if state equals present)
+                type: str
+            forward_code:
+                description:
+                    - http return code signaling the redirection
+                required: false
+                type: int
+                default: 301
+                choices: [300, 301, 302, 303, 307, 308]
+            forward_scheme:
+                description:
+                    - protocol to be used for redirection destination
+                required: false
+                type: str
+                default: 'auto'
+                choices: ['auto', 'http', 'https']
+            preserve_path:
+                description:
+                    - if the requested path sould be forwareded to destination or not
+                required: false
+                type: bool
+                default: false
+            certificate_id:
+                description:
+                    - id of npm certificate to be used
+                required: false
+                type: int
+                default: 0
+            auto_certificate:
+                description:
+                    - if no certificate_id is given, use the existing certificate covering domain_name, also by a wildcard
+                    - if several do, the one not expired, naming domain_name exactly and expiring latest is used
+                    - fails if no certificate covers domain_name
+                required: false
+                type: bool
+                default: false
+            force_ssl:
+                description:
+                    - if ssl should be forced
+                required: false
+                type: bool
+                default: false
+            http2_support:
+                description:
+                    - if http/2 support should be enabled
+                required: false
+                type: bool
+                default: false
+            state:
+                description:
+                    - if a redirection for domain_name should be created or deleted
+                required: false
+                type: str
+                default: 'present'
+                choices: ['absent', 'present']
+"""
+
+EXAMPLES = r"""
+# create a redirection and remove a deprecated one in a single task
+- name: reconcile npm redirects
+  nils_ost.proxymanager.redirection_hosts:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    redirections:
+      - domain_name: "some.domain"
+        forward_host: "192.168.1.234:81"
+        forward_scheme: http
+      - domain_name: "www.some.domain"
+        forward_host: "some.domain"
+        preserve_path: true
+      - domain_name: "old.domain"
+        state: absent
+  delegate_to: localhost
+
+# these are all redirection hosts, delete every other one (but fail if that's more than 5)
+- name: reconcile all npm redirection hosts
+  nils_ost.proxymanager.redirection_hosts:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    exclusive: true
+    max_deletions: 5
+    redirections:
+      - domain_name: "some.domain"
+        forward_host: "some.domain"
+  delegate_to: localhost
+"""
+
+RETURN = r"""
+results:
+    description:
+        - one entry per element of redirections, in the same order, followed by one per item deleted by I(exclusive)
+    type: list
+    elements: dict
+    returned: always
+    contains:
+        domain_name:
+            description:
+                - the domain_name of the corresponding element of redirections
+            type: str
+        pruned:
+            description:
+                - true if the item has been deleted by I(exclusive), then domain_name is its first domain name
+            type: bool
+            returned: if deleted by exclusive
+        action:
+            description:
+                - what has been (or in check mode would have been) done for this element
+                - one of C(created), C(updated), C(deleted) or C(unchanged)
+            type: str
+        failed:
+            description:
+                - true if the write for this element failed, the error is given in I(msg)
+            type: bool
+            returned: on failed writes
+        msg:
+            description:
+                - the error returned by npm for this element
+            type: str
+            returned: on failed writes
+        item:
+            description:
+                - the item corresponding to domain_name created, updated or found on npm. None on deletion
+            type: dict or None
+diff:
+    description:
+        - one diff per created, updated or deleted element, on updates only containing the fields that differ
+    type: list
+    elements: dict
+    returned: changed and in --diff mode
+timings:
+    description:
+        - number, duration and size of the API calls done in this run, see I(timings)
+    type: dict
+    returned: if timings is enabled
+"""
+
+
+def argument_spec():
+    # define available arguments/parameters a user can pass to the module
+    module_args = api.npm_argument_spec()
+    module_args.update(api.throttle_argument_spec())
+    module_args.update(bulk.bulk_argument_spec())
+    module_args.update(
+        redirections=dict(
+            type="list",
+            elements="dict",
+            required=True,
+            options=redirection_host.redirection_host_spec(),
+        ),
+    )
+    return module_args
+
+
+def run(module):
+    """
+    Does the work of the module, module needs to provide params, check_mode, exit_json and fail_json.
+    Called by run_module() and by the action plugin of the same name, if it runs on the controller.
+    """
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # changed is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        results=list(),
+    )
+
+    try:
+        client = api.NpmClient.from_module(module)
+        timing.report_timings(module, client.timings)
+
+        bulk.check_entries(module, module.params["redirections"], result)
+
+        success, entries = certificate.assign_certificates(
+            client,
+            module.params["redirections"],
+        )
+        if not success:
+            module.fail_json(msg=entries, **result)
+
+        bulk.reconcile(module, client, redirection_host, entries, result)
+
+        bulk.exit_reconciled(module, result)
+
+    except Exception as e:
+        module.fail_json(msg=f"Error: {e}", **result)
+
+
+def run_module():
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=True,
+    )
+
+    run(module)
+
+
+def main():
+    run_module()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import (
+    api,
+    bulk,
+    stream,
+    timing,
+)
+
+
+DOCUMENTATION = r"""
+---
+module: streams
+
+author: Nils Ost (@nils-ost)
+
+version_added: "2.1.0"
+
+short_description: create, update or delete multiple npm streams at once
+
+description:
+    - This module reconciles a whole list of Nginx Proxy Manager streams (TCP/UDP port forwardings) in one run
+    - The list of existing streams is fetched only once and indexed by incoming port and protocol,
+    - afterwards only the required creates, updates and deletes are sent to the API
+    - An entry refers to the existing stream listening on its incoming port with one of its protocols,
+    - collisions (entries listening on the same incoming port and protocol, or an entry colliding with several existing streams)
+    - make the module fail before anything is written, as nginx can't listen twice on the same port
+    - If the task is executed on the controller (e.g. delegated to localhost) the module runs inside the controller process,
+    - set variable C(npm_run_on_controller) to C(false) to run it as regular module instead
+
+extends_documentation_fragment:
+    - nils_ost.proxymanager.api
+    - nils_ost.proxymanager.api.http
+    - nils_ost.proxymanager.bulk
+    - nils_ost.proxymanager.throttle
+
+options:
+    streams:
+        description:
+            - list of streams to be reconciled
+        required: true
+        type: list
+        elements: dict
+        suboptions:
+            incoming_port:
+                description:
+                    - port npm listens on
+                required: true
+                type: int
+            forwarding_host:
+                description:
+                    - destination of the forwarding
+                required: false (true if state equals present)
+                type: str
+            forwarding_port:
+                description:
+                    - destination port of the forwarding
+                required: false (true if state equals present)
+                type: int
+            tcp_forwarding:
+                description:
+                    - if TCP should be forwarded
+                required: false
+                type: bool
+                default: true
+            udp_forwarding:
+                description:
+                    - if UDP should be forwarded
+                required: false
+                type: bool
+                default: false
+            certificate_id:
+                description:
+                    - id of npm certificate to be used for SSL termination (TCP only)
+                required: false
+                type: int
+                default: 0
+            state:
+                description:
+                    - if a stream for incoming_port should be created or deleted
+                    - on deletion every stream listening on incoming_port with one of the enabled protocols is deleted
+                required: false
+                type: str
+                default: 'present'
+                choices: ['absent', 'present']
+"""
+
+EXAMPLES = r"""
+# forward two ports and remove a deprecated forwarding in a single task
+- name: reconcile npm streams
+  nils_ost.proxymanager.streams:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    streams:
+      - incoming_port: 2222
+        forwarding_host: "192.168.1.234"
+        forwarding_port: 22
+      - incoming_port: 53
+        forwarding_host: "192.168.1.53"
+        forwarding_port: 53
+        udp_forwarding: true
+      - incoming_port: 2223
+        state: absent
+  delegate_to: localhost
+
+# these are all streams, delete every other one (but fail if that's more than 5)
+- name: reconcile all npm streams
+  nils_ost.proxymanager.streams:
+    url: "{{ npm.url }}"
+    token: "{{ npm.token }}"
+    exclusive: true
+    max_deletions: 5
+    streams: "{{ forwarded_ports }}"
+  delegate_to: localhost
+"""
+
+RETURN = r"""
+results:
+    description:
+        - one entry per element of streams, in the same order, followed by one per item deleted by I(exclusive)
+    type: list
+    elements: dict
+    returned: always
+    contains:
+        incoming_port:
+            description:
+                - the incoming_port of the corresponding element of streams
+            type: int
+        pruned:
+            description:
+                - true if the item has been deleted by I(exclusive), then incoming_port is its incoming port
+            type: bool
+            returned: if deleted by exclusive
+        action:
+            description:
+                - what has been (or in check mode would have been) done for this element
+                - one of C(created), C(updated), C(deleted) or C(unchanged)
+            type: str
+        failed:
+            description:
+                - true if the write for this element failed, the error is given in I(msg)
+            type: bool
+            returned: on failed writes
+        msg:
+            description:
+                - the error returned by npm for this element
+            type: str
+            returned: on failed writes
+        item:
+            description:
+                - the item corresponding to incoming_port created, updated or found on npm. None on deletion
+            type: dict or None
+diff:
+    description:
+        - one diff per created, updated or deleted item, on updates only containing the fields that differ
+    type: list
+    elements: dict
+    returned: changed and in --diff mode
+timings:
+    description:
+        - number, duration and size of the API calls done in this run, see I(timings)
+    type: dict
+    returned: if timings is enabled
+"""
+
+
+def argument_spec():
+    # define available arguments/parameters a user can pass to the module
+    module_args = api.npm_argument_spec()
+    module_args.update(api.throttle_argument_spec())
+    module_args.update(bulk.bulk_argument_spec())
+    module_args.update(
+        streams=dict(
+            type="list",
+            elements="dict",
+            required=True,
+            options=stream.stream_spec(),
+        ),
+    )
+    return module_args
+
+
+def run(module):
+    """
+    Does the work of the module, module needs to provide params, check_mode, exit_json and fail_json.
+    Called by run_module() and by the action plugin of the same name, if it runs on the controller.
+    """
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # changed is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        results=list(),
+    )
+
+    try:
+        client = api.NpmClient.from_module(module)
+        timing.report_timings(module, client.timings)
+
+        stream.check_entries(module, module.params["streams"], result)
+
+        bulk.reconcile(
+            module,
+            client,
+            stream,
+            module.params["streams"],
+            result,
+            keys=stream.keys_of,
+            label=stream.label_of,
+            field="incoming_port",
+        )
+
+        bulk.exit_reconciled(module, result, key="incoming_port")
+
+    except Exception as e:
+        module.fail_json(msg=f"Error: {e}", **result)
+
+
+def run_module():
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=True,
+    )
+
+    run(module)
+
+
+def main():
+    run_module()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,13 @@ from __future__ import absolute_import, division, print_function
 
 
 __metaclass__ = type
-import requests
-
 from ansible.module_utils.basic import AnsibleModule
 
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import api, timing
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils.cache import (
+    TokenCache,
+)
+
 
 DOCUMENTATION = r"""
 ---
@@ -24,6 +27,13 @@ short_description: fetch npm API token (login)
 description:
     - For other Nginx Proxy Manager endpoints a valid token is required,
     - this modules executes a login on an npm instance and returns the corresponding token
+    - With I(cache) enabled, the token is kept on the controller and reused by later runs as long as it is valid,
+    - a token that is about to expire is renewed with the token itself, instead of a new login with user and password
+    - If the task is executed on the controller (e.g. delegated to localhost) the module runs inside the controller process,
+    - set variable C(npm_run_on_controller) to C(false) to run it as regular module instead
+
+extends_documentation_fragment:
+    - nils_ost.proxymanager.api.http
 
 options:
     protocol:
@@ -54,6 +64,32 @@ options:
             - password to authenticate on proxymanager instance
         required: true
         type: str
+    expiry:
+        description:
+            - requested lifetime of the token, in the notation of npm (e.g. C(1d), C(12h) or C(30m))
+        required: false
+        type: str
+        default: '1d'
+    cache:
+        description:
+            - if the token should be cached on the controller and reused on later runs
+            - a cached token is only reused for the same url, user, password and expiry,
+            - the cache stores a salted digest of the password, not the password itself
+        required: false
+        type: bool
+        default: false
+    cache_dir:
+        description:
+            - directory on the controller the cached token is stored in
+        required: false
+        type: path
+        default: '~/.ansible/cache/nils_ost.proxymanager'
+    renew_before:
+        description:
+            - a cached token with less than this many seconds left is renewed, instead of reused
+        required: false
+        type: int
+        default: 3600
 """
 
 EXAMPLES = r"""
@@ -64,6 +100,16 @@ EXAMPLES = r"""
     user: "{{ root_email }}"
     password: "{{ root_password_long }}"
   register: npm
+
+# reuse the token of former runs, as long as it's valid for at least one more hour
+- name: fetch (cached) proxymanager API token
+  nils_ost.proxymanager.token:
+    host: "{{ ansible_host }}"
+    user: "{{ root_email }}"
+    password: "{{ root_password_long }}"
+    expiry: 12h
+    cache: true
+  register: npm
 """
 
 RETURN = r"""
@@ -75,22 +121,54 @@ url:
     sample: 'http://192.168.0.5:81'
 token:
     description:
-        - newly created API token for given user
+        - newly created, renewed or cached API token for given user
+    type: str
+    returned: always
+expires:
+    description:
+        - point in time the token expires, as returned by npm
     type: str
     returned: always
+    sample: '2026-01-08T12:00:00.000Z'
+source:
+    description:
+        - where the token came from, one of C(login), C(renewed) or C(cache)
+    type: str
+    returned: always
+timings:
+    description:
+        - number, duration and size of the API calls done in this run, see I(timings)
+    type: dict
+    returned: if timings is enabled
 """
 
 
-def run_module():
+def argument_spec():
     # define available arguments/parameters a user can pass to the module
-    module_args = dict(
+    module_args = api.http_argument_spec()
+    module_args.update(
         protocol=dict(type="str", default="http", choices=["http", "https"]),
         host=dict(type="str", required=True),
         port=dict(type="int", required=False, default=81),
         user=dict(type="str", required=True),
         password=dict(type="str", required=True, no_log=True),
+        expiry=dict(type="str", required=False, default="1d"),
+        cache=dict(type="bool", required=False, default=False),
+        cache_dir=dict(
+            type="path",
+            required=False,
+            default="~/.ansible/cache/nils_ost.proxymanager",
+        ),
+        renew_before=dict(type="int", required=False, default=3600),
     )
+    return module_args
+
 
+def run(module):
+    """
+    Does the work of the module, module needs to provide params, check_mode, exit_json and fail_json.
+    Called by run_module() and by the action plugin of the same name, if it runs on the controller.
+    """
     # seed the result dict in the object
     # we primarily care about changed and state
     # changed is if this module effectively modified the target
@@ -100,32 +178,68 @@ def run_module():
         changed=False,
     )
 
-    # the AnsibleModule object will be our abstraction working with Ansible
-    # this includes instantiation, a couple of common attr would be the
-    # args/params passed to the execution, as well as if the module
-    # supports check mode
-    module = AnsibleModule(
-        argument_spec=module_args,
-        supports_check_mode=True,
-    )
+    timings = timing.Timings.for_module(module)
+    timing.report_timings(module, timings)
 
     try:
-        headers = dict()
-        headers["Content-Type"] = "application/json"
+        result[
+            "url"
+        ] = f"{module.params['protocol']}://{module.params['host']}:{module.params['port']}"
+        user = module.params["user"]
+
+        cache = None
+        if module.params["cache"]:
+            cache = TokenCache(
+                module.params["cache_dir"],
+                result["url"],
+                user,
+                module.params["password"],
+                module.params["expiry"],
+            )
+            cached = cache.load()
+            if cached is not None:
+                token, expires = cached
+                left = api.seconds_left(expires)
+
+                if left > module.params["renew_before"]:
+                    result["token"] = token
+                    result["expires"] = expires
+                    result["source"] = "cache"
+                    module.exit_json(**result)
+
+                if left > 0:
+                    client = api.NpmClient(
+                        result["url"],
+                        token,
+                        timings=timings,
+                        **api.http_kwargs(module.params),
+                    )
+                    response = client.get(
+                        "/api/tokens",
+                        params=dict(expiry=module.params["expiry"]),
+                    )
+                    if response.status_code == 200 and "token" in response.json():
+                        result["token"] = response.json().get("token")
+                        result["expires"] = response.json().get("expires")
+                        result["source"] = "renewed"
+                        cache.store(result["token"], result["expires"])
+                        module.exit_json(**result)
+
+                # expired or renewal not possible, fall back to a new login
+                cache.invalidate()
 
         data = dict(
-            identity=module.params["user"],
+            identity=user,
             secret=module.params["password"],
+            expiry=module.params["expiry"],
         )
 
-        result[
-            "url"
-        ] = f"{module.params['protocol']}://{module.params['host']}:{module.params['port']}"
-        response = requests.post(
-            result["url"] + "/api/tokens",
-            json=data,
-            headers=headers,
+        client = api.NpmClient(
+            result["url"],
+            timings=timings,
+            **api.http_kwargs(module.params),
         )
+        response = client.post("/api/tokens", data)
 
         if not response.status_code == 200:
             module.fail_json(
@@ -137,12 +251,29 @@ def run_module():
             module.fail_json(msg="API response not containing a token", **result)
 
         result["token"] = response.json().get("token")
+        result["expires"] = response.json().get("expires")
+        result["source"] = "login"
+        if cache is not None and result["expires"]:
+            cache.store(result["token"], result["expires"])
         module.exit_json(**result)
 
     except Exception as e:
         module.fail_json(msg=f"Error: {e}", **result)
 
 
+def run_module():
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=True,
+    )
+
+    run(module)
+
+
 def main():
     run_module()
 
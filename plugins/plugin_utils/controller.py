@@ -0,0 +1,136 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import importlib
+import importlib.util
+import time
+
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible.module_utils.common.parameters import remove_values
+from ansible.module_utils.errors import UnsupportedError
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.plugins.action import ActionBase
+from ansible.utils.vars import merge_hash
+
+
+class ModuleExit(SystemExit):
+    """raised by exit_json and fail_json of ControllerModule, carrying the result of the module"""
+
+    def __init__(self, result):
+        super().__init__(1 if result.get("failed") else 0)
+        self.result = result
+
+
+class ControllerModule:
+    """
+    Stands in for AnsibleModule, if a module of this collection is run inside the controller process.
+    Provides the parts of AnsibleModule the modules use: params, check_mode, _diff, exit_json and fail_json.
+    Like on AnsibleModule exit_json and fail_json end the run (by raising ModuleExit).
+    """
+
+    def __init__(self, params, no_log_values=None, check_mode=False, diff=False):
+        self.params = params
+        self.no_log_values = set(no_log_values or list())
+        self.check_mode = check_mode
+        self._diff = diff
+        self.started = time.monotonic()
+
+    def exit_json(self, **kwargs):
+        self._return(kwargs)
+
+    def fail_json(self, msg, **kwargs):
+        kwargs.update(failed=True, msg=str(msg))
+        self._return(kwargs)
+
+    def _return(self, kwargs):
+        # same as AnsibleModule: add the invocation and mask values of no_log parameters,
+        # but keep bools and None (they can't be secrets)
+        kwargs.setdefault("invocation", dict(module_args=self.params))
+        preserved = {
+            k: v for k, v in kwargs.items() if v is None or isinstance(v, bool)
+        }
+        kwargs = remove_values(kwargs, self.no_log_values)
+        kwargs.update(preserved)
+        raise ModuleExit(kwargs)
+
+
+class ControllerActionBase(ActionBase):
+    """
+    Action plugin that runs the module named MODULE inside the controller process, if the task is executed
+    on the controller anyway (local connection, e.g. delegate_to: localhost). This saves building and
+    transferring the AnsiballZ payload and starting a new python interpreter for every task.
+    In all other cases (remote hosts, become, async), if the variable npm_run_on_controller is false
+    or if the module can't be imported on the controller, the module is executed the regular way.
+
+    MODULE has to provide argument_spec() and run(module), see ControllerModule.
+    """
+
+    MODULE = None
+
+    _supports_check_mode = True
+    _supports_async = True
+
+    def runs_on_controller(self, task_vars):
+        return (
+            boolean(task_vars.get("npm_run_on_controller", True), strict=False)
+            and self._connection.transport == "local"
+            and not self._play_context.become
+            and not self._task.async_val
+        )
+
+    def load_module(self):
+        # requests is imported lazily by the modules, so importing them doesn't reveal if it's missing,
+        # e.g. if it's only installed for the interpreter configured for localhost
+        if importlib.util.find_spec("requests") is None:
+            return None
+        try:
+            return importlib.import_module(
+                f"ansible_collections.nils_ost.proxymanager.plugins.modules.{self.MODULE}",
+            )
+        except ImportError:
+            return None
+
+    def run(self, tmp=None, task_vars=None):
+        result = super().run(tmp, task_vars)
+        del tmp  # tmp no longer has any effect
+
+        module = (
+            self.load_module() if self.runs_on_controller(task_vars or dict()) else None
+        )
+        if module is None:
+            wrap_async = self._task.async_val and not self._connection.has_native_async
+            result = merge_hash(
+                result,
+                self._execute_module(
+                    module_name=f"nils_ost.proxymanager.{self.MODULE}",
+                    task_vars=task_vars,
+                    wrap_async=wrap_async,
+                ),
+            )
+            if not wrap_async:
+                self._remove_tmp_path(self._connection._shell.tmpdir)
+            return result
+
+        validation = ArgumentSpecValidator(module.argument_spec()).validate(
+            self._task.args,
+        )
+        if validation.error_messages:
+            msg = validation.errors.msg
+            if isinstance(validation.errors[0], UnsupportedError):
+                msg = f"Unsupported parameters for (nils_ost.proxymanager.{self.MODULE}) module: {msg}"
+            return merge_hash(result, dict(failed=True, msg=msg))
+
+        controller = ControllerModule(
+            validation.validated_parameters,
+            no_log_values=validation._no_log_values,
+            check_mode=self._task.check_mode,
+            diff=self._task.diff,
+        )
+        try:
+            module.run(controller)
+        except ModuleExit as e:
+            result = merge_hash(result, e.result)
+        return result
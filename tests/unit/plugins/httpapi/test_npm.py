@@ -0,0 +1,84 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ansible_collections.nils_ost.proxymanager.plugins.httpapi.npm import HttpApi
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils.cache import (
+    token_identity,
+)
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.seen.append(self.headers.get("Authorization"))
+        ok = self.headers.get("Authorization") == "Bearer sessiontoken"
+        body = b"[]" if ok else b'{"error": {"code": 401}}'
+        self.send_response(200 if ok else 401)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Connection:
+    """the parts of netcommon's httpapi connection the plugin uses, connected with a session_key"""
+
+    def __init__(self, url, auth):
+        self._url = url
+        self._auth = auth
+        self._connected = True
+        self.options = dict(validate_certs=True, remote_user=None, password=None)
+
+    def get_option(self, name):
+        return self.options[name]
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.seen = list()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_session_key_is_sent(server):
+    connection = Connection(
+        f"http://127.0.0.1:{server.server_address[1]}",
+        {"Authorization": "Bearer sessiontoken"},
+    )
+    plugin = HttpApi(connection)
+
+    assert plugin.send_request("GET", "/api/nginx/proxy-hosts") == (200, "[]")
+    assert plugin.send_request("GET", "/api/nginx/proxy-hosts") == (200, "[]")
+    assert server.seen == ["Bearer sessiontoken", "Bearer sessiontoken"]
+    plugin.logout()
+
+
+def test_identity_is_the_one_of_the_session_key():
+    plugin = HttpApi(
+        Connection("http://127.0.0.1:1", {"Authorization": "Bearer sessiontoken"}),
+    )
+    assert plugin.get_identity() == token_identity("sessiontoken")
+    assert not plugin.get_identity() == token_identity("othertoken")
+
+
+def test_login_requires_credentials():
+    from ansible.errors import AnsibleConnectionFailure
+
+    plugin = HttpApi(Connection("http://127.0.0.1:1", None))
+    with pytest.raises(AnsibleConnectionFailure):
+        plugin.login(None, None)
@@ -0,0 +1,66 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import pytest
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils.access_list import (
+    collapse_clients,
+)
+
+
+def clients(*addresses, directive="allow"):
+    return [dict(address=a, directive=directive) for a in addresses]
+
+
+def test_neighbouring_networks_are_merged():
+    assert collapse_clients(
+        clients("10.0.0.0/25", "10.0.0.128/25", "10.0.1.0/24"),
+    ) == clients("10.0.0.0/23")
+
+
+def test_duplicates_and_covered_networks_are_removed():
+    assert collapse_clients(
+        clients("10.0.0.7", "10.0.0.0/24", "10.0.0.7/32", "10.0.0.0/24"),
+    ) == clients("10.0.0.0/24")
+
+
+def test_networks_are_sorted_and_hosts_given_without_prefix():
+    assert collapse_clients(
+        clients("192.168.1.5/32", "10.0.0.1", "192.168.1.4"),
+    ) == clients("10.0.0.1", "192.168.1.4/31")
+
+
+def test_host_bits_are_dropped():
+    assert collapse_clients(clients("10.0.0.77/24")) == clients("10.0.0.0/24")
+
+
+def test_ip_versions_are_collapsed_separately():
+    assert collapse_clients(
+        clients("2001:db8::/33", "10.0.0.0/24", "2001:db8:8000::/33"),
+    ) == clients("10.0.0.0/24", "2001:db8::/32")
+
+
+def test_only_following_clients_of_the_same_directive_are_merged():
+    given = (
+        clients("10.0.0.0/25")
+        + clients("10.0.0.128/25", directive="deny")
+        + clients("10.0.0.128/26", "10.0.0.192/26")
+    )
+    assert collapse_clients(given) == (
+        clients("10.0.0.0/25")
+        + clients("10.0.0.128/25", directive="deny")
+        + clients("10.0.0.128/25")
+    )
+
+
+def test_clients_after_all_are_left_out():
+    given = clients("10.0.0.0/24", "all", directive="deny") + clients("192.168.0.0/16")
+    assert collapse_clients(given) == clients("all", directive="deny")
+
+
+def test_invalid_address():
+    with pytest.raises(ValueError):
+        collapse_clients(clients("10.0.0.300"))
@@ -0,0 +1,59 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils.bulk import (
+    plan_waves,
+)
+
+
+def op(name, *touches):
+    return dict(name=name, touches=set(touches))
+
+
+def names(waves):
+    return [[o["name"] for o in wave] for wave in waves]
+
+
+def test_independent_operations_share_a_wave():
+    waves = plan_waves([op("a", "a.com"), op("b", "b.com"), op("c", "c.com")])
+    assert names(waves) == [["a", "b", "c"]]
+
+
+def test_conflicting_operations_are_in_different_waves():
+    # deleting the item holding a.com has to be done before it is claimed by another one
+    waves = plan_waves(
+        [op("delete", "a.com"), op("create", "a.com", "b.com"), op("update", "c.com")],
+    )
+    assert names(waves) == [["delete", "update"], ["create"]]
+
+
+def test_chained_conflicts_keep_their_order():
+    waves = plan_waves(
+        [
+            op("1", "a.com"),
+            op("2", "a.com", "b.com"),
+            op("3", "b.com"),
+            op("4", "a.com"),
+        ],
+    )
+    assert names(waves) == [["1"], ["2"], ["3", "4"]]
+
+
+def test_operation_is_placed_after_the_latest_conflict():
+    waves = plan_waves(
+        [
+            op("1", "a.com"),
+            op("2", "a.com"),
+            op("3", "b.com"),
+            op("4", "b.com", "a.com"),
+        ],
+    )
+    assert names(waves) == [["1", "3"], ["2"], ["4"]]
+
+
+def test_operations_without_touches():
+    assert names(plan_waves([op("a"), op("b")])) == [["a", "b"]]
+    assert plan_waves(list()) == list()
@@ -0,0 +1,89 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils.cache import (
+    ListCache,
+    TokenCache,
+    token_identity,
+)
+
+
+URL = "http://npm.example:81"
+
+
+def test_token_is_reused_for_same_credentials(tmp_path):
+    TokenCache(tmp_path, URL, "admin", "secret", "1d").store(
+        "tok",
+        "2099-01-01T00:00:00Z",
+    )
+    assert TokenCache(tmp_path, URL, "admin", "secret", "1d").load() == (
+        "tok",
+        "2099-01-01T00:00:00Z",
+    )
+
+
+def test_token_is_not_returned_for_other_password(tmp_path):
+    TokenCache(tmp_path, URL, "admin", "secret", "1d").store(
+        "tok",
+        "2099-01-01T00:00:00Z",
+    )
+    assert TokenCache(tmp_path, URL, "admin", "wrong", "1d").load() is None
+
+
+def test_token_is_not_returned_for_other_expiry_or_user(tmp_path):
+    TokenCache(tmp_path, URL, "admin", "secret", "1d").store(
+        "tok",
+        "2099-01-01T00:00:00Z",
+    )
+    assert TokenCache(tmp_path, URL, "admin", "secret", "2h").load() is None
+    assert TokenCache(tmp_path, URL, "other", "secret", "1d").load() is None
+
+
+def test_secret_is_not_stored(tmp_path):
+    TokenCache(tmp_path, URL, "admin", "secret", "1d").store(
+        "tok",
+        "2099-01-01T00:00:00Z",
+    )
+    for path in tmp_path.iterdir():
+        assert "secret" not in path.read_text().replace('"secret":', "")
+
+
+def test_invalidate(tmp_path):
+    cache = TokenCache(tmp_path, URL, "admin", "secret", "1d")
+    cache.store("tok", "2099-01-01T00:00:00Z")
+    cache.invalidate()
+    assert cache.load() is None
+
+
+def test_list_is_reused_for_same_token(tmp_path):
+    ListCache(tmp_path, URL, token_identity("tok")).store("/api/nginx/streams", [1])
+    cache = ListCache(tmp_path, URL, token_identity("tok"))
+    assert cache.load("/api/nginx/streams") == [1]
+    cache.invalidate("/api/nginx/streams")
+    assert cache.load("/api/nginx/streams") is None
+
+
+def test_list_is_not_returned_for_other_token(tmp_path):
+    # npm filters lists by the permissions of the user the token belongs to
+    ListCache(tmp_path, URL, token_identity("tok")).store("/api/nginx/streams", [1])
+    assert (
+        ListCache(tmp_path, URL, token_identity("other")).load(
+            "/api/nginx/streams",
+        )
+        is None
+    )
+    for path in tmp_path.iterdir():
+        assert "tok" not in path.read_text()
+
+
+def test_expired_list_is_not_returned(tmp_path):
+    ListCache(tmp_path, URL, token_identity("tok")).store("/api/nginx/streams", [1])
+    assert (
+        ListCache(tmp_path, URL, token_identity("tok"), ttl=-1).load(
+            "/api/nginx/streams",
+        )
+        is None
+    )
@@ -0,0 +1,90 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import datetime
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils.certificate import (
+    CertificateIndex,
+)
+
+
+def expires(days):
+    at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=days)
+    return at.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def certificate(id, *names, days=90):
+    return dict(id=id, domain_names=list(names), expires_on=expires(days))
+
+
+def lookup(index, name, wildcard=True):
+    item = index.lookup(name, wildcard)
+    return None if item is None else item["id"]
+
+
+def test_exact_match():
+    index = CertificateIndex([certificate(1, "www.example.com", "example.com")])
+    assert lookup(index, "www.example.com") == 1
+    assert lookup(index, "example.com") == 1
+    assert lookup(index, "other.example.com") is None
+
+
+def test_names_are_compared_lowercased():
+    index = CertificateIndex([certificate(1, "WWW.Example.com")])
+    assert lookup(index, " www.EXAMPLE.com") == 1
+
+
+def test_wildcard_covers_a_single_label():
+    index = CertificateIndex([certificate(1, "*.example.com")])
+    assert lookup(index, "www.example.com") == 1
+    assert lookup(index, "example.com") is None
+    assert lookup(index, "a.www.example.com") is None
+    assert lookup(index, "www.example.org") is None
+
+
+def test_wildcards_can_be_excluded():
+    index = CertificateIndex([certificate(1, "*.example.com")])
+    assert lookup(index, "www.example.com", wildcard=False) is None
+
+
+def test_wildcard_name_only_matches_the_same_wildcard():
+    index = CertificateIndex(
+        [certificate(1, "*.example.com"), certificate(2, "www.example.com")],
+    )
+    assert lookup(index, "*.example.com") == 1
+    assert lookup(index, "*.www.example.com") is None
+
+
+def test_exact_match_before_wildcard():
+    index = CertificateIndex(
+        [
+            certificate(1, "*.example.com", days=300),
+            certificate(2, "www.example.com", days=10),
+        ],
+    )
+    assert lookup(index, "www.example.com") == 2
+    assert lookup(index, "api.example.com") == 1
+
+
+def test_valid_wildcard_before_expired_exact_match():
+    index = CertificateIndex(
+        [
+            certificate(1, "*.example.com"),
+            certificate(2, "www.example.com", days=-1),
+        ],
+    )
+    assert lookup(index, "www.example.com") == 1
+
+
+def test_latest_expiry_wins():
+    index = CertificateIndex(
+        [
+            certificate(1, "www.example.com", days=10),
+            certificate(2, "www.example.com", days=80),
+            certificate(3, "www.example.com", days=30),
+        ],
+    )
+    assert lookup(index, "www.example.com") == 2
@@ -0,0 +1,44 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import sqlite3
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils.database import (
+    Database,
+)
+
+
+def test_flags_of_integer_columns_are_booleans(tmp_path):
+    # the column types npm's migrations create
+    path = str(tmp_path / "database.sqlite")
+    db = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE proxy_host (id integer, is_deleted integer, domain_names json, "
+        "forward_port integer, ssl_forced integer, enabled integer, meta text)",
+    )
+    db.execute(
+        "INSERT INTO proxy_host VALUES (1, 0, '[\"a.example\"]', 80, 1, 0, '{}')",
+    )
+    db.execute(
+        "INSERT INTO proxy_host VALUES (2, 1, '[\"b.example\"]', 80, 0, 1, '{}')",
+    )
+    db.commit()
+    db.close()
+
+    success, items = Database(path).list_items("/api/nginx/proxy-hosts")
+    assert success
+    assert items == [
+        dict(
+            id=1,
+            domain_names=["a.example"],
+            forward_port=80,
+            ssl_forced=True,
+            enabled=False,
+            meta=dict(),
+        ),
+    ]
+    assert items[0]["ssl_forced"] is True
+    assert items[0]["forward_port"] == 80 and type(items[0]["forward_port"]) is int
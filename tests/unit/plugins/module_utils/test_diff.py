@@ -0,0 +1,35 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import diff
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils.redirection_host import (
+    FIELDS,
+)
+
+
+def test_host_of_target_is_case_insensitive():
+    assert diff.normalize("target", " Target.Example.com ") == "target.example.com"
+    assert (
+        diff.normalize("target", "Target.Example.com:8080/Some/Path")
+        == "target.example.com:8080/Some/Path"
+    )
+
+
+def test_path_of_forward_domain_name_is_compared_as_is():
+    item = dict(forward_domain_name="target.example.com/Path")
+    assert (
+        diff.changes(
+            dict(forward_domain_name="TARGET.example.com/Path"),
+            item,
+            dict(forward_domain_name=FIELDS["forward_domain_name"]),
+        )
+        == list()
+    )
+    assert diff.changes(
+        dict(forward_domain_name="target.example.com/path"),
+        item,
+        dict(forward_domain_name=FIELDS["forward_domain_name"]),
+    ) == ["forward_domain_name"]
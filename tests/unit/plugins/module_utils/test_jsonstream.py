@@ -0,0 +1,105 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import json
+
+import pytest
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils.jsonstream import (
+    iter_array,
+)
+
+
+ITEMS = [
+    dict(id=1, domain_names=["a.example.com"], meta=dict(nested=[1, 2, [3]])),
+    dict(id=2, name="brackets ] [ } { and , in a string"),
+    dict(id=3, name='escaped \\" quote ] and \\\\ backslash'),
+    dict(id=4, name="multibyte äöü ß € 😀"),
+    12345,
+    -1.5e3,
+    "plain",
+    None,
+    True,
+]
+
+
+def split(data, size):
+    return [data[start:][:size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 64, 100000])
+def test_any_chunk_boundary(size):
+    data = json.dumps(ITEMS, ensure_ascii=False).encode("utf-8")
+    assert list(iter_array(split(data, size))) == ITEMS
+
+
+def test_multibyte_character_split_across_chunks():
+    data = json.dumps(["€😀"], ensure_ascii=False).encode("utf-8")
+    # cut in the middle of the 3 byte euro sign and of the 4 byte emoji
+    first = data.index("€".encode("utf-8")) + 1
+    second = first + 4
+    chunks = [data[:first], data[first:second], data[second:]]
+    assert list(iter_array(chunks)) == ["€😀"]
+
+
+def test_nested_strings_with_brackets_and_escapes():
+    data = b'[{"a": "]", "b": "[\\"]\\\\"}, ["],[", {"c": "}"}], "\\u005d"]'
+    assert list(iter_array([data])) == [
+        {"a": "]", "b": '["]\\'},
+        ["],[", {"c": "}"}],
+        "]",
+    ]
+
+
+def test_number_split_across_chunks():
+    # 12 is a valid number on its own, the element is only complete with its separator
+    assert list(iter_array([b"[12", b"34, 5", b"6]"])) == [1234, 56]
+
+
+def test_whitespace_and_empty_array():
+    assert list(iter_array([b" \n[ ", b" ]\r\n"])) == list()
+    assert list(iter_array([b"[ 1 ,\n 2 ]"])) == [1, 2]
+
+
+def test_received_is_called_per_chunk():
+    sizes = list()
+    list(iter_array([b"[1,", b"2]"], sizes.append))
+    assert sizes == [3, 2]
+
+
+def test_stops_reading_when_iteration_stops():
+    read = list()
+
+    def chunks():
+        for chunk in (b"[1,", b"2,", b"3]"):
+            read.append(chunk)
+            yield chunk
+
+    items = iter_array(chunks())
+    assert next(items) == 1
+    assert read == [b"[1,"]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"[", b'[{"a": 1}', b'[{"a": 1},', b'[{"a": "unterminated', b"[12"],
+)
+def test_truncated_input(data):
+    with pytest.raises(ValueError):
+        list(iter_array(split(data, 2) if data else list()))
+
+
+def test_truncated_input_yields_complete_elements_first():
+    items = iter_array([b'[{"id": 1}, {"id": 2}, {"id"'])
+    assert next(items) == {"id": 1}
+    assert next(items) == {"id": 2}
+    with pytest.raises(ValueError):
+        next(items)
+
+
+def test_not_an_array():
+    with pytest.raises(ValueError):
+        list(iter_array([b'{"id": 1}']))
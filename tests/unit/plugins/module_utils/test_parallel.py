@@ -0,0 +1,232 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import threading
+
+import pytest
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import api, parallel
+
+
+class Clock:
+    """stands in for the time module, sleeping only advances the clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = list()
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(parallel, "time", clock)
+    return clock
+
+
+def test_rate_limiter_spaces_out_calls(clock):
+    limiter = parallel.RateLimiter(rate=4)
+    for _ in range(3):
+        limiter.wait()
+    assert clock.sleeps == [0.25, 0.25]
+
+
+def test_rate_limiter_lets_calls_through_after_a_pause(clock):
+    limiter = parallel.RateLimiter(rate=4)
+    limiter.wait()
+    clock.now += 1
+    limiter.wait()
+    assert clock.sleeps == list()
+
+
+def test_rate_limiter_disabled(clock):
+    limiter = parallel.RateLimiter(rate=0)
+    for _ in range(3):
+        limiter.wait()
+    assert clock.sleeps == list()
+
+
+def test_results_keep_the_order_of_tasks():
+    tasks = [lambda i=i: (True, i) for i in range(20)]
+    assert parallel.run_parallel(tasks, workers=4) == [(True, i) for i in range(20)]
+
+
+def test_exception_doesnt_stop_other_tasks():
+    def fail():
+        raise ValueError("broken")
+
+    tasks = [lambda: (True, 1), fail, lambda: (True, 3)]
+    for workers in (1, 3):
+        assert parallel.run_parallel(tasks, workers=workers) == [
+            (True, 1),
+            (False, "broken"),
+            (True, 3),
+        ]
+
+
+def test_concurrency_is_bounded_by_workers():
+    lock = threading.Lock()
+    running = [0, 0]
+    started = threading.Barrier(3, timeout=5)
+
+    def task():
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        try:
+            # the first round of tasks only finishes when all workers run at once
+            started.wait()
+        except threading.BrokenBarrierError:
+            pass
+        with lock:
+            running[0] -= 1
+        return (True, None)
+
+    results = parallel.run_parallel([task] * 9, workers=3)
+    assert results == [(True, None)] * 9
+    assert running[1] == 3
+
+
+def test_rate_of_task_starts(clock):
+    tasks = [lambda: (True, None)] * 3
+    parallel.run_parallel(tasks, workers=1, rate=2)
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def writer(clock, seconds=0.05, status_code=200):
+    """returns a write taking seconds on clock and answered with status_code"""
+
+    def send():
+        clock.now += seconds
+        return Response(status_code)
+
+    return send
+
+
+class Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+def test_throttle_keeps_limit_while_writes_are_in_time(clock):
+    throttle = parallel.WriteThrottle(maximum=4)
+    for _ in range(5):
+        assert throttle.run(writer(clock)).status_code == 200
+    assert throttle.as_dict() == dict(writes=5, limit=4, lowest=4, decreases=0)
+
+
+@pytest.mark.parametrize("status_code", [500, 503, 429])
+def test_throttle_halves_limit_on_failed_writes(clock, status_code):
+    throttle = parallel.WriteThrottle(maximum=4)
+    assert throttle.run(writer(clock, status_code=status_code)).status_code == (
+        status_code
+    )
+    assert throttle.as_dict() == dict(writes=1, limit=2, lowest=2, decreases=1)
+
+
+def test_throttle_counts_exceptions_as_failed(clock):
+    def send():
+        raise ValueError("no answer")
+
+    throttle = parallel.WriteThrottle(maximum=4)
+    with pytest.raises(ValueError):
+        throttle.run(send)
+    assert throttle.as_dict()["limit"] == 2
+    assert throttle.in_flight == 0
+
+
+def test_throttle_halves_limit_on_slow_writes(clock):
+    throttle = parallel.WriteThrottle(maximum=8, latency_target=1)
+    throttle.run(writer(clock, seconds=0.5))
+    throttle.run(writer(clock, seconds=1.5))
+    assert throttle.as_dict()["limit"] == 4
+
+
+def test_throttle_compares_with_fastest_write_without_latency_target(clock):
+    throttle = parallel.WriteThrottle(maximum=8)
+    throttle.run(writer(clock, seconds=0.2))
+    # twice as long, but not LATENCY_SLACK more
+    throttle.run(writer(clock, seconds=0.29))
+    assert throttle.as_dict()["limit"] == 8
+    throttle.run(writer(clock, seconds=0.5))
+    assert throttle.as_dict()["limit"] == 4
+
+
+def test_throttle_decreases_once_per_round_of_writes(clock):
+    throttle = parallel.WriteThrottle(maximum=8)
+    started = clock.monotonic()
+    clock.now += 1
+    throttle.release(started, 1, failed=True)
+    # started before the decrease, it still reflects the former limit
+    throttle.release(started, 1, failed=True)
+    assert throttle.as_dict() == dict(writes=0, limit=4, lowest=4, decreases=1)
+    throttle.release(clock.monotonic(), 1, failed=True)
+    assert throttle.as_dict()["limit"] == 2
+
+
+def test_throttle_increases_limit_by_one_per_round(clock):
+    throttle = parallel.WriteThrottle(maximum=4)
+    throttle.run(writer(clock, status_code=500))
+    assert throttle.as_dict()["limit"] == 2
+    for _ in range(2):
+        throttle.run(writer(clock))
+    assert throttle.as_dict()["limit"] == 2
+    for _ in range(2):
+        throttle.run(writer(clock))
+    assert throttle.as_dict()["limit"] == 3
+    for _ in range(20):
+        throttle.run(writer(clock))
+    assert throttle.as_dict() == dict(writes=25, limit=4, lowest=2, decreases=1)
+
+
+def test_throttle_not_adaptive(clock):
+    throttle = parallel.WriteThrottle(maximum=4, adaptive=False)
+    throttle.run(writer(clock, status_code=500))
+    assert throttle.as_dict() == dict(writes=1, limit=4, lowest=4, decreases=0)
+
+
+def test_throttle_limits_writes_per_minute(clock):
+    throttle = parallel.WriteThrottle(maximum=4, per_minute=30)
+    for _ in range(3):
+        throttle.run(writer(clock, seconds=0))
+    assert clock.sleeps == [2, 2]
+
+
+def test_throttle_bounds_concurrent_writes():
+    throttle = parallel.WriteThrottle(maximum=2, adaptive=True, latency_target=60)
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def send():
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        threading.Event().wait(0.01)
+        with lock:
+            running[0] -= 1
+        return Response(200)
+
+    tasks = [lambda: (True, throttle.run(send).status_code)] * 12
+    assert parallel.run_parallel(tasks, workers=6) == [(True, 200)] * 12
+    assert running[1] == 2
+
+
+def test_throttle_of_module_params():
+    assert api.throttle_of(dict(url="http://npm.example")) is None
+    params = dict(
+        workers=6,
+        adaptive_concurrency=True,
+        latency_target=0,
+        max_writes_per_minute=0,
+    )
+    assert api.throttle_of(params).maximum == 6
+    assert api.throttle_of(dict(params, workers=None)).maximum == 1
@@ -0,0 +1,150 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import plan
+
+
+class Client:
+    """serves fixed lists instead of npm"""
+
+    def __init__(self, **lists):
+        self.lists = lists
+
+    def list_items(self, resource, cached=True):
+        assert not cached
+        if resource not in self.lists:
+            return (False, "not found")
+        return (True, self.lists[resource])
+
+
+def host(id, *names, modified_on="2026-01-01 00:00:00", forward_host="1.2.3.4"):
+    return dict(
+        id=id,
+        domain_names=list(names),
+        modified_on=modified_on,
+        forward_host=forward_host,
+    )
+
+
+def change(action, domain_name, item=None, names=None, touches=None):
+    names = names or [domain_name]
+    before = dict(forward_host=item["forward_host"]) if item else dict()
+    return dict(
+        resource="proxy_hosts",
+        action=action,
+        domain_name=domain_name,
+        id=item["id"] if item else None,
+        modified_on=item["modified_on"] if item else None,
+        data=None if action == "delete" else dict(domain_names=names),
+        diff=dict(before=before, after=dict()),
+        touches=sorted(touches or names),
+        pruned=False,
+    )
+
+
+def verify(items, changes):
+    client = Client(**{plan.proxy_host.RESOURCE: items})
+    success, conflicts = plan.verify(client, changes)
+    assert success
+    return [(c["domain_name"], c["reason"]) for c in conflicts]
+
+
+def test_build_moves_deletions_first():
+    item = host(1, "a.example")
+    changes = [
+        change("create", "b.example"),
+        change("update", "a.example", item),
+        change("delete", "c.example", host(2, "c.example")),
+    ]
+    result = plan.build(changes)
+    assert result["version"] == plan.VERSION
+    assert [c["action"] for c in result["changes"]] == ["delete", "create", "update"]
+    assert result["summary"] == dict(create=1, update=1, delete=1)
+
+
+def test_unchanged_items_have_no_conflicts():
+    item = host(1, "a.example")
+    changes = [
+        change("update", "a.example", item),
+        change("delete", "c.example", host(2, "c.example")),
+        change("create", "b.example"),
+    ]
+    assert verify([item, host(2, "c.example")], changes) == list()
+
+
+def test_modified_and_deleted_items_conflict():
+    item = host(1, "a.example")
+    changes = [
+        change("update", "a.example", item),
+        change("delete", "c.example", host(2, "c.example")),
+    ]
+    modified = dict(item, modified_on="2026-01-02 00:00:00")
+    assert verify([modified], changes) == [
+        ("a.example", "item 1 has been modified on 2026-01-02 00:00:00"),
+        ("c.example", "item 2 has been deleted"),
+    ]
+
+
+def test_modified_fields_conflict_within_the_same_second():
+    item = host(1, "a.example")
+    changes = [change("update", "a.example", item)]
+    assert verify([dict(item, forward_host="5.6.7.8")], changes) == [
+        ("a.example", "item 1 has been modified: forward_host"),
+    ]
+
+
+def test_created_domain_existing_by_now_conflicts():
+    changes = [change("create", "b.example", names=["B.example"])]
+    assert verify([host(3, "b.example")], changes) == [
+        ("b.example", "exists by now as item 3"),
+    ]
+
+
+def test_domain_released_by_update_of_the_plan():
+    # a.example and b.example were on one item, the plan moves b.example to a new one
+    item = host(1, "a.example", "b.example")
+    changes = [
+        change("update", "a.example", item, touches=["a.example", "b.example"]),
+        change("create", "b.example"),
+    ]
+    assert verify([item], changes) == list()
+
+
+def test_domain_released_by_deletion_of_the_plan():
+    item = host(1, "b.example")
+    changes = [change("delete", "b.example", item), change("create", "b.example")]
+    assert verify([item], changes) == list()
+
+
+def test_domain_is_not_released_by_a_modified_item():
+    item = host(1, "a.example", "b.example")
+    changes = [
+        change("update", "a.example", item, touches=["a.example", "b.example"]),
+        change("create", "b.example"),
+    ]
+    modified = dict(item, modified_on="2026-01-02 00:00:00")
+    assert verify([modified], changes) == [
+        ("a.example", "item 1 has been modified on 2026-01-02 00:00:00"),
+        ("b.example", "exists by now as item 1"),
+    ]
+
+
+def test_domain_is_not_released_for_another_item():
+    # b.example has been moved to another item in the meantime
+    item = host(1, "a.example")
+    changes = [
+        change("update", "a.example", item, touches=["a.example", "b.example"]),
+        change("create", "b.example"),
+    ]
+    assert verify([item, host(2, "b.example")], changes) == [
+        ("b.example", "exists by now as item 2"),
+    ]
+
+
+def test_fetch_error():
+    success, msg = plan.verify(Client(), [change("create", "b.example")])
+    assert not success
+    assert msg == "error on fetching proxy_hosts: not found"
@@ -0,0 +1,159 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import pytest
+import requests
+import urllib3
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import api
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    backoff_delay,
+)
+
+
+class Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or dict()
+        self.content = b"{}"
+        self.text = "{}"
+
+
+class Session:
+    """answers requests with the given responses (or raises the given exceptions) in order"""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.calls = list()
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = list()
+    monkeypatch.setattr(api.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def client(session, retries=3, threshold=0):
+    client = api.NpmClient(
+        "http://npm.example",
+        "token",
+        retries=retries,
+        breaker=CircuitBreaker(threshold),
+    )
+    client.session = session
+    return client
+
+
+def refused():
+    # raised by requests if npm isn't listening at all
+    reason = urllib3.exceptions.NewConnectionError(None, "Connection refused")
+    return requests.exceptions.ConnectionError(
+        urllib3.exceptions.MaxRetryError(None, "/", reason),
+    )
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    for attempt in range(1, 10):
+        assert 0 <= backoff_delay(attempt, 0.5) <= min(30.0, 0.5 * 2**attempt)
+    assert backoff_delay(20, 1, cap=2) <= 2
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(2)
+    breaker.failure()
+    breaker.success()
+    breaker.failure()
+    breaker.check()
+    breaker.failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    # an open circuit stays open
+    breaker.success()
+    assert breaker.is_open
+
+
+def test_breaker_disabled():
+    breaker = CircuitBreaker(0)
+    for _ in range(10):
+        breaker.failure()
+    breaker.check()
+
+
+def test_server_errors_of_idempotent_calls_are_retried(sleeps):
+    session = Session(Response(503), Response(502), Response(200))
+    npm = client(session)
+    assert npm.get("/api/nginx/proxy-hosts").status_code == 200
+    assert len(session.calls) == 3
+    assert len(sleeps) == 2
+    assert npm.breaker.failures == 0
+
+
+def test_retries_are_limited(sleeps):
+    session = Session(Response(503), Response(503), Response(503))
+    npm = client(session, retries=2)
+    assert npm.get("/api/nginx/proxy-hosts").status_code == 503
+    assert len(session.calls) == 3
+    assert npm.breaker.failures == 1
+
+
+def test_retry_after_is_respected(sleeps):
+    npm = client(Session(Response(503, {"Retry-After": "7"}), Response(200)))
+    assert npm.get("/api/nginx/proxy-hosts").status_code == 200
+    assert sleeps[0] >= 7
+
+
+def test_server_errors_of_creates_are_not_retried(sleeps):
+    session = Session(Response(503))
+    npm = client(session)
+    assert npm.post("/api/nginx/proxy-hosts", dict()).status_code == 503
+    assert len(session.calls) == 1
+    assert npm.breaker.failures == 1
+
+
+def test_timeout_of_create_is_not_retried(sleeps):
+    # npm might have processed it, sending it again could create a duplicate
+    session = Session(requests.exceptions.ReadTimeout("timed out"), Response(201))
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client(session).post("/api/nginx/proxy-hosts", dict())
+    assert len(session.calls) == 1
+
+
+def test_create_is_retried_if_it_never_reached_npm(sleeps):
+    session = Session(refused(), Response(201))
+    assert client(session).post("/api/nginx/proxy-hosts", dict()).status_code == 201
+    assert len(session.calls) == 2
+
+
+def test_connection_errors_of_idempotent_calls_are_retried(sleeps):
+    session = Session(
+        requests.exceptions.ConnectionError("reset"),
+        requests.exceptions.ConnectionError("reset"),
+    )
+    npm = client(session, retries=1)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        npm.delete("/api/nginx/proxy-hosts/1")
+    assert len(session.calls) == 2
+    assert npm.breaker.failures == 1
+
+
+def test_open_breaker_stops_calls(sleeps):
+    session = Session(Response(500), Response(500), Response(200))
+    npm = client(session, retries=0, threshold=2)
+    npm.get("/api/nginx/proxy-hosts")
+    npm.get("/api/nginx/proxy-hosts")
+    with pytest.raises(CircuitOpenError):
+        npm.get("/api/nginx/proxy-hosts")
+    assert len(session.calls) == 2
@@ -0,0 +1,125 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import pytest
+
+from ansible_collections.nils_ost.proxymanager.plugins.module_utils import bulk, stream
+
+
+class Failed(Exception):
+    pass
+
+
+class Module:
+    """the parts of AnsibleModule check_entries and bulk.plan use, fail_json ends the run"""
+
+    params = dict(exclusive=False, max_deletions=10)
+
+    def fail_json(self, msg, **kwargs):
+        raise Failed(msg)
+
+
+def entry(port, tcp=True, udp=False, state="present", host="10.0.0.1", to=22):
+    return dict(
+        incoming_port=port,
+        forwarding_host=host,
+        forwarding_port=to,
+        tcp_forwarding=tcp,
+        udp_forwarding=udp,
+        certificate_id=0,
+        state=state,
+    )
+
+
+def check(*entries):
+    stream.check_entries(Module(), list(entries), dict())
+
+
+def test_keys_of_entries_and_items():
+    assert stream.keys_of(entry(53, udp=True)) == {(53, "tcp"), (53, "udp")}
+    assert stream.keys_of(entry(53, tcp=False, udp=True)) == {(53, "udp")}
+    # npm returns flags as 0/1 and ports as strings depending on its database
+    item = dict(incoming_port="5000", tcp_forwarding=0, udp_forwarding=1)
+    assert stream.keys_of(item) == {(5000, "udp")}
+    assert stream.keys_of(dict(incoming_port=1)) == set()
+
+
+def test_name_and_label():
+    assert stream.name_of((5000, "tcp")) == "5000/tcp"
+    assert stream.label_of(entry(5000)) == 5000
+
+
+def test_same_port_with_different_protocols():
+    check(entry(5000), entry(5000, tcp=False, udp=True))
+
+
+def test_collision_on_port_and_protocol():
+    with pytest.raises(Failed, match="listed more than once: 5000/udp"):
+        check(entry(5000, udp=True), entry(5000, tcp=False, udp=True))
+
+
+def test_collisions_of_absent_entries():
+    with pytest.raises(Failed, match="listed more than once: 5000/tcp"):
+        check(entry(5000), entry(5000, state="absent"))
+
+
+def test_entry_without_protocol():
+    with pytest.raises(Failed, match='at least one of "tcp_forwarding"'):
+        check(entry(5000, tcp=False))
+
+
+def test_present_entry_requires_forwarding():
+    with pytest.raises(Failed, match='"forwarding_host" is required'):
+        check(entry(5000, host=None))
+    with pytest.raises(Failed, match='"forwarding_port" is required'):
+        check(entry(5000, to=None))
+    check(entry(5000, state="absent", host=None, to=None))
+
+
+def plan(items, *entries):
+    result = dict(results=list())
+    operations = bulk.plan(
+        Module(),
+        None,
+        stream,
+        items,
+        list(entries),
+        result,
+        keys=stream.keys_of,
+        label=stream.label_of,
+        field="incoming_port",
+    )
+    return [
+        (op["entry"]["action"], (op["before"] or dict()).get("id")) for op in operations
+    ]
+
+
+def item(id, port, tcp=True, udp=False):
+    return dict(entry(port, tcp, udp), id=id)
+
+
+def test_plan_matches_streams_by_port_and_protocol():
+    items = [item(1, 5000), item(2, 5000, tcp=False, udp=True)]
+    assert plan(items, entry(5000, tcp=False, udp=True, to=23)) == [("updated", 2)]
+    assert plan(items, entry(5000, to=22)) == list()
+    assert plan(items, entry(6000)) == [("created", None)]
+
+
+def test_plan_fails_on_entry_colliding_with_several_streams():
+    items = [item(1, 5000), item(2, 5000, tcp=False, udp=True)]
+    with pytest.raises(
+        Failed,
+        match="incoming_port 5000 collides with several existing items: 1, 2",
+    ):
+        plan(items, entry(5000, udp=True))
+
+
+def test_plan_deletes_all_streams_of_absent_entry():
+    items = [item(1, 5000), item(2, 5000, tcp=False, udp=True)]
+    assert plan(items, entry(5000, udp=True, state="absent")) == [
+        ("deleted", 1),
+        ("deleted", 2),
+    ]
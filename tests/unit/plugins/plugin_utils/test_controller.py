@@ -0,0 +1,32 @@
+# Copyright: (c) 2026, Nils Ost <@nils-ost>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import sys
+
+from ansible_collections.nils_ost.proxymanager.plugins.plugin_utils.controller import (
+    ControllerActionBase,
+)
+
+
+class Action(ControllerActionBase):
+    MODULE = "proxy"
+
+    def __init__(self):
+        # load_module doesn't need the task, connection and loader of a real action plugin
+        pass
+
+
+def test_loads_module():
+    module = Action().load_module()
+    assert module is not None
+    assert callable(module.run)
+    assert callable(module.argument_spec)
+
+
+def test_no_module_without_requests(monkeypatch):
+    # the modules import requests lazily, importing them succeeds without it
+    monkeypatch.setitem(sys.modules, "requests", None)
+    assert Action().load_module() is None